@@ -0,0 +1,72 @@
+"""
+Benchmark: one 3-second straggler among 1000 hosts
+
+Compares consuming results in submission order (a fresh executor per round,
+as the GUI used to) with ProbePool's completion-ordered result queue, and
+reports how long the 999 fast results waited before they could be displayed.
+
+Usage: python benchmarks/bench_completion_order.py [hosts] [straggler_seconds]
+"""
+
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pool import ProbePool
+
+WORKERS = 50
+
+
+def fake_probe(index: int, straggler: float):
+    """Stand-in for a ping: host 0 is the straggler, the rest answer in 10 ms"""
+    time.sleep(straggler if index == 0 else 0.01)
+    return index, time.perf_counter()
+
+
+def report(name: str, waits):
+    """Print how long fast results sat finished but undisplayed"""
+    waits = sorted(waits)
+    print(f"  {name:<18} fast rows waited median {statistics.median(waits) * 1000:7.1f} ms, "
+          f"max {waits[-1] * 1000:7.1f} ms")
+
+
+def submission_order(hosts: int, straggler: float):
+    waits = []
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        futures = [executor.submit(fake_probe, i, straggler) for i in range(hosts)]
+        for future in futures:
+            index, finished = future.result()
+            if index:
+                waits.append(time.perf_counter() - finished)
+    return waits
+
+
+def completion_order(pool: ProbePool, hosts: int, straggler: float):
+    waits = []
+    tasks = ((i, straggler) for i in range(hosts))
+    for (index, finished), _ in pool.run_round(fake_probe, tasks):
+        if index:
+            waits.append(time.perf_counter() - finished)
+    return waits
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    straggler = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    print(f"{hosts} hosts, {WORKERS} workers, host 0 takes {straggler:.1f}s")
+    report("submission order", submission_order(hosts, straggler))
+
+    pool = ProbePool(WORKERS)
+    try:
+        report("completion order", completion_order(pool, hosts, straggler))
+    finally:
+        pool.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
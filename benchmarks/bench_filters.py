@@ -0,0 +1,74 @@
+"""
+Benchmark: filtering a 100k-row inventory by status, text and network
+
+Times each filter two ways: testing every row of the store, as a rescan
+of the table would, and rebuilding the view from the candidate rows the
+FilterIndex hands out. Also times indexing the store once after loading,
+and matching a text filter letter by letter as it is typed.
+
+Usage: python benchmarks/bench_filters.py [rows]
+"""
+
+import ipaddress
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.filters import FilterIndex, RowFilter, parse_network
+from core.results import OFFLINE, STATUS_TEXT, ResultStore
+from core.views import RowView
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(1)
+    sites = ["ams", "fra", "lon", "nyc", "sfo", "sin", "syd", "tok"]
+    roles = ["switch", "router", "firewall", "printer", "camera", "ap"]
+
+    store = ResultStore()
+    store.load((f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(rows)),
+               [f"{rng.choice(sites)} {rng.choice(roles)} {i}" for i in range(rows)])
+    for row in range(rows):
+        store.update(row, "Online" if rng.random() < 0.97 else "Offline", "1.0", 0.0)
+    store.take_changes()
+
+    index = FilterIndex(store)
+    print(f"{rows} rows")
+    print(f"  index the store once             {timed(index.sync):8.1f} ms")
+    print(f"  word index, on first text filter {timed(lambda: index.matching_words('x')):8.1f} ms")
+
+    first, last = parse_network("10.0.200.0/24")
+    settings = {
+        "status Offline": (dict(statuses={OFFLINE}),
+                           lambda row: STATUS_TEXT[store.status[row]] == "Offline"),
+        "text 'tok firewall'": (dict(text="tok firewall"),
+                                lambda row: all(word in store.descriptions[row].lower()
+                                                for word in ("tok", "firewall"))),
+        "network 10.0.200.0/24": (dict(network=(first, last)),
+                                  lambda row: first <= int(ipaddress.IPv4Address(store.ips[row])) <= last),
+    }
+    for label, (options, scan) in settings.items():
+        full = timed(lambda: [row for row in range(rows) if scan(row)])
+        view = RowView()
+
+        def indexed():
+            view.accept = RowFilter(index, **options)
+            view.rebuild(view.accept.candidates())
+        print(f"  {label:<24} rescan {full:8.1f} ms   indexed {timed(indexed):8.1f} ms   ({len(view)} rows)")
+
+    typing = [timed(lambda: index.matching_words("firewall"[:end])) for end in range(1, 9)]
+    print(f"  typing 'firewall', per letter    {sum(typing) / len(typing):8.1f} ms avg   "
+          f"(first letter {typing[0]:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: GUI work per second with one callback per result vs coalesced frames
+
+Worker threads report results for a host list at a fixed rate while a
+simulated Tk main loop applies them; each row redraw costs a fixed time,
+standing in for Treeview item calls. With one callback per result the
+main loop falls behind as soon as the rate exceeds what it can redraw and
+the lag grows without bound. Coalesced, results go to the ResultStore and
+FRAME_RATE times a second the rows changed since the last frame
+(ResultStore.take_changes) are redrawn once each, with the status text
+from the UpdateBuffer.
+
+Usage: python benchmarks/bench_gui_updates.py [hosts] [results_per_second] [seconds] [redraw_us]
+"""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pool import RoundProgress
+from core.results import ResultStore
+from core.updates import FRAME_RATE, UpdateBuffer
+
+
+def produce(emit, hosts: int, rate: float, seconds: float):
+    """Report round-robin results for hosts at rate results/s, in 10 ms bursts"""
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return
+        due = int(elapsed * rate)
+        while sent < due:
+            emit(sent % hosts, time.perf_counter())
+            sent += 1
+        time.sleep(0.01)
+
+
+def redraw(cost: float):
+    """Busy-wait like a Treeview item update would"""
+    end = time.perf_counter() + cost
+    while time.perf_counter() < end:
+        pass
+
+
+def per_result(hosts: int, rate: float, seconds: float, cost: float):
+    """One main-loop callback per result, like root.after(0, update_tree)"""
+    events = queue.Queue()
+    producer = threading.Thread(target=produce, args=(lambda key, at: events.put(at), hosts, rate, seconds))
+    producer.start()
+    start = time.perf_counter()
+    calls = 0
+    max_lag = 0.0
+    deadline = start + seconds * 3  # Give the backlog a chance to drain
+    while time.perf_counter() < deadline and (producer.is_alive() or not events.empty()):
+        try:
+            completed_at = events.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        redraw(cost)
+        calls += 1
+        max_lag = max(max_lag, time.perf_counter() - completed_at)
+    producer.join()
+    return calls, events.qsize(), max_lag, time.perf_counter() - start
+
+
+def coalesced(hosts: int, rate: float, seconds: float, cost: float):
+    """ResultStore changes and UpdateBuffer drained FRAME_RATE times a second"""
+    store = ResultStore()
+    store.load([str(key) for key in range(hosts)])
+    buffer = UpdateBuffer()
+    progress = RoundProgress("Bench")
+
+    def emit(key, at):
+        store.update(key, "Online", "1.0", time.time())
+        buffer.record(progress, at, progress.summary)
+
+    producer = threading.Thread(target=produce, args=(emit, hosts, rate, seconds))
+    producer.start()
+    start = time.perf_counter()
+    calls = 0
+    frame = 1 / FRAME_RATE
+    while producer.is_alive() or len(buffer):
+        frame_start = time.perf_counter()
+        status, _ = buffer.drain()
+        rows = store.take_changes()
+        for _ in rows:
+            redraw(cost)
+        calls += len(rows) + (status is not None)
+        time.sleep(max(0.0, frame - (time.perf_counter() - frame_start)))
+    producer.join()
+    return calls, len(store.take_changes()), progress.max_lag, time.perf_counter() - start
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    cost = (float(sys.argv[4]) if len(sys.argv) > 4 else 100) / 1e6
+
+    print(f"{hosts} hosts, {rate:.0f} results/s for {seconds:.0f}s, {cost * 1e6:.0f} us per row redraw")
+    for name, run in (("per-result", per_result), ("coalesced", coalesced)):
+        calls, backlog, max_lag, elapsed = run(hosts, rate, seconds, cost)
+        print(f"  {name:<11} {calls / elapsed:8.0f} UI updates/s, backlog {backlog:6d}, "
+              f"max display lag {max_lag * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: keeping a slowest-first view sorted while results stream in
+
+Files 100k rows by response time, then applies frames of fresh results
+(as the GUI does 20 times a second) two ways: re-sorting every row each
+frame, and refiling only the changed rows in a RowView.
+
+Usage: python benchmarks/bench_live_sort.py [rows] [results_per_frame] [frames]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.results import ResultStore
+from core.views import RowView
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    per_frame = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    rng = random.Random(1)
+
+    store = ResultStore()
+    store.load(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(rows))
+    for row in range(rows):
+        store.update(row, "Online", f"{rng.uniform(0.2, 80):.1f}", 0.0)
+    key = store.sort_key("Response Time", reverse=True)
+    batches = [[rng.randrange(rows) for _ in range(per_frame)] for _ in range(frames)]
+
+    print(f"{rows} rows sorted slowest first, {per_frame} results per frame")
+    view = RowView(key, reverse=True)
+    start = time.perf_counter()
+    view.rebuild(range(rows))
+    print(f"  initial sort                 {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    def apply(batch):
+        for row in batch:
+            store.update(row, "Online", f"{rng.uniform(0.2, 80):.1f}", 0.0)
+
+    full = 0.0
+    for batch in batches:
+        apply(batch)
+        start = time.perf_counter()
+        sorted(range(rows), key=key, reverse=True)[:40]
+        full += time.perf_counter() - start
+
+    view.update(store.take_changes())  # Catch up with the rounds above, untimed
+    incremental = 0.0
+    for batch in batches:
+        apply(batch)
+        start = time.perf_counter()
+        view.update(store.take_changes())
+        view.window(0, 40)
+        incremental += time.perf_counter() - start
+
+    print(f"  full re-sort per frame       {full / frames * 1000:8.2f} ms")
+    print(f"  incremental per frame        {incremental / frames * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: ping output parses per second over the recorded corpus
+
+Measures full-output parses (one per probe on the system ping path) and
+single-line reply classification (one per line on the streaming paths).
+
+Usage: python benchmarks/bench_ping_parser.py [seconds_per_case]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ping_parser import parse_ping_output, parse_reply_line
+
+CORPUS = Path(__file__).parent.parent / 'test_corpus' / 'ping'
+
+
+def rate(func, items, seconds: float) -> float:
+    """Calls per second of func over items, cycling for about seconds"""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for item in items:
+            func(item)
+        calls += len(items)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    outputs = {path.name: path.read_text(encoding='utf-8') for path in sorted(CORPUS.glob('*.txt'))}
+
+    print(f"{'Output':<30} {'parses/s':>12}")
+    for name, text in outputs.items():
+        print(f"{name:<30} {rate(parse_ping_output, [text], seconds):>12,.0f}")
+    print(f"{'whole corpus (mixed)':<30} {rate(parse_ping_output, list(outputs.values()), seconds):>12,.0f}")
+
+    lines = [line for text in outputs.values() for line in text.splitlines()]
+    print(f"\nparse_reply_line: {rate(parse_reply_line, lines, seconds):,.0f} lines/s over {len(lines)} corpus lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: process spawns per second vs ICMP socket probes per second on loopback
+
+Usage: python benchmarks/bench_probe_engines.py [probes]
+"""
+
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.icmp import get_prober
+
+TARGET = "127.0.0.1"
+
+
+def bench_subprocess(probes: int) -> float:
+    """Spawn the system ping (or a no-op stand-in when ping is missing)"""
+    if shutil.which("ping"):
+        flag = "-n" if platform.system().lower() == "windows" else "-c"
+        cmd = ["ping", flag, "1", TARGET]
+    else:
+        print("  system ping not found, spawning the Python interpreter as a stand-in")
+        cmd = [sys.executable, "-S", "-c", "pass"]
+
+    start = time.perf_counter()
+    for _ in range(probes):
+        subprocess.run(cmd, capture_output=True)
+    return probes / (time.perf_counter() - start)
+
+
+def bench_socket(probes: int) -> float:
+    """Send echo requests over the shared ICMP socket"""
+    prober = get_prober()
+    start = time.perf_counter()
+    for _ in range(probes):
+        prober.echo(TARGET, 1.0)
+    return probes / (time.perf_counter() - start)
+
+
+def main():
+    probes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"Probing {TARGET} {probes} times per engine")
+    spawn_rate = bench_subprocess(probes)
+    print(f"  subprocess: {spawn_rate:10.1f} probes/s")
+
+    if get_prober() is None:
+        print("  socket:     ICMP sockets not permitted for this user")
+        return
+
+    socket_rate = bench_socket(probes)
+    print(f"  socket:     {socket_rate:10.1f} probes/s ({socket_rate / spawn_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
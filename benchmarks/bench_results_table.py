@@ -0,0 +1,69 @@
+"""
+Benchmark: loading and redrawing a 100k-row inventory
+
+Times the ResultStore behind the virtual results table: loading every
+target, redrawing one screen of rows, sorting by response time and storing
+a round of results. Where a display is available it also times inserting
+one Treeview item per IP, as the table used to.
+
+Usage: python benchmarks/bench_results_table.py [rows] [visible_rows]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.results import ResultStore
+
+
+def timed(label: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"  {label:<34} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def treeview_insert(ips, descriptions):
+    """One real Treeview item per IP; needs a display"""
+    import tkinter as tk
+    from tkinter import ttk
+    root = tk.Tk()
+    try:
+        tree = ttk.Treeview(root, columns=("IP", "Description", "Status", "Response Time", "Last Checked"),
+                            show="headings")
+        for ip, description in zip(ips, descriptions):
+            tree.insert("", tk.END, values=(ip, description, "Not tested", "-", "-"))
+        root.update()
+    finally:
+        root.destroy()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    visible = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(rows)]
+    descriptions = [f"Device {i}" for i in range(rows)]
+    results = [(i, "Online", f"{random.uniform(0.2, 80):.1f}") if random.random() < 0.8
+               else (i, "Offline", "Timeout") for i in range(rows)]
+    now = time.time()
+
+    print(f"{rows} rows, {visible} on screen")
+    store = ResultStore()
+    timed("load into ResultStore", store.load, ips, descriptions)
+    timed("store a result for every row", lambda: [store.update(i, s, r, now) for i, s, r in results])
+    order = list(range(rows))
+    timed("sort by response time", lambda: order.sort(key=store.sort_key("Response Time")))
+    start = rows // 2
+    timed(f"format one screen ({visible} rows)", lambda: [store.row(i) for i in order[start:start + visible]])
+
+    try:
+        timed("insert one Treeview item per row", treeview_insert, ips, descriptions)
+    except Exception as e:  # No tkinter or no display
+        print(f"  Treeview comparison skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: sharded sweep throughput against the number of worker processes
+
+Every 127.0.0.0/8 address answers on Linux, so loopback stands in for a
+large network: the probe work is real, only the wire is missing. On a
+machine with N cores, throughput should grow close to linearly up to N
+processes.
+
+Usage: python benchmarks/bench_sharded_sweep.py [hosts] [max_processes] [probe] [timeout_ms]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.probes import create_prober
+from core.sharded import ShardedSweeper
+
+
+def loopback_hosts(count: int):
+    """Yield (key, host) pairs spread over 127.0.0.0/8"""
+    for i in range(count):
+        yield i, f"127.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.{(i & 0xFF) or 1}"
+
+
+def bench(engine, hosts: int, rounds: int = 3) -> float:
+    """Best hosts/s over a few rounds (the first round also starts the workers)"""
+    best = 0.0
+    for _ in range(rounds):
+        replies = 0
+
+        def on_result(key, host, rtts, error):
+            nonlocal replies
+            replies += bool(rtts) and rtts[0] is not None
+
+        start = time.perf_counter()
+        engine.run(loopback_hosts(hosts), on_result)
+        elapsed = time.perf_counter() - start
+        best = max(best, hosts / elapsed)
+    engine.close()
+    print(f"      last round {replies}/{hosts} replies")
+    return best
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    max_processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    probe = sys.argv[3].upper() if len(sys.argv) > 3 else "ICMP"
+    timeout = (int(sys.argv[4]) if len(sys.argv) > 4 else 500) / 1000
+
+    print(f"Sweeping {hosts} loopback hosts with {probe} probes, {os.cpu_count()} CPUs")
+    try:
+        print("  Single process (Async Sweep)")
+        baseline = bench(create_prober(probe, 9, timeout=timeout, max_in_flight=5000), hosts)
+        print(f"    {baseline:10.0f} hosts/s")
+        processes = 1
+        while processes <= max_processes:
+            print(f"  Sharded, {processes} process{'es' if processes > 1 else ''}")
+            rate = bench(ShardedSweeper(processes, probe=probe, port=9, timeout=timeout,
+                                        max_in_flight=5000 * processes), hosts)
+            print(f"    {rate:10.0f} hosts/s ({rate / baseline:.2f}x single process)")
+            processes *= 2
+    except OSError as e:
+        print(f"ICMP sockets not permitted for this user: {e}")
+
+
+if __name__ == "__main__":
+    main()
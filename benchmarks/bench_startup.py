@@ -0,0 +1,87 @@
+"""
+Benchmark: IP Ping Checker startup
+
+Runs fresh interpreters and reports the median of several runs for:
+importing ping_app, opening the window (import, create PingApp, draw it
+once; needs a display), and importing pandas, which ping_app now defers
+until an Excel file is loaded or exported. Also lists the modules
+ping_app imports directly, slowest first, from python -X importtime.
+
+Usage: python benchmarks/bench_startup.py [runs] [modules_listed]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+FIRST_WINDOW = """
+import tkinter as tk
+from ping_app import PingApp
+root = tk.Tk()
+PingApp(root)
+root.update()
+root.destroy()
+"""
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True)
+
+
+def median_ms(code: str, runs: int):
+    """Median wall time of a fresh interpreter running code, or the error it failed with"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(code)
+        if result.returncode != 0:
+            return (result.stderr.strip().splitlines() or ["failed"])[-1]
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def import_times(module: str):
+    """(cumulative us, name) of each module the given module imports directly"""
+    result = run_python(f"import {module}", "-X", "importtime")
+    found = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("   ") and not name.startswith("    "):  # One level below the module
+            found.append((int(cumulative), name.strip()))
+        elif name.strip() == module and cumulative.strip().isdigit():
+            found.append((int(cumulative), f"{module} (total)"))
+    return sorted(found, reverse=True)
+
+
+def report(label: str, value):
+    if isinstance(value, float):
+        print(f"  {label:<38} {value:8.1f} ms")
+    else:
+        print(f"  {label:<38} skipped: {value}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    listed = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    print(f"Median of {runs} fresh interpreters")
+    report("interpreter only", median_ms("pass", runs))
+    report("import ping_app", median_ms("import ping_app", runs))
+    report("time to first window", median_ms(FIRST_WINDOW, runs))
+    report("import pandas (deferred)", median_ms("import pandas", runs))
+    heavy = run_python("import sys, ping_app; print(sorted({'pandas', 'openpyxl', 'xlrd'} & set(sys.modules)))")
+    print(f"  {'heavy modules loaded with ping_app':<38} {heavy.stdout.strip() or heavy.stderr.strip()}")
+
+    print("\nSlowest direct imports of ping_app (cumulative)")
+    for cumulative, name in import_times("ping_app")[:listed]:
+        print(f"  {name:<38} {cumulative / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
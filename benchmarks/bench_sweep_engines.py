@@ -0,0 +1,58 @@
+"""
+Benchmark: sweep rounds over many loopback hosts per round engine
+
+Every 127.0.0.0/8 address answers on Linux, so this exercises thousands of
+distinct targets without leaving the machine.
+
+Usage: python benchmarks/bench_sweep_engines.py [hosts] [timeout_ms] [max_in_flight]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.async_sweep import AsyncSweeper
+from core.multiplex import RoundSender
+
+
+def loopback_hosts(count: int):
+    """Yield (key, host) pairs spread over 127.0.0.0/8"""
+    for i in range(count):
+        yield i, f"127.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.{(i & 0xFF) or 1}"
+
+
+def bench(name: str, engine, hosts: int, rounds: int = 3):
+    """Run a few rounds and print per-round time and throughput"""
+    print(f"  {name}")
+    for round_num in range(1, rounds + 1):
+        replies = 0
+
+        def on_result(key, host, rtts, error):
+            nonlocal replies
+            replies += bool(rtts) and rtts[0] is not None
+
+        start = time.perf_counter()
+        engine.run(loopback_hosts(hosts), on_result)
+        elapsed = time.perf_counter() - start
+        print(f"    round {round_num}: {elapsed:6.2f}s, {replies}/{hosts} replies, {hosts / elapsed:10.0f} hosts/s")
+    engine.close()
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    timeout_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    max_in_flight = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+
+    print(f"Sweeping {hosts} hosts, {timeout_ms} ms timeout")
+    try:
+        bench(f"Async Sweep ({max_in_flight} in flight)",
+              AsyncSweeper(timeout=timeout_ms / 1000, max_in_flight=max_in_flight), hosts)
+        bench("Multiplex", RoundSender(timeout=timeout_ms / 1000), hosts)
+    except OSError as e:
+        print(f"ICMP sockets not permitted for this user: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import collections
+import ctypes
+import socket
+import struct
+import sys
+import threading
+
+import pytest
+
+import core.icmp
+from core.icmp import SO_ATTACH_FILTER
+
+
+class FakeIcmpSocket:
+    """In-memory ICMP socket: every echo request to a live host is answered
+
+    A raw socket applies the identifier filter attached with SO_ATTACH_FILTER,
+    as the Linux kernel does, so replies with another identifier never arrive.
+    """
+
+    def __init__(self, network, raw):
+        self.network = network
+        self.raw = raw
+        self._reader, self._writer = socket.socketpair()  # Readiness for select()
+        self._reader.setblocking(False)
+        self._queue = collections.deque()
+        self.filter_ident = None
+        self.sent = []  # (address, ident, seq)
+
+    def setblocking(self, flag):
+        pass
+
+    def setsockopt(self, level, option, value):
+        if option == SO_ATTACH_FILTER:
+            _, address = struct.unpack('HP', value)
+            program = struct.unpack('HBBI' * 5, ctypes.string_at(address, 40))
+            self.filter_ident = program[11]  # k of the third instruction: jeq #ident
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def sendto(self, packet, address):
+        _, _, _, ident, seq = struct.unpack_from('!BBHHH', packet)
+        address = address[0]
+        self.sent.append((address, ident, seq))
+        if address in self.network.silent:
+            return len(packet)
+        source = self.network.reply_from.get(address, address)
+        delay = self.network.delays.get(address, 0)
+        if delay:
+            timer = threading.Timer(delay, self.deliver, (source, ident, seq))
+            timer.daemon = True
+            timer.start()
+        else:
+            self.deliver(source, ident, seq)
+        return len(packet)
+
+    def deliver(self, address, ident, seq):
+        """Queue an echo reply, unless the socket's filter drops it"""
+        if self.raw and self.filter_ident is not None and ident != self.filter_ident:
+            return
+        reply = struct.pack('!BBHHH', core.icmp.ICMP_ECHO_REPLY, 0, 0, ident, seq)
+        if self.raw:
+            reply = bytes([0x45]) + bytes(19) + reply
+        try:
+            self._writer.send(b'x')
+        except OSError:
+            return  # Closed before a delayed reply came in
+        self._queue.append((reply, (address, 0)))
+
+    def recvfrom(self, size):
+        if not self._queue:
+            raise BlockingIOError
+        self._reader.recv(1)
+        return self._queue.popleft()
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class FakeIcmpNetwork:
+    """Hands out FakeIcmpSockets in place of real ICMP sockets
+
+    Silent hosts never answer, delays holds each host's reply delay in
+    seconds and reply_from the address a host's replies come back from.
+    """
+
+    def __init__(self, raw=True):
+        self.raw = raw
+        self.silent = set()
+        self.delays = {}
+        self.reply_from = {}
+        self.sockets = []
+
+    def open(self):
+        sock = FakeIcmpSocket(self, self.raw)
+        self.sockets.append(sock)
+        return sock, self.raw
+
+
+@pytest.fixture
+def fake_icmp(monkeypatch):
+    """Raw ICMP sockets on a Linux-like kernel, without privileges or a network"""
+    network = FakeIcmpNetwork(raw=True)
+    monkeypatch.setattr(core.icmp, 'open_icmp_socket', network.open)
+    monkeypatch.setattr(sys, 'platform', 'linux')
+    yield network
+    for sock in network.sockets:
+        sock.close()
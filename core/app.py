@@ -9,6 +9,9 @@ from typing import Dict, Any
 
 from .database import DatabaseManager
 from .config import Config
+from .rate_limit import configure_rate_limit
+from .resolver import configure_resolver
+from .rtt import AdaptiveTimeouts
 from modules.ping_tool import PingTool
 from modules.ip_calculator import IPCalculator
 from modules.config_tasks import ConfigTasks
@@ -20,12 +23,21 @@ class NetworkMultitool:
         """Initialize the application"""
         self.config = Config()
         self.db_manager = DatabaseManager(self.config.database_path)
+        configure_rate_limit(self.config.get_setting('ping_max_pps', 0),
+                             self.config.get_setting('ping_subnet_pps', 0))
+        configure_resolver(self.config.get_setting('ping_dns_ttl', 300),
+                           self.config.get_setting('ping_dns_negative_ttl', 30))
         self.modules = self._initialize_modules()
         
     def _initialize_modules(self) -> Dict[str, Any]:
         """Initialize all available modules"""
+        timeouts = None
+        if self.config.get_setting('ping_adaptive_timeout', False):
+            timeouts = AdaptiveTimeouts(self.config.get_setting('ping_timeout', 5),
+                                        floor=self.config.get_setting('ping_timeout_floor', 0.02),
+                                        ceiling=self.config.get_setting('ping_timeout_ceiling', 3))
         modules = {
-            'ping': PingTool(self.db_manager),
+            'ping': PingTool(self.db_manager, timeouts),
             'ip_calc': IPCalculator(self.db_manager),
             'config': ConfigTasks(self.db_manager),
         }
@@ -86,6 +98,8 @@ class NetworkMultitool:
         print(f"Database Path: {self.config.database_path}")
         print(f"Config Directory: {self.config.config_dir}")
         print(f"Portable Mode: {self.config.portable_mode}")
+        print(f"Ping Rate Limit: {self.config.get_setting('ping_max_pps', 0) or 'unlimited'} probes/s, "
+              f"{self.config.get_setting('ping_subnet_pps', 0) or 'unlimited'} per /24")
         print("\nPress Enter to continue...")
         input()
     
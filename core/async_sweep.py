@@ -0,0 +1,201 @@
+"""
+asyncio sweep engine for Network Engineer Multitool
+
+Keeps thousands of probes in flight from a single event loop instead of one
+blocked thread per host. ICMP echo requests all share a single socket; the
+TCP and UDP backends in probes.py plug into the same machinery.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .icmp import IcmpSocket, is_ipv4_literal, resolve
+from .rate_limit import ProbeRateLimiter, shared_limiter
+from .rtt import AdaptiveTimeouts
+
+# on_result(key, host, rtts, error): rtts holds one RTT in ms (or None) per echo
+ResultCallback = Callable[[object, str, List[Optional[float]], Optional[str]], None]
+
+
+class AsyncProber(ABC):
+    """Probe many hosts concurrently from one asyncio event loop
+
+    Subclasses implement _probe_once for one protocol; the concurrency limit,
+    rate limiter, adaptive timeouts, count/first-reply handling and result
+    model are shared by every probe backend.
+    """
+
+    def __init__(self, timeout: float = 1.0, count: int = 1, max_in_flight: int = 5000,
+                 limiter: Optional[ProbeRateLimiter] = None, timeouts: Optional[AdaptiveTimeouts] = None,
+                 first_reply: bool = False):
+        """timeout is the per-probe deadline in seconds, replaced by each host's
+        own deadline when adaptive timeouts are given. first_reply stops probing
+        a host at its first answer.
+        """
+        self.timeout = timeout
+        self.count = count
+        self.max_in_flight = max(1, max_in_flight)
+        self.limiter = limiter if limiter is not None else shared_limiter
+        self.timeouts = timeouts
+        self.first_reply = first_reply
+
+    def port_for(self, host: str) -> Optional[int]:
+        """Destination port of a host; None for protocols without ports"""
+        return None
+
+    @abstractmethod
+    async def _probe_once(self, address: str, port: Optional[int], timeout: float) -> Optional[float]:
+        """Send one probe and return its RTT in ms, or None at the deadline"""
+
+    def _attach(self, loop: asyncio.AbstractEventLoop):
+        """Register shared sockets with the loop before a sweep"""
+
+    def _detach(self, loop: asyncio.AbstractEventLoop):
+        """Unregister shared sockets after a sweep"""
+
+    async def echo(self, address: str, port: Optional[int] = None) -> Optional[float]:
+        """Send one probe once the rate limiter allows it and return its RTT in ms, or None"""
+        wait = self.limiter.reserve(address)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        timeout = self.timeout if self.timeouts is None else self.timeouts.timeout(address)
+        rtt = await self._probe_once(address, port, timeout)
+        if self.timeouts is not None:
+            self.timeouts.observe(address, rtt)
+        return rtt
+
+    async def probe(self, host: str) -> List[Optional[float]]:
+        """Probe one host count times, or until its first reply with first_reply"""
+        host = str(host).strip()
+        port = self.port_for(host)
+        if is_ipv4_literal(host):
+            address = host
+        else:
+            address = await asyncio.get_running_loop().run_in_executor(None, resolve, host)
+        rtts = []
+        for _ in range(self.count):
+            rtts.append(await self.echo(address, port))
+            if self.first_reply and rtts[-1] is not None:
+                break
+        return rtts
+
+    async def sweep(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+                    should_stop: Optional[Callable[[], bool]] = None):
+        """Probe every (key, host) target, calling on_result as each one finishes"""
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+
+        async def run_one(key, host):
+            try:
+                try:
+                    rtts, error = await self.probe(host), None
+                except OSError as e:
+                    rtts, error = [], str(e)
+                on_result(key, host, rtts, error)
+            finally:
+                in_flight.release()
+
+        self._attach(loop)
+        try:
+            for key, host in targets:
+                if should_stop is not None and should_stop():
+                    break
+                await in_flight.acquire()
+                task = loop.create_task(run_one(key, host))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            self._detach(loop)
+
+    def run(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+            should_stop: Optional[Callable[[], bool]] = None):
+        """Run one sweep to completion on a fresh event loop in the calling thread"""
+        asyncio.run(self.sweep(targets, on_result, should_stop))
+
+    def close(self):
+        pass
+
+
+class AsyncSweeper(AsyncProber):
+    """ICMP echo backend: every probe shares one socket, replies matched by sequence number"""
+
+    def __init__(self, timeout: float = 1.0, count: int = 1, max_in_flight: int = 5000,
+                 limiter: Optional[ProbeRateLimiter] = None, timeouts: Optional[AdaptiveTimeouts] = None,
+                 first_reply: bool = False):
+        """Open the ICMP socket; raises OSError if ICMP sockets are not allowed
+
+        max_in_flight is capped by the 16-bit ICMP sequence space.
+        """
+        super().__init__(timeout, count, min(max_in_flight, 0xFFFF), limiter, timeouts, first_reply)
+        self.icmp = IcmpSocket()
+        self._seq = 0
+        self._pending: Dict[int, Tuple[str, float, asyncio.Future]] = {}
+
+    def _next_seq(self) -> int:
+        """Allocate a 16-bit sequence number not currently in flight"""
+        while True:
+            self._seq = (self._seq + 1) & 0xFFFF
+            if self._seq not in self._pending:
+                return self._seq
+
+    def _on_readable(self):
+        """Resolve the futures of every reply waiting on the socket"""
+        for seq, address, received in self.icmp.read_replies():
+            entry = self._pending.get(seq)
+            if entry is None or entry[0] != address:
+                continue
+            del self._pending[seq]
+            future = entry[2]
+            if not future.done():
+                future.set_result((received - entry[1]) * 1000)
+
+    def _attach(self, loop: asyncio.AbstractEventLoop):
+        loop.add_reader(self.icmp.fileno(), self._on_readable)
+
+    def _detach(self, loop: asyncio.AbstractEventLoop):
+        loop.remove_reader(self.icmp.fileno())
+
+    async def _send(self, address: str, seq: int) -> float:
+        """Send an echo request, waiting for buffer space if the socket is full"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return self.icmp.send_echo(address, seq)
+            except BlockingIOError:
+                writable = loop.create_future()
+                loop.add_writer(self.icmp.fileno(), writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(self.icmp.fileno())
+
+    async def _probe_once(self, address: str, port: Optional[int], timeout: float) -> Optional[float]:
+        """Send one echo request and return its RTT in ms, or None at the deadline"""
+        loop = asyncio.get_running_loop()
+        seq = self._next_seq()
+        future = loop.create_future()
+        self._pending[seq] = (address, 0.0, future)
+        try:
+            sent = await self._send(address, seq)
+            if seq in self._pending:
+                self._pending[seq] = (address, sent, future)
+            deadline = loop.call_later(timeout, _expire, future)
+            try:
+                return await future
+            finally:
+                deadline.cancel()
+        finally:
+            self._pending.pop(seq, None)
+
+    def close(self):
+        self.icmp.close()
+
+
+def _expire(future: asyncio.Future):
+    """Resolve a probe that reached its deadline as lost"""
+    if not future.done():
+        future.set_result(None)
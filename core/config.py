@@ -58,6 +58,13 @@ class Config:
         default_settings = {
             "ping_timeout": 5,
             "ping_count": 4,
+            "ping_max_pps": 0,  # Global probes per second, 0 = unlimited
+            "ping_subnet_pps": 0,  # Probes per second per /24, 0 = unlimited
+            "ping_adaptive_timeout": False,  # Per-host timeouts from smoothed RTT
+            "ping_timeout_floor": 0.02,  # Adaptive timeout bounds in seconds
+            "ping_timeout_ceiling": 3,
+            "ping_dns_ttl": 300,  # Seconds a resolved hostname is cached
+            "ping_dns_negative_ttl": 30,  # Seconds a failed lookup is cached
             "config_backup": True,
             "auto_save": True,
             "theme": "default"
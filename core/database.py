@@ -139,6 +139,23 @@ class DatabaseManager:
         self.connection.commit()
         return cursor.lastrowid
     
+    def save_ping_results(self, results: List[Dict]) -> int:
+        """Save many ping results in a single transaction"""
+        cursor = self.connection.cursor()
+        timestamp = datetime.now().isoformat()
+        
+        cursor.executemany('''
+            INSERT INTO ping_results 
+            (timestamp, target, packets_sent, packets_received, packet_loss, 
+             min_time, max_time, avg_time, raw_output)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(timestamp, r['target'], r['packets_sent'], r['packets_received'], r['packet_loss'],
+               r.get('min_time'), r.get('max_time'), r.get('avg_time'), r.get('raw_output'))
+              for r in results])
+        
+        self.connection.commit()
+        return len(results)
+    
     def get_ping_results(self, target: str = None, limit: int = 50) -> List[Dict]:
         """Get ping test results"""
         cursor = self.connection.cursor()
@@ -0,0 +1,419 @@
+"""
+Distributed probing for Network Engineer Multitool
+
+One central box cannot reach every site, or has to reach it across slow
+links. Headless probe workers run next to the targets instead: the
+coordinator (PingApp or PingTool) shards targets across the workers, each
+worker probes its share with its own engine and streams batched results
+back, and the coordinator merges them into one result model.
+
+The protocol is newline-delimited JSON over TCP. The coordinator opens the
+connection and sends ``hello`` (with the shared token, if any), then one
+``job`` per round and ``stop`` to cut a round short. The worker answers
+with ``results`` batches and a ``done`` per job.
+"""
+
+import hmac
+import ipaddress
+import itertools
+import json
+import queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .async_sweep import ResultCallback
+from .rate_limit import ProbeRateLimiter
+from .rtt import AdaptiveTimeouts
+from .sharded import FLUSH_INTERVAL, SubnetShards, create_engine, engine_options
+
+DEFAULT_PORT = 8765
+
+# Results sent per message at most; smaller batches go out every FLUSH_INTERVAL
+BATCH_SIZE = 500
+
+CONNECT_TIMEOUT = 5.0
+
+# Seconds a worker may stay silent in a round beyond the time its probes can take
+SILENCE_GRACE = 5.0
+
+
+def parse_address(address: str, default_port: int = DEFAULT_PORT) -> Tuple[str, int]:
+    """Split "host:port" (port optional) into a socket address"""
+    host, _, port = str(address).strip().rpartition(':')
+    if not host:
+        return port, default_port
+    return host, int(port)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a listen address only accepts connections from this machine"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def job_error(message: Dict) -> Optional[str]:
+    """Why a job message cannot be run, or None when it is well formed"""
+    if not isinstance(message.get('id'), int):
+        return "Job without an id"
+    if not isinstance(message.get('options'), dict):
+        return "Job without options"
+    targets = message.get('targets')
+    if not isinstance(targets, list) or not all(
+            isinstance(target, list) and len(target) == 2 and isinstance(target[0], int)
+            and isinstance(target[1], str) for target in targets):
+        return "Targets must be [index, host] pairs"
+    return None
+
+
+def _send(sock: socket.socket, lock: threading.Lock, message: Dict):
+    data = json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+    with lock:
+        sock.sendall(data)
+
+
+class _ResultBatch:
+    """Worker-side buffer that sends results in batches"""
+
+    def __init__(self, sock: socket.socket, lock: threading.Lock, job_id: int):
+        self.sock = sock
+        self.lock = lock
+        self.job_id = job_id
+        self.pending = []
+        self.pending_lock = threading.Lock()
+
+    def add(self, index, host, rtts, error):
+        """ResultCallback for the worker's engine"""
+        rtts = [round(rtt, 3) if rtt is not None else None for rtt in rtts]
+        with self.pending_lock:
+            self.pending.append([index, rtts, error])
+            full = len(self.pending) >= BATCH_SIZE
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.pending_lock:
+            results, self.pending = self.pending, []
+        if results:
+            _send(self.sock, self.lock, {'type': 'results', 'id': self.job_id, 'results': results})
+
+
+class ProbeWorker:
+    """Headless worker: probes the targets coordinators assign to it and streams results back"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, token: Optional[str] = None):
+        """Listen on host:port; with a token, coordinators must present it in their hello
+
+        Without a token only loopback addresses may be used, as anyone who
+        can connect could otherwise make the worker probe any target.
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.server: Optional[socket.socket] = None
+
+    def bind(self) -> Tuple[str, int]:
+        """Open the listening socket; returns the bound address (port 0 picks a free one)
+
+        Raises ValueError for a non-loopback address without a token.
+        """
+        if not self.token and not is_loopback(self.host):
+            raise ValueError(f"A token is required to listen on {self.host}")
+        self.server = socket.create_server((self.host, self.port), reuse_port=False)
+        self.port = self.server.getsockname()[1]
+        return self.host, self.port
+
+    def serve_forever(self):
+        """Accept coordinators until close(), serving each connection on its own thread"""
+        if self.server is None:
+            self.bind()
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break  # Closed
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+    def _serve_connection(self, conn: socket.socket):
+        """Run one coordinator's jobs until it disconnects"""
+        lock = threading.Lock()
+        engines = {}  # (engine, error) per distinct options, kept so adaptive timeouts persist across rounds
+        stop = threading.Event()
+        runner: Optional[threading.Thread] = None
+        try:
+            lines = conn.makefile('rb')
+            hello = json.loads(lines.readline() or b'{}')
+            if not isinstance(hello, dict):
+                hello = {}
+            token = str(hello.get('token')).encode('utf-8')
+            if hello.get('type') != 'hello' or (
+                    self.token and not hmac.compare_digest(token, self.token.encode('utf-8'))):
+                _send(conn, lock, {'type': 'error', 'error': 'Unauthorized'})
+                return
+            _send(conn, lock, {'type': 'hello', 'name': socket.gethostname()})
+
+            for line in lines:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    _send(conn, lock, {'type': 'error', 'error': "Messages must be JSON objects"})
+                    continue
+                if message.get('type') == 'job':
+                    error = job_error(message)
+                    if error is not None:
+                        _send(conn, lock, {'type': 'error', 'id': message.get('id'), 'error': error})
+                        continue
+                    if runner is not None:
+                        stop.set()
+                        runner.join()
+                    stop = threading.Event()
+                    runner = threading.Thread(target=self._run_job, args=(conn, lock, engines, message, stop),
+                                              daemon=True)
+                    runner.start()
+                elif message.get('type') == 'stop':
+                    stop.set()
+                else:
+                    _send(conn, lock, {'type': 'error', 'error': f"Unknown message type {message.get('type')!r}"})
+        except (OSError, ValueError):
+            pass  # Coordinator went away or spoke garbage
+        finally:
+            stop.set()
+            if runner is not None:
+                runner.join()
+            for engine, _ in engines.values():
+                if engine is not None:
+                    engine.close()
+            conn.close()
+
+    def _run_job(self, conn: socket.socket, lock: threading.Lock, engines: Dict, job: Dict,
+                 stop: threading.Event):
+        """Probe one job's targets, streaming result batches and then done"""
+        options = job['options']
+        key = json.dumps(options, sort_keys=True)
+        if key not in engines:
+            try:
+                engines[key] = create_engine(options), None
+            except OSError as e:
+                engines[key] = None, str(e)
+            except (KeyError, TypeError, ValueError) as e:
+                engines[key] = None, f"Bad job options: {e!r}"
+        engine, engine_error = engines[key]
+        batch = _ResultBatch(conn, lock, job['id'])
+        try:
+            if engine is None:
+                for index, _ in job['targets']:
+                    batch.add(index, None, [], engine_error)
+            else:
+                done = threading.Event()
+
+                def flush_loop():
+                    while not done.wait(FLUSH_INTERVAL):
+                        batch.flush()
+
+                flusher = threading.Thread(target=flush_loop, daemon=True)
+                flusher.start()
+                try:
+                    engine.run(job['targets'], batch.add, stop.is_set)
+                finally:
+                    done.set()
+                    flusher.join()
+            batch.flush()
+            _send(conn, lock, {'type': 'done', 'id': job['id']})
+        except OSError:
+            pass  # Connection lost; the coordinator reports the rest as failed
+
+
+class _WorkerLink:
+    """Coordinator-side connection to one worker"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.sock: Optional[socket.socket] = None
+        self.lock = threading.Lock()
+        self.name = address
+
+    def connect(self, token: Optional[str], inbox: queue.Queue):
+        """Connect, say hello and start the reader thread feeding inbox"""
+        sock = socket.create_connection(parse_address(self.address), timeout=CONNECT_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        lines = sock.makefile('rb')
+        _send(sock, self.lock, {'type': 'hello', 'token': token})
+        reply = json.loads(lines.readline() or b'{}')
+        if reply.get('type') != 'hello':
+            sock.close()
+            raise ConnectionError(reply.get('error', "No hello from worker"))
+        sock.settimeout(None)
+        self.name = reply.get('name', self.address)
+        self.sock = sock
+        threading.Thread(target=self._read, args=(sock, lines, inbox), daemon=True).start()
+
+    def _read(self, sock: socket.socket, lines, inbox: queue.Queue):
+        try:
+            for line in lines:
+                inbox.put((self, sock, json.loads(line)))
+        except (OSError, ValueError):
+            pass
+        inbox.put((self, sock, None))  # Disconnected
+
+    def send(self, message: Dict):
+        _send(self.sock, self.lock, message)
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+
+
+class DistributedSweeper:
+    """Round engine that shards targets across remote probe workers and merges their results"""
+
+    def __init__(self, workers: Iterable[str], probe: str = "ICMP", port: Optional[int] = None,
+                 ports: Optional[Dict[str, int]] = None, timeout: float = 1.0, count: int = 1,
+                 max_in_flight: int = 5000, limiter: Optional[ProbeRateLimiter] = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None, first_reply: bool = False,
+                 assignments: Optional[Dict[str, str]] = None, token: Optional[str] = None):
+        """workers are "host:port" addresses; the other options are those of engine_options
+
+        Targets listed in assignments (host -> worker address) always go to
+        that worker, for sites only it can reach; the rest are sharded by /24
+        across workers. max_in_flight and the rate caps apply per worker.
+        """
+        self.assignments = {str(host).strip(): str(worker).strip() for host, worker in (assignments or {}).items()}
+        shared = list(dict.fromkeys(str(worker).strip() for worker in workers))
+        self.workers = list(dict.fromkeys(shared + list(self.assignments.values())))
+        if not self.workers:
+            raise ValueError("No workers given")
+        self.shared = shared or self.workers  # Workers that take unassigned targets
+        self.token = token
+        self.options = engine_options(1, probe, port, ports, timeout, count, max_in_flight,
+                                      limiter, timeouts, first_reply)
+        self._links = {address: _WorkerLink(address) for address in self.workers}
+        self._inbox: "queue.Queue[Tuple[_WorkerLink, socket.socket, Optional[Dict]]]" = queue.Queue()
+        self._shards = SubnetShards(len(self.shared))
+        self._job_ids = itertools.count(1)
+
+    def _split(self, targets: List[Tuple[object, str]]) -> Dict[str, List[Tuple[int, str]]]:
+        """Assigned targets to their worker, the rest sharded across the shared workers"""
+        jobs: Dict[str, List[Tuple[int, str]]] = {address: [] for address in self.workers}
+        unassigned = []
+        for index, (key, host) in enumerate(targets):
+            host = str(host).strip()
+            worker = self.assignments.get(host)
+            if worker is not None:
+                jobs[worker].append((index, host))
+            else:
+                unassigned.append((index, host))
+        for shard, job in enumerate(self._shards.split(unassigned)):
+            # Shard jobs index into unassigned; map back to target indexes
+            jobs[self.shared[shard]].extend(unassigned[position] for position, _ in job)
+        return jobs
+
+    def silence_limit(self) -> float:
+        """Longest a worker may go without sending results before its round is given up
+
+        Workers report each host as it finishes, so a working one is never
+        silent for longer than every echo of one host timing out.
+        """
+        timeout = self.options['timeout']
+        if self.options['timeouts']:
+            timeout = max(timeout, self.options['timeouts'][2])  # Adaptive ceiling
+        return timeout * self.options['count'] + SILENCE_GRACE
+
+    def run(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+            should_stop: Optional[Callable[[], bool]] = None):
+        """Probe every (key, host) target on the workers, calling on_result as result batches arrive
+
+        Targets of a worker that cannot be reached, drops out or stops
+        answering for silence_limit() seconds are reported with an error; the
+        worker is retried next round.
+        """
+        targets = list(targets)
+        job_id = next(self._job_ids)
+        pending: Dict[_WorkerLink, set] = {}
+        deadlines: Dict[_WorkerLink, float] = {}
+        silence_limit = self.silence_limit()
+
+        def fail(indexes: Iterable[int], error: str):
+            for index in indexes:
+                key, host = targets[index]
+                on_result(key, host, [], error)
+
+        for address, job in self._split(targets).items():
+            if not job:
+                continue
+            link = self._links[address]
+            try:
+                if link.sock is None:
+                    link.connect(self.token, self._inbox)
+                link.send({'type': 'job', 'id': job_id, 'options': self.options, 'targets': job})
+            except (OSError, ValueError) as e:
+                link.close()
+                fail((index for index, _ in job), f"Worker {address} unavailable: {e}")
+                continue
+            pending[link] = {index for index, _ in job}
+            deadlines[link] = time.monotonic() + silence_limit
+
+        stopping = False
+        while pending:
+            if not stopping and should_stop is not None and should_stop():
+                stopping = True
+                for link in pending:
+                    try:
+                        link.send({'type': 'stop'})
+                    except OSError:
+                        pass
+            now = time.monotonic()
+            for link in [link for link in pending if now >= deadlines[link]]:
+                # Hung worker: later messages of this connection are ignored once it is closed
+                try:
+                    link.send({'type': 'stop'})
+                except OSError:
+                    pass
+                link.close()
+                if not stopping:
+                    fail(sorted(pending[link]), f"Worker {link.address} timed out")
+                del pending[link]
+            if not pending:
+                break
+            try:
+                link, sock, message = self._inbox.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if sock is not link.sock:
+                continue  # From a connection already replaced
+            if message is None:
+                link.close()  # Reconnected next round
+                if link in pending:
+                    if not stopping:
+                        fail(sorted(pending[link]), f"Worker {link.address} disconnected")
+                    del pending[link]
+            elif link not in pending or message.get('id') != job_id:
+                continue  # Leftover from an earlier round
+            elif message.get('type') == 'error':
+                # Job refused by the worker
+                fail(sorted(pending.pop(link)), f"Worker {link.address}: {message.get('error')}")
+            elif message['type'] == 'results':
+                deadlines[link] = time.monotonic() + silence_limit
+                for index, rtts, error in message['results']:
+                    pending[link].discard(index)
+                    key, host = targets[index]
+                    on_result(key, host, rtts, error)
+            elif message['type'] == 'done':
+                del pending[link]
+
+    def close(self):
+        for link in self._links.values():
+            link.close()
@@ -0,0 +1,54 @@
+"""
+Probe engine selection for Network Engineer Multitool
+
+One place that turns the engine and probe options into a round engine,
+shared by the IP Ping Checker window and the headless checker so both
+front ends probe the same way.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from .async_sweep import AsyncSweeper
+from .distributed import DistributedSweeper
+from .icmp import get_prober
+from .multiplex import RoundSender
+from .probes import create_prober
+from .rtt import AdaptiveTimeouts
+from .sharded import ShardedSweeper
+
+ENGINES = ("Auto", "ICMP Socket", "System Ping", "Async Sweep", "Multiplex", "Streaming", "Sharded", "Distributed")
+
+
+def create_round_engine(engine: str = "Auto", probe: str = "ICMP", timeout: float = 1.0, count: int = 1,
+                        port: Optional[int] = None, ports: Optional[Dict[str, int]] = None,
+                        max_in_flight: int = 5000, processes: Optional[int] = None,
+                        workers: Iterable[str] = (), assignments: Optional[Dict[str, str]] = None,
+                        timeouts: Optional[AdaptiveTimeouts] = None, first_reply: bool = False,
+                        token: Optional[str] = None):
+    """Create the round engine for these options, or None to probe from a thread pool
+
+    timeout is in seconds; token is the shared token of the Distributed
+    engine's workers (ping_worker.py --token). None is returned for the thread-pool engines
+    (Auto, ICMP Socket, System Ping, Streaming) and for socket engines when
+    ICMP sockets are not permitted.
+    """
+    if engine == "Distributed":
+        # Workers probe with their own privileges, so no local ICMP permission is needed
+        return DistributedSweeper(list(workers), probe=probe, port=port, ports=ports, timeout=timeout,
+                                  count=count, max_in_flight=max_in_flight, timeouts=timeouts,
+                                  first_reply=first_reply, assignments=assignments, token=token)
+    if engine == "Sharded" and (probe != "ICMP" or get_prober() is not None):
+        return ShardedSweeper(processes, probe=probe, port=port, ports=ports, timeout=timeout, count=count,
+                              max_in_flight=max_in_flight, timeouts=timeouts, first_reply=first_reply)
+    if probe != "ICMP":
+        # Port probes need no ICMP permission and always run on the async sweep
+        return create_prober(probe, port=port, ports=ports, timeout=timeout, count=count,
+                             max_in_flight=max_in_flight, timeouts=timeouts, first_reply=first_reply)
+    if get_prober() is None:
+        return None
+    if engine == "Async Sweep":
+        return AsyncSweeper(timeout=timeout, count=count, max_in_flight=max_in_flight,
+                            timeouts=timeouts, first_reply=first_reply)
+    if engine == "Multiplex":
+        return RoundSender(timeout=timeout, count=count, timeouts=timeouts, first_reply=first_reply)
+    return None
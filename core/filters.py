@@ -0,0 +1,213 @@
+"""
+Result filters for Network Engineer Multitool
+
+Narrowing a large table to "Offline only", a description word or a subnet
+should not rescan every row on each keystroke. FilterIndex keeps three
+indexes over the result store: a bucket of rows per status, a token index
+of lowercase description (and hostname) words, and the rows' IPv4
+addresses as a sorted integer list. A RowFilter draws its candidate rows
+from the most selective index, so rebuilding a filtered view costs time in
+proportion to the rows that can match.
+"""
+
+import ipaddress
+import itertools
+import re
+import socket
+import struct
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .results import STATUS_TEXT, ResultStore
+from .views import SortedKeyList
+
+_TOKEN_RE = re.compile(r'\w+')
+
+_ADDRESS = struct.Struct('!I')
+
+# Query words whose matching vocabulary is remembered, for narrowing as a word is typed
+MAX_CACHED_QUERIES = 256
+
+
+def tokens(text: str) -> List[str]:
+    """Lowercase words of a description or hostname"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def parse_network(spec: str) -> Tuple[int, int]:
+    """First and last address of a CIDR (every address), an address range or a single IP, as integers
+
+    Raises ValueError when spec is none of these.
+    """
+    from modules.ip_calculator import IPCalculator
+
+    spec = spec.strip()
+    if '/' in spec:
+        network = ipaddress.IPv4Network(spec, strict=False)
+        return int(network.network_address), int(network.broadcast_address)
+    return IPCalculator.parse_range(spec)
+
+
+def _address(ip: str) -> int:
+    """Integer IPv4 address of a literal, or -1 for a hostname"""
+    try:
+        return _ADDRESS.unpack(socket.inet_pton(socket.AF_INET, ip))[0]
+    except (OSError, TypeError):
+        return -1
+
+
+def _row_words(description: str, ip: str, address: int) -> List[str]:
+    """Words a row is indexed under: its description, and its name when it is not an IP literal"""
+    return tokens(description) if address >= 0 else tokens(f"{description} {ip}")
+
+
+class FilterIndex:
+    """Status buckets, word index and sorted addresses of a ResultStore's rows
+
+    sync() keeps the indexes current from the rows the store reports as
+    changed; the word index is only built once a text filter is first used.
+    The vocabulary words containing each query word are cached, so typing
+    one more letter only rescans the words that matched the shorter query.
+    """
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self.rows = 0  # Rows indexed so far
+        self.by_status: List[Set[int]] = [set() for _ in STATUS_TEXT]
+        self.words: Optional[Dict[str, Set[int]]] = None  # Word -> rows; built on the first text filter
+        self.addresses = array('q')  # Row -> integer address, -1 for hostnames
+        self.by_address = SortedKeyList()  # (address, row)
+        self._status = array('B')  # Status each row is filed under
+        self._containing: Dict[str, List[str]] = {}  # Query word -> vocabulary words containing it
+
+    def reset(self):
+        """Forget every row, after the store was loaded or cleared"""
+        self.__init__(self.store)
+
+    def sync(self, changed: Iterable[int] = ()):
+        """Index rows added to the store and move changed rows between status buckets"""
+        store = self.store
+        total = len(store)
+        located = []
+        for row in range(self.rows, total):
+            ip = store.ips[row]
+            code = store.status[row]
+            self.by_status[code].add(row)
+            self._status.append(code)
+            address = _address(ip)
+            self.addresses.append(address)
+            if address >= 0:
+                located.append((address, row))
+        if len(located) > len(self.by_address):
+            self.by_address.reset(itertools.chain(self.by_address, located))  # Bulk load: sort once
+        else:
+            for entry in located:
+                self.by_address.add(entry)
+        if self.words is not None:
+            self._index_words(self.rows, total)
+        self.rows = total
+        for row in changed:
+            if row < total:
+                code = store.status[row]
+                old = self._status[row]
+                if code != old:
+                    self.by_status[old].discard(row)
+                    self.by_status[code].add(row)
+                    self._status[row] = code
+
+    def _index_words(self, start: int, stop: int):
+        store, words = self.store, self.words
+        vocabulary = len(words)
+        for row in range(start, stop):
+            for word in _row_words(store.descriptions[row], store.ips[row], self.addresses[row]):
+                rows = words.get(word)
+                if rows is None:
+                    words[word] = {row}
+                else:
+                    rows.add(row)
+        if len(words) != vocabulary:
+            self._containing.clear()  # New words may contain cached queries
+
+    def _words_containing(self, query: str) -> List[str]:
+        """Vocabulary words containing query, narrowed from the longest cached prefix of it"""
+        found = self._containing.get(query)
+        if found is not None:
+            return found
+        candidates = self.words
+        for end in range(len(query) - 1, 0, -1):
+            shorter = self._containing.get(query[:end])
+            if shorter is not None:
+                candidates = shorter  # A word containing query contains each of its prefixes
+                break
+        found = [word for word in candidates if query in word]
+        if len(self._containing) >= MAX_CACHED_QUERIES:
+            self._containing.clear()
+        self._containing[query] = found
+        return found
+
+    def matching_words(self, text: str) -> Optional[Set[int]]:
+        """Rows where every word of text is part of a description or hostname word; None for no text"""
+        if self.words is None:
+            self.words = {}
+            self._index_words(0, self.rows)
+        found = None
+        for query in tokens(text):
+            rows = set()
+            for word in self._words_containing(query):
+                rows |= self.words[word]
+            found = rows if found is None else found & rows
+            if not found:
+                return set()
+        return found
+
+    def in_network(self, first: int, last: int) -> List[int]:
+        """Rows whose address lies in first..last"""
+        start = self.by_address.count_below((first, -1))
+        stop = self.by_address.count_below((last + 1, -1))
+        return [row for _, row in self.by_address.slice(start, stop)]
+
+
+class RowFilter:
+    """One filter setting over a FilterIndex; call it with a row to test the row"""
+
+    def __init__(self, index: FilterIndex, statuses: Optional[Iterable[int]] = None, text: str = "",
+                 network: Optional[Tuple[int, int]] = None):
+        """statuses are status codes to show (None = any); network is a (first, last) address range"""
+        self.index = index
+        self.statuses = frozenset(statuses) if statuses is not None else None
+        self.queries = tokens(text)
+        self.words = index.matching_words(text) if self.queries else None
+        self.network = network
+        self.rows = index.rows  # Rows after these joined later and are tested directly
+
+    @property
+    def active(self) -> bool:
+        return self.statuses is not None or self.words is not None or self.network is not None
+
+    def __call__(self, row: int) -> bool:
+        if self.statuses is not None and self.index.store.status[row] not in self.statuses:
+            return False
+        if row < self.rows:
+            if self.words is not None and row not in self.words:
+                return False
+            address = self.index.addresses[row]
+        else:
+            store = self.index.store
+            address = _address(store.ips[row])
+            if self.words is not None:
+                words = _row_words(store.descriptions[row], store.ips[row], address)
+                if not all(any(query in word for word in words) for query in self.queries):
+                    return False
+        return self.network is None or self.network[0] <= address <= self.network[1]
+
+    def candidates(self) -> Iterable[int]:
+        """Rows that may match, from the smallest index; rows that joined after the filter was set are always included"""
+        choices = []
+        if self.statuses is not None:
+            choices.append([row for code in self.statuses for row in self.index.by_status[code]])
+        if self.words is not None:
+            choices.append(self.words)
+        if self.network is not None:
+            choices.append(self.index.in_network(*self.network))
+        rows = min(choices, key=len) if choices else range(self.rows)
+        return itertools.chain(rows, range(self.rows, len(self.index.store)))
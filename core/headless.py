@@ -0,0 +1,237 @@
+"""
+Headless checker for Network Engineer Multitool
+
+Runs the IP Ping Checker's load -> ping -> report pipeline without a GUI,
+for monitors on servers with no display. Targets come from the same
+inventory files, probes go through the same engines (core.engines) and
+results land in the same ResultStore, so tuning either front end tunes
+both. IPs behind a down parent are suppressed as in the window's Upstream
+Suppression. Every result is written as one JSON line as it arrives.
+"""
+
+import itertools
+import json
+import threading
+import time
+from typing import IO, Iterable, List, Optional, Tuple
+
+from .engines import create_round_engine
+from .icmp import format_response_time, get_prober
+from .ping_parser import parse_reply_line
+from .pool import ProbePool
+from .rate_limit import shared_limiter
+from .resolver import is_ipv4_literal, shared_resolver
+from .results import ONLINE, ResultStore
+from .rtt import AdaptiveTimeouts
+from .stream_ping import iter_ping_output, ping_command
+from .targets import TargetList
+from .topology import UPSTREAM_STATUS, Topology
+from modules.ip_calculator import IPCalculator
+
+# Range addresses expanded and probed at a time, so a /16 never sits in memory at once
+RANGE_CHUNK = 4096
+
+
+class HeadlessChecker:
+    """Ping a target list once or round after round, writing each result as a JSON line"""
+
+    def __init__(self, targets: TargetList, output: IO[str], engine: str = "Auto", probe: str = "ICMP",
+                 port: Optional[int] = None, timeout_ms: int = 100, count: int = 4, interval: float = 1.0,
+                 threads: int = 50, max_in_flight: int = 5000, processes: Optional[int] = None,
+                 workers: Iterable[str] = (), first_reply: bool = False, ranges: Iterable[str] = (),
+                 timeouts: Optional[AdaptiveTimeouts] = None, token: Optional[str] = None,
+                 upstream: bool = False, log: Optional[IO[str]] = None):
+        """timeout_ms and count are per probe, interval the seconds between rounds; log gets a line per round
+
+        token is the shared token of the Distributed engine's workers. IPs are
+        suppressed behind down parents whenever the inventory has a parent
+        column; with upstream, parents are inferred from subnets without one.
+        """
+        self.targets = targets
+        self.output = output
+        self.log = log
+        self.engine = engine
+        self.probe = probe
+        self.port = port
+        self.timeout_ms = timeout_ms
+        self.count = count
+        self.interval = interval
+        self.threads = threads
+        self.max_in_flight = max_in_flight
+        self.processes = processes
+        self.workers = list(workers)
+        self.first_reply = first_reply
+        self.ranges = list(targets.ranges) + list(ranges)
+        self.timeouts = timeouts
+        self.token = token
+        self.port_map = {}
+        for ip, cell in zip(targets.ips, targets.ports):
+            try:
+                self.port_map[ip] = int(float(cell))
+            except (TypeError, ValueError):
+                continue  # Blank cell: use the port option
+        self.topology = None
+        if any(str(parent).strip() for parent in targets.parents):
+            self.topology = Topology.from_column(targets.ips, targets.parents)
+        elif upstream:
+            self.topology = Topology.from_subnets(targets.ips)
+        self.store = ResultStore()
+        self.store.load(targets.ips, targets.descriptions)
+        self.round = 0
+        self._stopping = threading.Event()
+        self._write_lock = threading.Lock()
+
+    def stop(self):
+        """Finish early: probes in flight are abandoned and run() returns; safe from a signal handler"""
+        self._stopping.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping.is_set()
+
+    def run(self, infinite: bool = False) -> int:
+        """Ping every target once, or until stop() in infinite mode; returns the rounds completed"""
+        count = 1 if infinite else self.count  # One echo per round, as in the GUI's infinite mode
+        if self.engine != "Distributed":  # Remote workers resolve names from their own site
+            names = [ip for ip in set(self.store.ips) if not is_ipv4_literal(ip)]
+            if names:
+                shared_resolver.resolve_all(names)
+        assignments = {ip: str(worker).strip() for ip, worker in zip(self.targets.ips, self.targets.workers)
+                       if str(worker).strip()}
+        engine = create_round_engine(self.engine, self.probe, self.timeout_ms / 1000, count, port=self.port,
+                                     ports=self.port_map, max_in_flight=self.max_in_flight,
+                                     processes=self.processes, workers=self.workers, assignments=assignments,
+                                     timeouts=self.timeouts, first_reply=self.first_reply, token=self.token)
+        pool = ProbePool(max(1, min(self.threads, len(self.store) + (RANGE_CHUNK if self.ranges else 0)))) \
+            if engine is None else None
+        completed = 0
+        try:
+            while not self.stopping:
+                self.round += 1
+                started = time.perf_counter()
+                self.ping_round(engine, pool, self.store.targets(), count)
+                self.sweep_ranges(engine, pool, count)
+                if self.stopping:
+                    break
+                completed += 1
+                if self.log is not None:
+                    online = sum(1 for code in self.store.status if code == ONLINE)
+                    saved = f", {self.topology.saved} probes saved upstream" if self.topology is not None else ""
+                    self.log.write(f"Round {self.round}: {online}/{len(self.store)} online "
+                                   f"in {time.perf_counter() - started:.1f}s{saved}\n")
+                    self.log.flush()
+                if not infinite:
+                    break
+                self._stopping.wait(self.interval)
+        finally:
+            if engine is not None:
+                engine.close()
+            if pool is not None:
+                pool.shutdown()
+            self.output.flush()
+        return completed
+
+    def ping_round(self, engine, pool: Optional[ProbePool], targets: List[Tuple[str, Optional[int]]], count: int):
+        """Probe (ip, row) targets with the round engine or the thread pool; row None is a range address"""
+        if self.topology is not None:
+            probed = []
+            for ip, row in targets:
+                if row is not None and self.topology.suppress(ip):
+                    self.publish_upstream(row, ip)
+                else:
+                    probed.append((ip, row))
+            targets = probed
+        if engine is not None:
+            engine.run(((row, ip) for ip, row in targets), self.publish, lambda: self.stopping)
+        else:
+            tasks = ((row, ip, count) for ip, row in targets)
+            for result, _ in pool.run_round(self.probe_host, tasks, lambda: self.stopping):
+                self.publish(*result)
+
+    def sweep_ranges(self, engine, pool: Optional[ProbePool], count: int):
+        """Sweep the CIDR/range targets lazily; responders get a row and are probed with the list from then on"""
+        hosts = (ip for ip in IPCalculator.iter_hosts(self.ranges) if self.store.find(ip) is None)
+        chunk_size = max(RANGE_CHUNK, self.max_in_flight)
+        while self.ranges and not self.stopping:
+            chunk = [(ip, None) for ip in itertools.islice(hosts, chunk_size)]
+            if not chunk:
+                break
+            self.ping_round(engine, pool, chunk, count)
+
+    def probe_host(self, row, ip: str, count: int):
+        """Thread-pool probe: the shared ICMP socket, or the system ping command without one"""
+        prober = get_prober() if self.engine != "System Ping" else None
+        timeout_ms = self.timeout_ms
+        try:
+            if prober is not None:
+                rtts = prober.ping(ip, timeout_ms / 1000, count, self.timeouts, None, self.first_reply)
+                return row, ip, rtts, None
+            if self.timeouts is not None:
+                timeout_ms = max(1, round(self.timeouts.timeout(ip) * 1000))
+            address = shared_resolver.address(ip)
+            shared_limiter.acquire(address, count)
+            rtts = []
+            # Closing the output early ends the ping process, freeing the thread at once
+            output = iter_ping_output(ping_command(address, count, timeout_ms))
+            try:
+                for line in output:
+                    is_event, rtt = parse_reply_line(line)
+                    if not is_event:
+                        continue
+                    if self.timeouts is not None:
+                        self.timeouts.observe(ip, rtt)
+                    rtts.append(rtt)
+                    if self.first_reply and rtt is not None:
+                        break
+            finally:
+                output.close()
+            return row, ip, rtts + [None] * max(0, count - len(rtts)), None
+        except Exception as e:
+            return row, ip, [], str(e)
+
+    def publish(self, row: Optional[int], ip: str, rtts: List[Optional[float]], error: Optional[str]):
+        """Store a result and write it out; silent range addresses are neither"""
+        times = [rtt for rtt in rtts if rtt is not None]
+        if error:
+            response_time = f"Error: {error}"
+        else:
+            response_time = format_response_time(times) if times else "Timeout"
+        status = "Online" if times and not error else "Offline"
+        if row is None:
+            if status != "Online":
+                return
+            row = self.store.add(ip)
+        if self.topology is not None:
+            self.topology.record(ip, status == "Online")  # Parent state decides which IPs are suppressed next
+        self.write(row, ip, status, response_time, times, error)
+
+    def publish_upstream(self, row: int, ip: str):
+        """Store and write an IP not probed because an ancestor is down"""
+        self.write(row, ip, UPSTREAM_STATUS, "-", [], None, upstream=self.topology.down_parent(ip))
+
+    def write(self, row: int, ip: str, status: str, response_time: str, times: List[float],
+              error: Optional[str], upstream: Optional[str] = None):
+        """Store a row's result and write its JSON line"""
+        checked = time.time()
+        with self.store.lock:
+            self.store.update(row, status, response_time, checked)
+            loss, jitter = self.store.history.loss(row), self.store.history.jitter(row)
+        record = {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(checked)),
+            'round': self.round,
+            'ip': ip,
+            'description': self.store.descriptions[row],
+            'status': status,
+            'rtt_ms': round(sum(times) / len(times), 3) if times else None,
+            'response': response_time,
+            'loss_pct': round(loss, 1) if loss is not None else None,
+            'jitter_ms': round(jitter, 3) if jitter is not None else None,
+        }
+        if error:
+            record['error'] = error
+        if upstream:
+            record['upstream'] = upstream  # The down ancestor
+        line = json.dumps(record, ensure_ascii=False)
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
@@ -0,0 +1,94 @@
+"""
+RTT history for Network Engineer Multitool
+
+The table shows one value per host, which hides trends such as rising
+latency or a host dropping one reply in five. RttHistory keeps the last N
+samples of every row in one flat float32 array used as a ring per row:
+a sample is a response time in ms, or NaN for a lost probe. Memory is
+fixed at rows x N x 4 bytes (plus a 4-byte counter per row) however long
+an infinite run goes.
+"""
+
+import math
+from array import array
+from typing import List, Optional
+
+# Samples kept per host
+HISTORY_SAMPLES = 30
+
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+SPARK_LOSS = "×"
+
+_LOST = math.nan
+
+
+class RttHistory:
+    """The last `samples` RTT/loss samples of each row, in preallocated ring buffers
+
+    Not locked itself; ResultStore writes it under the store's lock.
+    """
+
+    def __init__(self, samples: int = HISTORY_SAMPLES):
+        if samples < 1:
+            raise ValueError("History needs at least one sample per host")
+        self.samples = samples
+        self.values = array('f')  # Row r's ring is values[r * samples:(r + 1) * samples]
+        self.seen = array('I')  # Samples recorded per row, folded into samples..2*samples-1 once full
+
+    def reset(self, rows: int = 0):
+        self.values = array('f', [_LOST]) * (rows * self.samples)
+        self.seen = array('I', bytes(4 * rows))
+
+    def append(self):
+        """Add an empty ring for a new row"""
+        self.values.extend(array('f', [_LOST]) * self.samples)
+        self.seen.append(0)
+
+    def record(self, row: int, rtt: Optional[float]):
+        """Add a sample to a row: a response time in ms, or None for a lost probe"""
+        seen = self.seen[row]
+        self.values[row * self.samples + seen % self.samples] = _LOST if rtt is None else rtt
+        seen += 1
+        self.seen[row] = seen - self.samples if seen >= 2 * self.samples else seen
+
+    def recent(self, row: int) -> List[float]:
+        """Samples of a row, oldest first; NaN marks a loss"""
+        seen = self.seen[row]
+        start = row * self.samples
+        ring = self.values[start:start + self.samples]
+        if seen < self.samples:
+            return ring[:seen].tolist()
+        split = seen % self.samples
+        return (ring[split:] + ring[:split]).tolist()
+
+    def loss(self, row: int) -> Optional[float]:
+        """Percentage of the recent samples that were lost, or None before the first sample"""
+        samples = self.recent(row)
+        if not samples:
+            return None
+        return 100.0 * sum(1 for rtt in samples if rtt != rtt) / len(samples)
+
+    def jitter(self, row: int) -> Optional[float]:
+        """Mean change in ms between consecutive replies, or None with fewer than two replies"""
+        replies = [rtt for rtt in self.recent(row) if rtt == rtt]
+        if len(replies) < 2:
+            return None
+        return sum(abs(b - a) for a, b in zip(replies, replies[1:])) / (len(replies) - 1)
+
+    def mean(self, row: int) -> Optional[float]:
+        replies = [rtt for rtt in self.recent(row) if rtt == rtt]
+        return sum(replies) / len(replies) if replies else None
+
+    def sparkline(self, row: int) -> str:
+        """One bar per sample, scaled between the lowest and highest reply; losses show as ×"""
+        samples = self.recent(row)
+        replies = [rtt for rtt in samples if rtt == rtt]
+        if not replies:
+            return SPARK_LOSS * len(samples)
+        low, span = min(replies), max(replies) - min(replies)
+        top = len(SPARK_BARS) - 1
+        return "".join(SPARK_LOSS if rtt != rtt else SPARK_BARS[round((rtt - low) / span * top) if span else 0]
+                       for rtt in samples)
+
+    def __len__(self) -> int:
+        return len(self.seen)
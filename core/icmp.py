@@ -0,0 +1,286 @@
+"""
+ICMP echo probe engine for Network Engineer Multitool
+
+Sends echo requests over an unprivileged datagram ICMP socket (Linux
+``net.ipv4.ping_group_range``, macOS) or a raw socket, and matches replies
+by identifier/sequence instead of spawning a ``ping`` process per probe.
+"""
+
+import ctypes
+import itertools
+import random
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .rate_limit import ProbeRateLimiter, shared_limiter
+from .resolver import is_ipv4_literal, shared_resolver
+from .rtt import AdaptiveTimeouts
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+_ICMP_HEADER = struct.Struct('!BBHHH')
+
+SO_ATTACH_FILTER = 26  # Linux
+
+
+def checksum(data: bytes) -> int:
+    """Compute the RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = b'') -> bytes:
+    """Build an ICMP echo request packet"""
+    header = _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = checksum(header + payload)
+    return _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def parse_echo_reply(packet: bytes) -> Optional[Tuple[int, int]]:
+    """Return (identifier, sequence) of an echo reply, or None for anything else"""
+    # Raw sockets (and datagram sockets on macOS) deliver the IPv4 header too
+    if packet and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < _ICMP_HEADER.size:
+        return None
+    icmp_type, _, _, ident, seq = _ICMP_HEADER.unpack_from(packet)
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq
+
+
+def open_icmp_socket() -> Tuple[socket.socket, bool]:
+    """Open an ICMP socket, preferring unprivileged datagram over raw
+
+    Returns the socket and whether it is raw. Raises OSError when neither
+    kind is permitted for this process.
+    """
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+    except OSError:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+
+
+def filter_identifier(sock: socket.socket, ident: int):
+    """Let a raw ICMP socket receive only packets carrying its identifier (Linux only)
+
+    Every raw ICMP socket sees every ICMP packet, so several probing
+    processes would each wake for, and buffer, all of each other's replies.
+    """
+    if not sys.platform.startswith('linux'):
+        return
+    # Classic BPF; raw sockets receive the IP header in front of the ICMP header
+    program = ctypes.create_string_buffer(struct.pack(
+        'HBBI' * 5,
+        0xb1, 0, 0, 0,  # ldxb 4*([0]&0xf): IP header length
+        0x48, 0, 0, 4,  # ldh [x+4]: ICMP identifier
+        0x15, 0, 1, ident,  # jeq #ident
+        0x06, 0, 0, 0xFFFF,  # ret: accept
+        0x06, 0, 0, 0,  # ret: drop
+    ))
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, struct.pack('HP', 5, ctypes.addressof(program)))
+    except OSError:
+        pass  # Unfiltered still works; replies are matched by identifier anyway
+
+
+def resolve(host: str) -> str:
+    """Resolve a target to an IPv4 address string through the shared resolver cache"""
+    return shared_resolver.resolve(host)
+
+
+def format_response_time(times: List[float]) -> str:
+    """Format round-trip times the way the GUI displays them"""
+    avg_time = sum(times) / len(times)
+    return "< 1" if avg_time < 1 else f"{avg_time:.1f}"
+
+
+class IcmpSocket:
+    """Non-blocking ICMP echo socket without any threading of its own"""
+
+    def __init__(self, payload_size: int = 32):
+        """Open the socket; raises OSError if ICMP sockets are not allowed"""
+        self.sock, self.raw = open_icmp_socket()
+        self.sock.setblocking(False)
+        try:
+            # Replies to a large burst arrive faster than one reader drains them
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        # Datagram sockets get their identifier rewritten by the kernel, which
+        # also filters replies for us; raw sockets see every ICMP packet.
+        self.ident = random.randint(0, 0xFFFF)
+        self.payload = b'\x00' * payload_size
+
+    @property
+    def ident(self) -> int:
+        return self._ident
+
+    @ident.setter
+    def ident(self, ident: int):
+        """Change the identifier; a raw socket's kernel filter follows it, or its replies would be dropped"""
+        self._ident = ident & 0xFFFF
+        if self.raw:
+            filter_identifier(self.sock, self._ident)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def send_echo(self, address: str, seq: int) -> float:
+        """Send one echo request and return its perf_counter send time"""
+        packet = build_echo_request(self.ident, seq & 0xFFFF, self.payload)
+        self.sock.sendto(packet, (address, 0))
+        return time.perf_counter()
+
+    def read_replies(self) -> List[Tuple[int, str, float]]:
+        """Drain pending echo replies as (seq, address, receive_time)"""
+        replies = []
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            received = time.perf_counter()
+            parsed = parse_echo_reply(packet)
+            if parsed is None:
+                continue
+            ident, seq = parsed
+            if self.raw and ident != self.ident:
+                continue
+            replies.append((seq, addr[0], received))
+        return replies
+
+    def close(self):
+        self.sock.close()
+
+
+class _Pending:
+    """Echo request waiting for its reply"""
+
+    __slots__ = ('address', 'sent', 'rtt', 'event')
+
+    def __init__(self, address: str):
+        self.address = address
+        self.sent = 0.0
+        self.rtt = None
+        self.event = threading.Event()
+
+
+class IcmpProber:
+    """Thread-safe blocking pinger sharing one ICMP socket and one receiver thread"""
+
+    def __init__(self, payload_size: int = 32, limiter: Optional[ProbeRateLimiter] = None):
+        """Open the shared socket; raises OSError if ICMP sockets are not allowed"""
+        self.icmp = IcmpSocket(payload_size)
+        self.limiter = limiter if limiter is not None else shared_limiter
+        self._seq = itertools.count(random.randint(0, 0xFFFF))
+        self._pending: Dict[int, _Pending] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        self._receiver.start()
+
+    def _receive_loop(self):
+        """Match incoming replies to pending requests"""
+        while not self._closed:
+            try:
+                readable, _, _ = select.select([self.icmp], [], [], 0.5)
+            except (OSError, ValueError):
+                break
+            if not readable:
+                continue
+            for seq, address, received in self.icmp.read_replies():
+                with self._lock:
+                    pending = self._pending.get(seq)
+                    if pending is None or pending.address != address:
+                        continue
+                    del self._pending[seq]
+                pending.rtt = (received - pending.sent) * 1000
+                pending.event.set()
+
+    def _next_seq(self) -> int:
+        """Allocate a 16-bit sequence number not currently in flight"""
+        while True:
+            seq = next(self._seq) & 0xFFFF
+            if seq not in self._pending:
+                return seq
+
+    def echo(self, address: str, timeout: float) -> Optional[float]:
+        """Send one echo request and wait for its reply
+
+        Returns the round-trip time in milliseconds, or None on timeout.
+        """
+        self.limiter.acquire(address)
+        pending = _Pending(address)
+        with self._lock:
+            seq = self._next_seq()
+            self._pending[seq] = pending
+        try:
+            pending.sent = time.perf_counter()
+            self.icmp.send_echo(address, seq)
+            pending.event.wait(timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(seq, None)
+        return pending.rtt
+
+    def ping(self, host: str, timeout: float, count: int = 1,
+             timeouts: Optional[AdaptiveTimeouts] = None,
+             on_reply: Optional[Callable[[int, Optional[float]], None]] = None,
+             first_reply: bool = False) -> List[Optional[float]]:
+        """Ping a host up to count times, returning one RTT (ms) or None per echo sent
+
+        With adaptive timeouts, each echo waits the host's own timeout instead
+        of timeout and its result updates the host's estimate. on_reply(index,
+        rtt) is called as each echo completes; first_reply stops at the first
+        answer, for pure reachability checks.
+        """
+        address = resolve(host)
+        rtts = []
+        for index in range(count):
+            rtt = self.echo(address, timeout if timeouts is None else timeouts.timeout(address))
+            if timeouts is not None:
+                timeouts.observe(address, rtt)
+            rtts.append(rtt)
+            if on_reply is not None:
+                on_reply(index, rtt)
+            if first_reply and rtt is not None:
+                break
+        return rtts
+
+    def close(self):
+        self._closed = True
+        self._receiver.join(timeout=1)
+        self.icmp.close()
+
+
+_shared_prober = None
+_shared_error = None
+_shared_lock = threading.Lock()
+
+
+def get_prober() -> Optional[IcmpProber]:
+    """Return the process-wide prober, or None when ICMP sockets are unavailable"""
+    global _shared_prober, _shared_error
+    with _shared_lock:
+        if _shared_prober is None and _shared_error is None:
+            try:
+                _shared_prober = IcmpProber()
+            except OSError as e:
+                _shared_error = e
+        return _shared_prober
+
+
+def icmp_available() -> bool:
+    """Check whether this process may send ICMP echo over sockets"""
+    return get_prober() is not None
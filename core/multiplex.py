@@ -0,0 +1,179 @@
+"""
+Multiplexed round sender for Network Engineer Multitool
+
+fping-style rounds: one socket sends an echo request to every target back
+to back, one receiver thread demultiplexes replies by sequence number into
+a preallocated per-host slot, and the whole round shares a single timeout
+window instead of paying one timeout per host.
+"""
+
+import random
+import select
+import threading
+import time
+from array import array
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .async_sweep import ResultCallback
+from .icmp import IcmpSocket, is_ipv4_literal, resolve
+from .rate_limit import ProbeRateLimiter, shared_limiter
+from .rtt import AdaptiveTimeouts
+
+# Targets per window; sequence numbers are 16 bits
+WINDOW_SIZE = 0xFFFF
+
+
+class RoundSender:
+    """Send one echo to every target per round over one shared socket"""
+
+    def __init__(self, timeout: float = 1.0, count: int = 1, limiter: Optional[ProbeRateLimiter] = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None, first_reply: bool = False):
+        """Open the ICMP socket; raises OSError if ICMP sockets are not allowed
+
+        timeout is the shared reply window in seconds after the last send. With
+        adaptive timeouts every host has its own deadline instead, and the
+        window closes at the latest deadline of a host still unanswered.
+        first_reply reports each host after its first answer and leaves it out
+        of later rounds.
+        """
+        self.icmp = IcmpSocket()
+        self.timeout = timeout
+        self.count = count
+        self.limiter = limiter if limiter is not None else shared_limiter
+        self.timeouts = timeouts
+        self.first_reply = first_reply
+        self._lock = threading.Lock()
+        self._base = random.randint(0, 0xFFFF)
+        self._addresses: List[Optional[str]] = []
+        self._sent = array('d')
+        self._rtts: List[Optional[float]] = []
+        self._remaining = 0
+        self._done = threading.Event()
+        self._closed = False
+        self._receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        self._receiver.start()
+
+    def _receive_loop(self):
+        """Drop each reply into its host's slot"""
+        while not self._closed:
+            try:
+                readable, _, _ = select.select([self.icmp], [], [], 0.5)
+            except (OSError, ValueError):
+                break
+            if not readable:
+                continue
+            replies = self.icmp.read_replies()
+            with self._lock:
+                for seq, address, received in replies:
+                    index = (seq - self._base) & 0xFFFF
+                    if index >= len(self._addresses) or self._addresses[index] != address:
+                        continue
+                    if self._rtts[index] is not None:
+                        continue
+                    self._rtts[index] = (received - self._sent[index]) * 1000
+                    self._remaining -= 1
+                if self._addresses and self._remaining <= 0:
+                    self._done.set()
+
+    def _send_all(self, address: str, seq: int) -> bool:
+        """Send one request, waiting for buffer space when the socket is full"""
+        while True:
+            try:
+                self.icmp.send_echo(address, seq)
+                return True
+            except BlockingIOError:
+                select.select([], [self.icmp], [], self.timeout)
+            except OSError:
+                return False
+
+    def send_window(self, addresses: List[Optional[str]]) -> List[Optional[float]]:
+        """Send to up to WINDOW_SIZE addresses and wait one shared timeout window
+
+        Returns one RTT in ms (or None) per address; None addresses are skipped.
+        """
+        with self._lock:
+            # Move past the previous window so late replies cannot match
+            self._base = (self._base + len(self._addresses) + 1) & 0xFFFF
+            if self.icmp.raw:
+                self.icmp.ident = random.randint(0, 0xFFFF)
+            self._addresses = addresses
+            self._sent = array('d', bytes(8 * len(addresses)))
+            self._rtts = [None] * len(addresses)
+            self._remaining = sum(1 for address in addresses if address is not None)
+            self._done.clear()
+
+        for index, address in enumerate(addresses):
+            if address is None:
+                continue
+            self.limiter.acquire(address)
+            self._sent[index] = time.perf_counter()
+            if not self._send_all(address, self._base + index):
+                with self._lock:
+                    self._remaining -= 1
+
+        with self._lock:
+            if self._remaining <= 0:
+                self._done.set()
+        if self.timeouts is None:
+            self._done.wait(self.timeout)
+            with self._lock:
+                rtts = self._rtts
+                self._addresses = []
+            return rtts
+
+        limits = [self.timeouts.timeout(address) if address is not None else 0.0 for address in addresses]
+        deadline = max((self._sent[index] + limit for index, limit in enumerate(limits)), default=0.0)
+        self._done.wait(max(0.0, deadline - time.perf_counter()))
+        with self._lock:
+            rtts = self._rtts
+            self._addresses = []
+        for index, address in enumerate(addresses):
+            if address is None:
+                continue
+            if rtts[index] is not None and rtts[index] > limits[index] * 1000:
+                rtts[index] = None  # Answered after its own deadline
+            self.timeouts.observe(address, rtts[index])
+        return rtts
+
+    def run(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+            should_stop: Optional[Callable[[], bool]] = None):
+        """Probe every (key, host) target in count rounds, then report each host"""
+        targets = list(targets)
+        addresses: List[Optional[str]] = []
+        errors = {}
+        for index, (key, host) in enumerate(targets):
+            host = str(host).strip()
+            try:
+                addresses.append(host if is_ipv4_literal(host) else resolve(host))
+            except OSError as e:
+                addresses.append(None)
+                errors[index] = str(e)
+
+        for index, (key, host) in enumerate(targets):
+            if index in errors:
+                on_result(key, host, [], errors[index])
+
+        rtts: List[List[Optional[float]]] = [[] for _ in targets]
+        for _ in range(self.count):
+            for start in range(0, len(addresses), WINDOW_SIZE):
+                if should_stop is not None and should_stop():
+                    break
+                window = self.send_window(addresses[start:start + WINDOW_SIZE])
+                for offset, rtt in enumerate(window):
+                    index = start + offset
+                    if addresses[index] is None:
+                        continue
+                    rtts[index].append(rtt)
+                    if self.first_reply and rtt is not None:
+                        # Answered: report now and leave the host out of later rounds
+                        on_result(targets[index][0], targets[index][1], rtts[index], None)
+                        addresses[index] = None
+
+        for index, (key, host) in enumerate(targets):
+            if addresses[index] is not None and rtts[index]:
+                on_result(key, host, rtts[index], None)
+
+    def close(self):
+        self._closed = True
+        self._receiver.join(timeout=1)
+        self.icmp.close()
@@ -0,0 +1,129 @@
+"""
+Ping output parser for Network Engineer Multitool
+
+One parser for every ``ping`` the tool runs: Windows (English, Russian and
+other locales), Linux iputils, busybox and BSD/macOS. All patterns are
+compiled once into a single alternation and the output is scanned in one
+pass, because parsing runs for every probe.
+
+Patterns key on the shape of a line (``=14ms TTL=117``, ``a/b/c ms``,
+``= 4, ... = 4, ... = 0``) rather than on its words wherever the formats
+allow. Loss lines have no such shape and use a keyword list instead.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+_NUMBER = r'\d+(?:[.,]\d+)?'
+
+# Named alternatives; the first one that matches at a position wins
+_PATTERNS = (
+    # Windows, any locale: "time=14ms TTL=117", "время<1мс TTL=117", "Zeit=14ms TTL=117"
+    # (upper-case TTL only, so "icmp_seq=1 ttl=64" is left to the Unix pattern)
+    rf'(?P<wsign>[=<])\s*(?P<wrtt>{_NUMBER})\s*[^\W\d]*\s+(?-i:TTL)=(?P<wttl>\d+)',
+    # iputils, busybox, BSD: "ttl=117 time=14.2 ms" (hlim for IPv6 on BSD)
+    rf'(?:ttl|hlim)=(?P<uttl>\d+)\s+\w+(?P<usign>[=<])(?P<urtt>{_NUMBER})\s*ms',
+    # Unix summary: "4 packets transmitted, 3 (packets) received, ..."
+    r'(?P<usent>\d+) packets transmitted, (?P<urecv>\d+) (?:packets )?received',
+    # Windows summary, any locale: "Sent = 4, Received = 3, Lost = 1"
+    r'=\s*(?P<wsent>\d+),\s*\w+\s*=\s*(?P<wrecv>\d+),\s*\w+\s*=\s*(?P<wlost>\d+)',
+    # Unix timing summary: "min/avg/max(/mdev) = 13.1/14.2/15.3(/0.8) ms"
+    r'= (?P<umin>[\d.]+)/(?P<uavg>[\d.]+)/(?P<umax>[\d.]+)(?:/[\d.]+)? ?ms',
+    # Windows timing summary, any locale: "Minimum = 13ms, Maximum = 15ms, Average = 14ms"
+    r'= (?P<wmin>\d+) ?[^\W\d]*, \w+ = (?P<wmax>\d+) ?[^\W\d]*, \w+ = (?P<wavg>\d+)',
+    # Lost echo
+    r'(?P<loss>timed out|request timeout|no answer yet|unreachable|превышен|недоступен)',
+    # Name resolution failure
+    r'(?P<unknown>could not find host|unknown host|not known|cannot resolve|не удалось обнаружить узел)',
+)
+
+# Every alternative starts with one of these characters; checking them first
+# lets the scanner skip most positions without trying each alternative
+_FIRST_CHARS = r'(?=[=<\dthrnucпн])'
+
+_PING_RE = re.compile(_FIRST_CHARS + '(?:' + '|'.join(_PATTERNS) + ')', re.IGNORECASE)
+_REPLY_RE = re.compile(_FIRST_CHARS + '(?:' + '|'.join(_PATTERNS[:2] + _PATTERNS[6:7]) + ')', re.IGNORECASE)
+
+
+def _rtt(sign: str, value: str) -> float:
+    """RTT in ms; Windows prints sub-millisecond replies as <1ms"""
+    return 0.0 if sign == '<' else float(value.replace(',', '.'))
+
+
+def parse_reply_line(text: str) -> Tuple[bool, Optional[float]]:
+    """Classify one ping output line as (is_event, rtt)
+
+    A reply gives (True, RTT in ms), a timeout or unreachable line gives
+    (True, None), and any other line gives (False, None).
+    """
+    match = _REPLY_RE.search(text)
+    if match is None:
+        return False, None
+    if match.group('wrtt') is not None:
+        return True, _rtt(match.group('wsign'), match.group('wrtt'))
+    if match.group('urtt') is not None:
+        return True, _rtt(match.group('usign'), match.group('urtt'))
+    return True, None
+
+
+def parse_ping_output(output: str, count: Optional[int] = None) -> Dict:
+    """Parse the full output of one ping command
+
+    Returns a result dict with packets_sent, packets_received, packet_loss,
+    the per-reply times (ms) and ttls, min_time/avg_time/max_time when any
+    reply arrived, success, and error for unknown hosts. count is the number
+    of echoes requested, used when the output has no summary.
+    """
+    times: List[float] = []
+    ttls: List[int] = []
+    losses = 0
+    sent = received = None
+    summary = None
+    unknown = False
+
+    for match in _PING_RE.finditer(output):
+        kind = match.lastgroup
+        if kind in ('wttl', 'urtt'):
+            if kind == 'wttl':
+                times.append(_rtt(match.group('wsign'), match.group('wrtt')))
+                ttls.append(int(match.group('wttl')))
+            else:
+                times.append(_rtt(match.group('usign'), match.group('urtt')))
+                ttls.append(int(match.group('uttl')))
+        elif kind == 'loss':
+            losses += 1
+        elif kind == 'urecv':
+            sent, received = int(match.group('usent')), int(match.group('urecv'))
+        elif kind == 'wlost':
+            sent, received = int(match.group('wsent')), int(match.group('wrecv'))
+        elif kind == 'umax':
+            summary = (float(match.group('umin')), float(match.group('uavg')), float(match.group('umax')))
+        elif kind == 'wavg':
+            summary = (float(match.group('wmin')), float(match.group('wavg')), float(match.group('wmax')))
+        elif kind == 'unknown':
+            unknown = True
+
+    if sent is None:
+        sent = count if count is not None else len(times) + losses
+    if times or losses or received is None:
+        # Windows counts "Destination host unreachable" as received; only echo replies count here
+        received = len(times)
+
+    result = {
+        'success': received > 0,
+        'packets_sent': sent,
+        'packets_received': received,
+        # Duplicate replies can outnumber requests
+        'packet_loss': max(0.0, (sent - received) / sent * 100) if sent else 100.0,
+        'times': times,
+        'ttls': ttls,
+    }
+    if summary is not None and received:
+        result['min_time'], result['avg_time'], result['max_time'] = summary
+    elif times:
+        result['min_time'] = min(times)
+        result['max_time'] = max(times)
+        result['avg_time'] = sum(times) / len(times)
+    if unknown and not received:
+        result['error'] = 'Host not found'
+    return result
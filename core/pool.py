@@ -0,0 +1,134 @@
+"""
+Probe worker pool and round progress for Network Engineer Multitool
+"""
+
+import itertools
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+class ProbePool:
+    """Long-lived thread pool that hands back finished probes in completion order
+
+    One pool lives for a whole ping session. Every finished future is pushed
+    onto the pool's own result queue together with its completion time, so
+    one slow host never holds back results that are already done. The queue
+    is private: callbacks of a previous session's pool can never land in it.
+    """
+
+    def __init__(self, max_workers: int):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self.results: queue.Queue = queue.Queue()
+        self._rounds = itertools.count(1)
+
+    def run_round(self, func: Callable, tasks: Iterable[Tuple], should_stop: Optional[Callable[[], bool]] = None
+                  ) -> Iterator[Tuple[Any, float]]:
+        """Submit func(*task) for every task and yield (result, completed_at) as they finish
+
+        completed_at is the perf_counter time the probe finished. Stopping
+        cancels probes that have not started yet.
+        """
+        round_id = next(self._rounds)
+        on_done = self._done_callback(round_id)
+
+        futures = []
+        for task in tasks:
+            if should_stop is not None and should_stop():
+                break
+            future = self.executor.submit(func, *task)
+            future.add_done_callback(on_done)
+            futures.append(future)
+
+        remaining = len(futures)
+        try:
+            while remaining:
+                if should_stop is not None and should_stop():
+                    break
+                try:
+                    done_round, future, completed_at = self.results.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if done_round != round_id:
+                    continue  # Leftover from a stopped round
+                remaining -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error pinging: {e}")
+                    continue
+                yield result, completed_at
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Submit one probe outside of any round; collect() hands it back when done"""
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(self._done_callback(0))
+        return future
+
+    def collect(self, timeout: float) -> List[Tuple[Any, float]]:
+        """Wait up to timeout for finished submit() probes and return every one ready"""
+        finished = []
+        try:
+            item = self.results.get(timeout=timeout) if timeout > 0 else self.results.get_nowait()
+            while True:
+                done_round, future, completed_at = item
+                if done_round == 0 and not future.cancelled():
+                    try:
+                        finished.append((future.result(), completed_at))
+                    except Exception as e:
+                        print(f"Error pinging: {e}")
+                item = self.results.get_nowait()
+        except queue.Empty:
+            pass
+        return finished
+
+    def _done_callback(self, round_id: int) -> Callable[[Future], None]:
+        """Callback pushing a finished future and its completion time onto the queue"""
+        def on_done(future: Future):
+            self.results.put((round_id, future, time.perf_counter()))
+        return on_done
+
+    def shutdown(self, wait: bool = False):
+        self.executor.shutdown(wait=wait)
+
+
+class RoundProgress:
+    """Progress and latency-to-display counters for one ping round"""
+
+    def __init__(self, label: str, total: Optional[int] = None):
+        """total is None for open-ended sessions such as streaming"""
+        self.label = label
+        self.total = total
+        self.started = time.perf_counter()
+        self.completed = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def record(self, completed_at: float) -> float:
+        """Count a displayed result and return its lag since the probe finished, in seconds"""
+        lag = time.perf_counter() - completed_at
+        self.completed += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        return lag
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def average_lag(self) -> float:
+        return self.total_lag / self.completed if self.completed else 0.0
+
+    def summary(self) -> str:
+        """One-line status text for the status bar"""
+        if self.total is None:
+            done = f"{self.completed} results ({self.completed / max(self.elapsed, 1e-9):.0f}/s)"
+        else:
+            done = f"{self.completed}/{self.total} completed"
+        return (f"{self.label}: {done} in {self.elapsed:.1f}s "
+                f"(display lag avg {self.average_lag * 1000:.0f} ms, max {self.max_lag * 1000:.0f} ms)")
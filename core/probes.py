@@ -0,0 +1,133 @@
+"""
+Probe backends for Network Engineer Multitool
+
+Many hosts sit behind firewalls that drop ICMP but still answer on their
+service ports. Besides ICMP echo, hosts can be probed with a non-blocking
+TCP connect or a UDP datagram. Every backend runs on the asyncio sweep
+machinery, so thousands of probes share one event loop, one concurrency
+limit, the probe rate limiter, adaptive timeouts and the same result model.
+"""
+
+import asyncio
+import os
+import socket
+import struct
+import time
+from typing import Dict, Optional
+
+from .async_sweep import AsyncProber, AsyncSweeper
+
+PROBE_TYPES = ("ICMP", "TCP", "UDP")
+
+DEFAULT_PORTS = {"TCP": 80, "UDP": 33434}
+
+# File descriptors kept free for everything else in the process
+_RESERVED_DESCRIPTORS = 64
+
+# struct linger with l_onoff=1, l_linger=0 (u_short fields on Windows, int elsewhere)
+_LINGER_RESET = struct.pack('HH' if os.name == 'nt' else 'ii', 1, 0)
+
+
+def _descriptor_budget(requested: int) -> int:
+    """Cap concurrent sockets below the process's open-file limit"""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, ValueError, OSError):
+        return requested  # No such limit on Windows
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - _RESERVED_DESCRIPTORS))
+
+
+class PortProber(AsyncProber):
+    """Base for backends that probe a port: one socket per probe in flight"""
+
+    def __init__(self, port: int, ports: Optional[Dict[str, int]] = None, max_in_flight: int = 5000, **kwargs):
+        """port is the default destination port; ports maps a host to its own port"""
+        super().__init__(max_in_flight=_descriptor_budget(max_in_flight), **kwargs)
+        self.port = port
+        self.ports = ports or {}
+
+    def port_for(self, host: str) -> Optional[int]:
+        return self.ports.get(host, self.port)
+
+
+class TcpConnectProber(PortProber):
+    """Non-blocking TCP connect probe
+
+    An accepted connection and a refused one (RST) both prove the host is up,
+    so both count as a reply; only silence or an unreachable error is a loss.
+    """
+
+    def __init__(self, port: int = DEFAULT_PORTS["TCP"], ports: Optional[Dict[str, int]] = None, **kwargs):
+        super().__init__(port, ports, **kwargs)
+
+    async def _probe_once(self, address: str, port: Optional[int], timeout: float) -> Optional[float]:
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        # Close with RST instead of FIN so thousands of probes leave no TIME_WAIT sockets
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+        try:
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, (address, port)), timeout)
+            except ConnectionRefusedError:
+                pass  # The host answered; only the port is closed
+            except (asyncio.TimeoutError, OSError):
+                return None
+            return (time.perf_counter() - start) * 1000
+        finally:
+            sock.close()
+
+
+class UdpProber(PortProber):
+    """UDP datagram probe
+
+    Any datagram back, or an ICMP port unreachable (reported on the connected
+    socket as a refused/reset error), proves the host is up. Silence is
+    reported as lost, since it cannot tell a dead host from a filtered port.
+    """
+
+    def __init__(self, port: int = DEFAULT_PORTS["UDP"], ports: Optional[Dict[str, int]] = None,
+                 payload: bytes = b'', **kwargs):
+        """The default port is the traceroute base port, normally closed, so live hosts answer unreachable"""
+        super().__init__(port, ports, **kwargs)
+        self.payload = payload
+
+    async def _probe_once(self, address: str, port: Optional[int], timeout: float) -> Optional[float]:
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            try:
+                sock.connect((address, port))
+                await loop.sock_sendall(sock, self.payload)
+                await asyncio.wait_for(loop.sock_recv(sock, 512), timeout)
+            except (ConnectionRefusedError, ConnectionResetError):
+                pass  # Port unreachable: the host answered
+            except (asyncio.TimeoutError, OSError):
+                return None
+            return (time.perf_counter() - start) * 1000
+        finally:
+            sock.close()
+
+
+def create_prober(probe_type: str = "ICMP", port: Optional[int] = None,
+                  ports: Optional[Dict[str, int]] = None, **kwargs) -> AsyncProber:
+    """Create the backend for a probe type from PROBE_TYPES
+
+    kwargs are the shared AsyncProber options (timeout, count, max_in_flight,
+    limiter, timeouts, first_reply). Raises OSError for ICMP when ICMP sockets
+    are not allowed, and ValueError for an unknown probe type.
+    """
+    probe_type = probe_type.upper()
+    if probe_type == "ICMP":
+        return AsyncSweeper(**kwargs)
+    if probe_type == "TCP":
+        return TcpConnectProber(port or DEFAULT_PORTS["TCP"], ports, **kwargs)
+    if probe_type == "UDP":
+        return UdpProber(port or DEFAULT_PORTS["UDP"], ports, **kwargs)
+    raise ValueError(f"Unknown probe type: {probe_type}")
@@ -0,0 +1,122 @@
+"""
+Probe rate limiting for Network Engineer Multitool
+
+A global packets-per-second cap and an optional per-/24 cap, enforced by
+token buckets in front of every probe engine, so raising concurrency can
+no longer trip ICMP rate limits on routers.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from .resolver import is_ipv4_literal
+
+
+class TokenBucket:
+    """Thread-safe token bucket handing out reservations
+
+    Callers reserve a token and get back how long to wait before using it,
+    so concurrent probes queue up fairly without polling.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """rate is tokens per second; burst defaults to a tenth of a second's worth"""
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate / 10)
+        self._lock = threading.Lock()
+        self._next_at = time.monotonic()  # Theoretical send time of the next token
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens and return the seconds to wait before they may be used"""
+        with self._lock:
+            now = time.monotonic()
+            next_at = max(self._next_at, now)
+            # Up to `burst` tokens may be used ahead of the steady schedule
+            wait = next_at - (self.burst - 1) / self.rate - now
+            self._next_at = next_at + tokens / self.rate
+            return max(0.0, wait)
+
+
+class ProbeRateLimiter:
+    """Global probes-per-second cap plus an optional per-/24 cap"""
+
+    def __init__(self, global_pps: float = 0, subnet_pps: float = 0):
+        """A rate of 0 means unlimited"""
+        self._lock = threading.Lock()
+        self._subnets: Dict[str, TokenBucket] = {}
+        self.configure(global_pps, subnet_pps)
+        self.granted = 0
+        self._sample_granted = 0
+        self._sample_time = time.monotonic()
+        self._rate = 0.0
+
+    def configure(self, global_pps: float = 0, subnet_pps: float = 0):
+        """Change the caps; per-/24 buckets start fresh"""
+        with self._lock:
+            self.global_pps = global_pps
+            self.subnet_pps = subnet_pps
+            self._global = TokenBucket(global_pps) if global_pps > 0 else None
+            self._subnets = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._global is not None or self.subnet_pps > 0
+
+    def _subnet_bucket(self, address: str) -> TokenBucket:
+        """Bucket shared by every address in the same /24
+
+        Anything but an IPv4 address (a hostname its caller did not resolve)
+        shares one bucket, as its subnet is unknown.
+        """
+        subnet = address.rsplit('.', 1)[0] if is_ipv4_literal(address) else ''
+        with self._lock:
+            bucket = self._subnets.get(subnet)
+            if bucket is None:
+                bucket = self._subnets[subnet] = TokenBucket(self.subnet_pps)
+            return bucket
+
+    def reserve(self, address: str, probes: int = 1) -> float:
+        """Reserve probes to address and return the seconds to wait before sending"""
+        with self._lock:
+            self.granted += probes
+        if not self.enabled:
+            return 0.0
+        wait = self._global.reserve(probes) if self._global is not None else 0.0
+        if self.subnet_pps > 0:
+            wait = max(wait, self._subnet_bucket(address).reserve(probes))
+        return wait
+
+    def acquire(self, address: str, probes: int = 1):
+        """Block until probes to address may be sent"""
+        wait = self.reserve(address, probes)
+        if wait > 0:
+            time.sleep(wait)
+
+    def current_rate(self) -> float:
+        """Probes per second granted since the previous sample (sampled at most twice a second)"""
+        now = time.monotonic()
+        elapsed = now - self._sample_time
+        if elapsed >= 0.5:
+            self._rate = (self.granted - self._sample_granted) / elapsed
+            self._sample_granted = self.granted
+            self._sample_time = now
+        return self._rate
+
+    def pacing(self) -> str:
+        """Live pacing text for status displays"""
+        caps = []
+        if self.global_pps > 0:
+            caps.append(f"cap {self.global_pps:g}")
+        if self.subnet_pps > 0:
+            caps.append(f"{self.subnet_pps:g}/24")
+        limits = f" ({', '.join(caps)})" if caps else ""
+        return f"{self.current_rate():.0f} probes/s{limits}"
+
+
+shared_limiter = ProbeRateLimiter()
+
+
+def configure_rate_limit(global_pps: float = 0, subnet_pps: float = 0):
+    """Set the caps of the limiter every probe engine shares"""
+    shared_limiter.configure(global_pps, subnet_pps)
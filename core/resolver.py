@@ -0,0 +1,196 @@
+"""
+Hostname resolver cache for Network Engineer Multitool
+
+Inventory hostnames are resolved once, in parallel, before the first round
+and cached, so every probe goes straight to an address instead of each
+``ping`` process asking DNS again every round. Entries expire after a TTL
+and are refreshed in the background ahead of expiry. A hostname whose
+address changed is reported, so displays can flag it.
+
+The system resolver does not expose record TTLs, so the cache uses a
+configured TTL for answers and a shorter one for failures.
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+def is_ipv4_literal(host: str) -> bool:
+    """Check whether a target is already a dotted-quad address"""
+    try:
+        socket.inet_pton(socket.AF_INET, host)
+        return True
+    except (OSError, TypeError):
+        return False
+
+
+class _Entry:
+    """Cached answer for one hostname"""
+
+    __slots__ = ('address', 'error', 'expires', 'previous')
+
+    def __init__(self, address: Optional[str], error: Optional[str], expires: float):
+        self.address = address
+        self.error = error
+        self.expires = expires
+        self.previous: Optional[str] = None  # Address before the last change
+
+
+class ResolverCache:
+    """Thread-safe hostname to IPv4 address cache with TTL expiry and background refresh"""
+
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 30.0, max_workers: int = 32,
+                 lookup: Callable[[str], str] = socket.gethostbyname):
+        """ttl and negative_ttl are in seconds
+
+        Failed lookups are cached for negative_ttl so a dead name does not stall
+        every round. lookup resolves one hostname and raises OSError on failure.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self.lookup = lookup
+        self.on_change: Optional[Callable[[str, str, str], None]] = None  # (host, old, new)
+        self.lookups = 0  # Lookups sent to the system resolver
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._pending = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def configure(self, ttl: float, negative_ttl: Optional[float] = None):
+        """Change the TTLs; entries already cached keep their expiry"""
+        self.ttl = ttl
+        if negative_ttl is not None:
+            self.negative_ttl = negative_ttl
+
+    def _refresh(self, host: str) -> _Entry:
+        """Look a hostname up now and store the answer"""
+        self.lookups += 1
+        try:
+            entry = _Entry(self.lookup(host), None, time.monotonic() + self.ttl)
+        except OSError as e:
+            entry = _Entry(None, str(e), time.monotonic() + self.negative_ttl)
+
+        changed = None
+        with self._lock:
+            old = self._entries.get(host)
+            if old is not None and old.address is not None:
+                if entry.address is None:
+                    # Keep serving the last good address while DNS is failing
+                    entry.address, entry.error = old.address, None
+                elif entry.address != old.address:
+                    entry.previous = old.address
+                    changed = old.address
+                else:
+                    entry.previous = old.previous
+            self._entries[host] = entry
+            self._pending.discard(host)
+
+        if changed is not None and self.on_change is not None:
+            self.on_change(host, changed, entry.address)
+        return entry
+
+    def _refresh_later(self, host: str):
+        """Queue a background lookup unless one is already queued"""
+        with self._lock:
+            if host in self._pending:
+                return
+            self._pending.add(host)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="resolver")
+            executor = self._executor
+        executor.submit(self._refresh, host)
+
+    def resolve(self, host: str) -> str:
+        """IPv4 address of a target, from the cache when possible
+
+        An expired address is still returned while a background lookup renews
+        it. Raises socket.gaierror for names that do not resolve.
+        """
+        host = str(host).strip()
+        if is_ipv4_literal(host):
+            return host
+        entry = self._entries.get(host)
+        if entry is None or (entry.address is None and entry.expires <= time.monotonic()):
+            entry = self._refresh(host)
+        elif entry.expires <= time.monotonic():
+            self._refresh_later(host)
+        if entry.address is None:
+            raise socket.gaierror(entry.error)
+        return entry.address
+
+    def address(self, host: str) -> str:
+        """Address to hand to the system ping: the cached address, or the name itself when it does not resolve"""
+        try:
+            return self.resolve(host)
+        except OSError:
+            return str(host).strip()  # Let ping report the failure in its own words
+
+    def resolve_all(self, hosts: Iterable) -> Dict[str, Optional[str]]:
+        """Resolve every hostname in parallel; returns each host's address or None"""
+        names = []
+        seen = set()
+        for host in hosts:
+            host = str(host).strip()
+            if host and host not in seen and not is_ipv4_literal(host):
+                seen.add(host)
+                names.append(host)
+        if not names:
+            return {}
+        with ThreadPoolExecutor(min(self.max_workers, len(names)), thread_name_prefix="resolver") as executor:
+            entries = list(executor.map(self._refresh, names))
+        return {host: entry.address for host, entry in zip(names, entries)}
+
+    def refresh_expiring(self, within: float = 0.0):
+        """Queue background lookups for entries that expire within the given seconds"""
+        deadline = time.monotonic() + within
+        with self._lock:
+            hosts = [host for host, entry in self._entries.items() if entry.expires <= deadline]
+        for host in hosts:
+            self._refresh_later(host)
+
+    def start(self, interval: Optional[float] = None):
+        """Refresh entries ahead of expiry from a background thread until stop()"""
+        if self._refresher is not None and self._refresher.is_alive() and not self._stop.is_set():
+            return
+        interval = interval if interval is not None else max(1.0, min(self.ttl, self.negative_ttl) / 4)
+        self._stop = stop = threading.Event()  # A refresher still winding down keeps its own stopped event
+
+        def refresh_loop():
+            while not stop.wait(interval):
+                self.refresh_expiring(interval)
+
+        self._refresher = threading.Thread(target=refresh_loop, daemon=True)
+        self._refresher.start()
+
+    def stop(self):
+        """Stop the background refresh"""
+        self._stop.set()
+
+    def changed(self, host: str) -> Optional[Tuple[str, str]]:
+        """(previous, current) address of a hostname whose address changed, or None"""
+        entry = self._entries.get(str(host).strip())
+        if entry is None or entry.previous is None:
+            return None
+        return entry.previous, entry.address
+
+    def clear(self):
+        """Forget every cached answer"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+shared_resolver = ResolverCache()
+
+
+def configure_resolver(ttl: float = 300.0, negative_ttl: float = 30.0):
+    """Set the TTLs of the cache every probe engine shares"""
+    shared_resolver.configure(ttl, negative_ttl)
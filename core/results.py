@@ -0,0 +1,198 @@
+"""
+Results store for Network Engineer Multitool
+
+A Treeview item per IP costs several Tcl objects per row, and past about
+20k rows loading and scrolling stall. The results live here instead, one
+compact column per field indexed by row number: status codes, float32
+response times and float64 check times in arrays, with text kept only for
+rows whose response is not a plain time. The table materializes just the
+rows on screen from this store. Each row also keeps a fixed-size history
+of its recent samples (see core.history) for the trend, loss and jitter
+columns.
+
+The store is the results model: probe threads write results straight into
+it under its lock, and the GUI redraws the rows it reports as changed. No
+Tk call is on the probe path, and the store works without a GUI.
+"""
+
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .history import HISTORY_SAMPLES, RttHistory
+from .topology import UPSTREAM_STATUS
+
+NOT_TESTED, ONLINE, OFFLINE, UPSTREAM = range(4)
+
+STATUS_TEXT = ("Not tested", "Online", "Offline", UPSTREAM_STATUS)
+STATUS_CODES = {text: code for code, text in enumerate(STATUS_TEXT)}
+
+# Treeview tag per status code
+STATUS_TAGS = ("", "online", "offline", "upstream")
+
+COLUMNS = ("IP", "Description", "Status", "Response Time", "Last Checked", "Trend", "Loss %", "Jitter")
+
+_NO_TIME = math.nan
+
+
+def parse_response_time(text: str) -> Tuple[float, Optional[str]]:
+    """Split a displayed response time into (ms, None), or (NaN, text) when it is not a plain time"""
+    if text == "< 1":
+        return 0.0, None
+    try:
+        return float(text), None
+    except (TypeError, ValueError):
+        return _NO_TIME, text  # "Timeout", "Error: ...", "12.3 (2/4)", "-"
+
+
+def format_checked(checked: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(checked)) if checked else "-"
+
+
+class ResultStore:
+    """Thread-safe, column-oriented results of every target, addressed by row index"""
+
+    def __init__(self, history_samples: int = HISTORY_SAMPLES):
+        self.lock = threading.RLock()
+        self.ips: List[str] = []
+        self.index: Dict[str, int] = {}  # IP -> row (its first row if listed twice)
+        self.descriptions: List[str] = []
+        self.status = array('B')
+        self.rtt = array('f')  # ms; NaN when the response is text or there is none
+        self.checked = array('d')  # time.time() of the last result; 0 = never
+        self.notes: Dict[int, str] = {}  # Response text of rows without a plain time
+        self.history = RttHistory(history_samples)  # Last samples of each row
+        self._changed: Set[int] = set()  # Rows updated since the last take_changes()
+
+    def load(self, ips: Iterable, descriptions: Sequence = ()):
+        """Replace the contents with fresh, untested targets"""
+        ips = [str(ip).strip() for ip in ips]
+        count = len(ips)
+        with self.lock:
+            self.ips = ips
+            self.index = {}
+            for row, ip in enumerate(ips):
+                self.index.setdefault(ip, row)
+            self.descriptions = [str(descriptions[i]) if i < len(descriptions) else "-" for i in range(count)]
+            self.status = array('B', bytes(count))
+            self.rtt = array('f', [_NO_TIME]) * count
+            self.checked = array('d', [0.0]) * count
+            self.notes = {}
+            self.history.reset(count)
+            self._changed = set()
+
+    def append(self, ip: str, description: str = "-") -> int:
+        """Add one untested target and return its row index"""
+        ip = str(ip).strip()
+        with self.lock:
+            self.ips.append(ip)
+            self.descriptions.append(str(description))
+            self.status.append(NOT_TESTED)
+            self.rtt.append(_NO_TIME)
+            self.checked.append(0.0)
+            self.history.append()
+            row = len(self.ips) - 1
+            self.index.setdefault(ip, row)
+            return row
+
+    def find(self, ip: str) -> Optional[int]:
+        """Row of an IP, or None"""
+        return self.index.get(ip)
+
+    def add(self, ip: str, description: str = "-") -> int:
+        """Row of an IP, appending it first if it has none"""
+        with self.lock:
+            row = self.index.get(ip)
+            return row if row is not None else self.append(ip, description)
+
+    def targets(self) -> List[Tuple[str, int]]:
+        """(ip, row) of every row, for handing to the probe engines"""
+        with self.lock:
+            return list(zip(self.ips, range(len(self.ips))))
+
+    def update(self, index: int, status: str, response_time: str, checked: float, sample: bool = True):
+        """Record a result shown as (status, response time text) at time checked; any thread
+
+        A finished result also adds a sample to the row's history: its time
+        when online, a loss when offline. Previews pass sample=False.
+        """
+        code = STATUS_CODES.get(status, OFFLINE)
+        rtt, note = parse_response_time(response_time)
+        with self.lock:
+            if index >= len(self.ips):
+                return  # Row cleared while its probe was in flight
+            self.status[index] = code
+            self.rtt[index] = rtt
+            if note is not None:
+                self.notes[index] = note
+            else:
+                self.notes.pop(index, None)
+            self.checked[index] = checked
+            if sample and code == ONLINE and rtt == rtt:
+                self.history.record(index, rtt)
+            elif sample and code == OFFLINE:
+                self.history.record(index, None)
+            self._changed.add(index)
+
+    def take_changes(self) -> Set[int]:
+        """Rows updated since the last call"""
+        with self.lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def response_text(self, index: int) -> str:
+        note = self.notes.get(index)
+        if note is not None:
+            return note
+        rtt = self.rtt[index]
+        if rtt != rtt:
+            return "-"
+        return "< 1" if rtt < 1 else f"{rtt:.1f}"
+
+    def row(self, index: int, status_suffix: Callable[[str], Optional[str]] = None) -> Tuple[str, ...]:
+        """Display values of one row; status_suffix(ip) may add text to the status"""
+        with self.lock:
+            ip = self.ips[index]
+            code = self.status[index]
+            loss, jitter = self.history.loss(index), self.history.jitter(index)
+            values = [ip, self.descriptions[index], STATUS_TEXT[code], self.response_text(index),
+                      format_checked(self.checked[index]), self.history.sparkline(index),
+                      f"{loss:.0f}" if loss is not None else "-", f"{jitter:.1f}" if jitter is not None else "-"]
+        suffix = status_suffix(ip) if status_suffix is not None and code else None
+        if suffix:
+            values[2] = f"{values[2]} {suffix}"
+        return tuple(values)
+
+    def tag(self, index: int) -> str:
+        return STATUS_TAGS[self.status[index]]
+
+    def sort_key(self, column: str, reverse: bool = False) -> Callable[[int], object]:
+        """Key over row indexes for a column; rows without a time sort last either way"""
+        if column == "IP":
+            return self.ips.__getitem__
+        if column == "Description":
+            return self.descriptions.__getitem__
+        if column == "Status":
+            return lambda index: STATUS_TEXT[self.status[index]]
+        if column == "Response Time":
+            missing = -1.0 if reverse else math.inf
+            return lambda index: missing if self.rtt[index] != self.rtt[index] else self.rtt[index]
+        if column == "Last Checked":
+            return self.checked.__getitem__
+        if column in ("Trend", "Loss %", "Jitter"):
+            value = {"Trend": self.history.mean, "Loss %": self.history.loss, "Jitter": self.history.jitter}[column]
+            missing = -1.0 if reverse else math.inf
+
+            def key(index):
+                found = value(index)
+                return missing if found is None else found
+            return key
+        raise ValueError(f"Unknown column: {column}")
+
+    def clear(self):
+        self.load([])
+
+    def __len__(self) -> int:
+        return len(self.ips)
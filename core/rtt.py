@@ -0,0 +1,96 @@
+"""
+Adaptive per-host timeouts for Network Engineer Multitool
+
+Each host gets its own probe timeout from a smoothed RTT and RTT variance,
+computed the way TCP computes its retransmission timeout (RFC 6298), and
+clamped between a floor and a ceiling. Slow links stop flapping to
+Timeout, and hosts that are down fail fast at the initial timeout instead
+of holding a worker for the ceiling.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional
+
+# RFC 6298 gains
+ALPHA = 1 / 8
+BETA = 1 / 4
+K = 4
+
+
+class RttEstimate:
+    """Smoothed RTT state of one host, in seconds"""
+
+    __slots__ = ('srtt', 'rttvar', 'rto', 'losses')
+
+    def __init__(self, rto: float):
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.rto = rto
+        self.losses = 0  # Consecutive lost probes
+
+
+class AdaptiveTimeouts:
+    """Per-host timeouts from smoothed RTT and RTT variance, with a floor and ceiling"""
+
+    def __init__(self, initial: float, floor: float = 0.02, ceiling: float = 3.0, dead_after: int = 3):
+        """All times are in seconds
+
+        initial is the timeout of hosts with no estimate yet and of hosts that
+        are down. A host that has lost dead_after probes in a row counts as
+        down until it replies again. The ceiling is raised to initial when
+        lower, so turning adaptive timeouts on never shortens the configured
+        timeout.
+        """
+        self.floor = floor
+        self.ceiling = max(ceiling, floor, initial)
+        self.initial = self._clamp(initial)
+        self.dead_after = dead_after
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, RttEstimate] = {}
+
+    def _clamp(self, value: float) -> float:
+        return min(self.ceiling, max(self.floor, value))
+
+    def timeout(self, host: str) -> float:
+        """Timeout in seconds for the next probe to host"""
+        estimate = self._hosts.get(host)
+        if estimate is None or estimate.losses >= self.dead_after:
+            return self.initial
+        return estimate.rto
+
+    def observe(self, host: str, rtt: Optional[float]):
+        """Update host's estimate with one probe result: RTT in ms, or None when lost"""
+        with self._lock:
+            estimate = self._hosts.get(host)
+            if estimate is None:
+                estimate = self._hosts[host] = RttEstimate(self.initial)
+
+            if rtt is None:
+                # Back off like a TCP retransmission so a slow link gets a longer wait
+                estimate.losses += 1
+                estimate.rto = self._clamp(estimate.rto * 2)
+                return
+
+            sample = rtt / 1000
+            if estimate.srtt is None or estimate.losses >= self.dead_after:
+                # First sample, or back from being down: start a fresh estimate
+                estimate.srtt = sample
+                estimate.rttvar = sample / 2
+            else:
+                estimate.rttvar = (1 - BETA) * estimate.rttvar + BETA * abs(estimate.srtt - sample)
+                estimate.srtt = (1 - ALPHA) * estimate.srtt + ALPHA * sample
+            estimate.losses = 0
+            estimate.rto = self._clamp(estimate.srtt + K * estimate.rttvar)
+
+    def observe_all(self, host: str, rtts: Iterable[Optional[float]]):
+        """Update host's estimate with several probe results in order"""
+        for rtt in rtts:
+            self.observe(host, rtt)
+
+    def srtt(self, host: str) -> Optional[float]:
+        """Smoothed RTT of host in ms, or None before its first reply"""
+        estimate = self._hosts.get(host)
+        return estimate.srtt * 1000 if estimate is not None and estimate.srtt is not None else None
+
+    def __len__(self) -> int:
+        return len(self._hosts)
@@ -0,0 +1,213 @@
+"""
+Probe scheduler for Network Engineer Multitool
+
+Instead of firing every host at once and then sleeping, each host gets its
+own phase offset inside the interval and is fired on monotonic-clock
+deadlines kept in a hashed timing wheel. Scheduling is O(1), the probe rate
+stays flat at hosts / interval, and deadlines advance by exactly one
+interval so rounds never drift.
+"""
+
+import math
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class TimingWheel:
+    """Hashed timing wheel: O(1) insert, expiry cost proportional to due entries"""
+
+    def __init__(self, tick: float = 0.01, slots: int = 256, start: Optional[float] = None):
+        """tick is the wheel resolution in seconds; start defaults to time.monotonic()"""
+        self.tick = tick
+        self.slots: List[List[Tuple[int, float, object]]] = [[] for _ in range(slots)]
+        self.current = self._tick(time.monotonic() if start is None else start)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _tick(self, moment: float) -> int:
+        """Slot number of a monotonic time, tolerant of float rounding at slot edges"""
+        return int(moment / self.tick + 1e-6)
+
+    def schedule(self, deadline: float, item: object):
+        """Add an item due at a monotonic deadline; past deadlines fire on the next pop"""
+        tick = max(self._tick(deadline), self.current)
+        self.slots[tick % len(self.slots)].append((tick, deadline, item))
+        self._size += 1
+
+    def pop_due(self, now: float) -> List[Tuple[float, object]]:
+        """Remove and return (deadline, item) for everything due at or before now"""
+        target = self._tick(now)
+        if target < self.current:
+            return []
+
+        due = []
+        # Behind by more than a full turn: every slot is visited exactly once
+        ticks = range(self.current, target + 1) if target - self.current < len(self.slots) \
+            else range(target - len(self.slots) + 1, target + 1)
+        for tick in ticks:
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                if entry[0] <= target:
+                    due.append((entry[1], entry[2]))
+                else:
+                    keep.append(entry)  # Due on a later turn of the wheel
+            self.slots[tick % len(self.slots)] = keep
+        self.current = target + 1
+        self._size -= len(due)
+        return due
+
+    def next_tick(self) -> float:
+        """Monotonic time of the next slot to expire"""
+        return self.current * self.tick
+
+
+class ProbeScheduler:
+    """Fire every host once per interval, each at its own phase offset"""
+
+    def __init__(self, interval: float, tick: float = 0.01, start: Optional[float] = None):
+        """interval is the per-host probe period in seconds"""
+        self.interval = interval
+        self.start = time.monotonic() if start is None else start
+        # Size the wheel so one turn covers the interval and entries rarely wrap
+        slots = 1 << max(6, math.ceil(math.log2(interval / tick + 1)))
+        self.wheel = TimingWheel(tick, slots, self.start)
+        self.deadlines: Dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def add(self, key: Hashable, phase: float = 0.0):
+        """Schedule a host phase seconds after the scheduler start"""
+        deadline = self.start + phase
+        self.deadlines[key] = deadline
+        self.wheel.schedule(deadline, key)
+
+    def spread(self, keys: Iterable[Hashable]):
+        """Schedule hosts with phases evenly spaced across one interval"""
+        keys = list(keys)
+        step = self.interval / len(keys) if keys else 0
+        for index, key in enumerate(keys):
+            self.add(key, index * step)
+
+    def remove(self, key: Hashable):
+        """Stop probing a host; its wheel entry is dropped lazily"""
+        self.deadlines.pop(key, None)
+
+    def next_deadline(self, key: Hashable, deadline: float, now: float) -> float:
+        """Deadline one interval on, skipping periods missed while stalled"""
+        deadline += self.interval
+        if deadline <= now:
+            deadline += self.interval * math.ceil((now - deadline) / self.interval)
+        return deadline
+
+    def pop_due(self, now: Optional[float] = None) -> List[Hashable]:
+        """Return the hosts due now and reschedule each for its next period"""
+        now = time.monotonic() if now is None else now
+        due = []
+        for deadline, key in self.wheel.pop_due(now):
+            if self.deadlines.get(key) != deadline:
+                continue  # Removed or rescheduled since this entry was added
+            due.append(key)
+            following = self.next_deadline(key, deadline, now)
+            self.deadlines[key] = following
+            self.wheel.schedule(following, key)
+        return due
+
+    def time_until_next(self, now: Optional[float] = None) -> float:
+        """Seconds until the next wheel slot expires"""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.wheel.next_tick() - now)
+
+    @property
+    def rate(self) -> float:
+        """Steady-state probes per second"""
+        return len(self.deadlines) / self.interval if self.interval else 0.0
+
+
+class _PollState:
+    """Polling state of one host"""
+
+    __slots__ = ('interval', 'online', 'last_rtt')
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.online: Optional[bool] = None
+        self.last_rtt: Optional[float] = None
+
+
+class AdaptivePollScheduler(ProbeScheduler):
+    """Poll stable hosts less often and unstable hosts at the base interval
+
+    Every host starts at the base interval. Each steady result stretches its
+    interval by backoff, up to max_interval, which is the coverage guarantee:
+    every host is probed at least once per max_interval. Going down, coming
+    back up or an RTT jump resets the host to the base interval at once; a
+    host that stays down is steady too, so dead hosts back off as well.
+    """
+
+    def __init__(self, interval: float, max_interval: float, backoff: float = 1.5,
+                 jitter_ms: float = 20.0, tick: float = 0.01, start: Optional[float] = None):
+        """interval and max_interval are in seconds; jitter_ms is the RTT jump treated as unstable"""
+        super().__init__(interval, tick, start)
+        self.max_interval = max(interval, max_interval)
+        self.backoff = backoff
+        self.jitter_ms = jitter_ms
+        self.states: Dict[Hashable, _PollState] = {}
+
+    def add(self, key: Hashable, phase: float = 0.0):
+        self.states[key] = _PollState(self.interval)
+        super().add(key, phase)
+
+    def remove(self, key: Hashable):
+        self.states.pop(key, None)
+        super().remove(key)
+
+    def next_deadline(self, key: Hashable, deadline: float, now: float) -> float:
+        """Deadline one host interval on, skipping periods missed while stalled"""
+        state = self.states.get(key)
+        interval = state.interval if state is not None else self.interval
+        deadline += interval
+        if deadline <= now:
+            deadline += interval * math.ceil((now - deadline) / interval)
+        return deadline
+
+    def record(self, key: Hashable, online: bool, rtt: Optional[float] = None, now: Optional[float] = None):
+        """Adjust a host's interval from one probe result (rtt in ms)"""
+        state = self.states.get(key)
+        if state is None:
+            return
+        if state.online is None:
+            unstable = not online  # Down from the first probe: recheck soon before backing off
+        else:
+            unstable = online != state.online
+        unstable = unstable or (rtt is not None and state.last_rtt is not None
+                                and abs(rtt - state.last_rtt) > self.jitter_ms)
+        state.online = online
+        state.last_rtt = rtt if online else None
+
+        if not unstable:
+            state.interval = min(self.max_interval, state.interval * self.backoff)
+            return
+
+        state.interval = self.interval
+        # Pull the next probe in if it was scheduled for a long steady interval
+        now = time.monotonic() if now is None else now
+        soonest = now + self.interval
+        if self.deadlines.get(key, soonest) > soonest:
+            self.deadlines[key] = soonest
+            self.wheel.schedule(soonest, key)
+
+    @property
+    def rate(self) -> float:
+        """Current probes per second across all hosts"""
+        return sum(1 / state.interval for state in self.states.values())
+
+    @property
+    def fixed_rate(self) -> float:
+        """Probes per second the same hosts would cost at the base interval"""
+        return super().rate
@@ -0,0 +1,278 @@
+"""
+Multi-process sharded sweep engine for Network Engineer Multitool
+
+One Python process runs out of CPU on result handling long before the
+network is saturated. The sharded engine splits the targets across worker
+processes, each running its own probe engine, and streams compact binary
+result records back over a pipe to the process that owns the GUI and the
+database. Targets are sharded by /24, so per-subnet rate caps still hold
+inside each worker, and a host stays on the same worker for the whole
+session, keeping its adaptive timeout state.
+"""
+
+import math
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from array import array
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .async_sweep import ResultCallback
+from .probes import create_prober
+from .rate_limit import ProbeRateLimiter, shared_limiter
+from .resolver import is_ipv4_literal
+from .rtt import AdaptiveTimeouts
+
+# Message kinds on a worker pipe
+_RECORDS = b'R'
+_ERROR = b'E'
+_DONE = b'D'
+
+# Result record: target index, number of RTTs, then one float32 per RTT (NaN = lost)
+_RECORD = struct.Struct('<IH')
+
+# Records are flushed when this many bytes are pending, or every FLUSH_INTERVAL seconds
+_FLUSH_BYTES = 32768
+FLUSH_INTERVAL = 0.05
+
+
+def encode_record(index: int, rtts: List[Optional[float]]) -> bytes:
+    """Pack one result as a compact record"""
+    values = array('f', [math.nan if rtt is None else rtt for rtt in rtts])
+    return _RECORD.pack(index, len(values)) + values.tobytes()
+
+
+def decode_records(data: bytes, offset: int = 0) -> Iterator[Tuple[int, List[Optional[float]]]]:
+    """Unpack (index, rtts) from a run of records"""
+    end = len(data)
+    while offset < end:
+        index, count = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        values = array('f')
+        values.frombytes(data[offset:offset + 4 * count])
+        offset += 4 * count
+        yield index, [None if value != value else value for value in values]
+
+
+class _RecordBatch:
+    """Worker-side buffer that sends result records in batches"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.pending = bytearray(_RECORDS)
+        self.lock = threading.Lock()
+
+    def add(self, index, host, rtts, error):
+        """ResultCallback for the worker's engine"""
+        with self.lock:
+            if error:
+                self._flush()
+                self.conn.send_bytes(_ERROR + f"{index}\t{error}".encode('utf-8', 'replace'))
+                return
+            self.pending += encode_record(index, rtts)
+            if len(self.pending) >= _FLUSH_BYTES:
+                self._flush()
+
+    def _flush(self):
+        if len(self.pending) > 1:
+            self.conn.send_bytes(bytes(self.pending))
+            del self.pending[1:]
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+
+def engine_options(shards: int = 1, probe: str = "ICMP", port: Optional[int] = None,
+                   ports: Optional[Dict[str, int]] = None, timeout: float = 1.0, count: int = 1,
+                   max_in_flight: int = 5000, limiter: Optional[ProbeRateLimiter] = None,
+                   timeouts: Optional[AdaptiveTimeouts] = None, first_reply: bool = False) -> Dict:
+    """Plain-data engine settings for one of shards workers (picklable and JSON-safe)
+
+    max_in_flight and the global rate cap are split evenly across the shards.
+    A worker's adaptive timeouts are its own, seeded with the bounds of timeouts.
+    """
+    limiter = limiter if limiter is not None else shared_limiter
+    return {
+        'probe': probe,
+        'port': port,
+        'ports': dict(ports or {}),
+        'timeout': timeout,
+        'count': count,
+        'max_in_flight': max(1, max_in_flight // shards),
+        'global_pps': limiter.global_pps / shards,
+        'subnet_pps': limiter.subnet_pps,
+        'timeouts': [timeouts.initial, timeouts.floor, timeouts.ceiling, timeouts.dead_after]
+                    if timeouts is not None else None,
+        'first_reply': first_reply,
+    }
+
+
+def create_engine(options: Dict):
+    """Build a worker's probe engine, rate limiter and adaptive timeouts from engine_options
+
+    Raises OSError when the probe type is not permitted here (ICMP without privileges).
+    """
+    limiter = ProbeRateLimiter()
+    limiter.configure(options['global_pps'], options['subnet_pps'])
+    timeouts = AdaptiveTimeouts(*options['timeouts']) if options['timeouts'] else None
+    return create_prober(options['probe'], options['port'], options['ports'],
+                         timeout=options['timeout'], count=options['count'],
+                         max_in_flight=options['max_in_flight'], limiter=limiter,
+                         timeouts=timeouts, first_reply=options['first_reply'])
+
+
+class SubnetShards:
+    """Assigns hosts to shards a whole /24 at a time, pinned for the session"""
+
+    def __init__(self, shards: int):
+        self.shards = shards
+        self._groups: Dict[str, int] = {}  # /24 (or hostname) -> shard
+        self.loads = [0] * shards
+
+    def split(self, targets: List[Tuple[object, str]]) -> List[List[Tuple[int, str]]]:
+        """Split (key, host) targets into one (index, host) job per shard"""
+        self.loads = [0] * self.shards
+        jobs: List[List[Tuple[int, str]]] = [[] for _ in range(self.shards)]
+        for index, (key, host) in enumerate(targets):
+            host = str(host).strip()
+            jobs[self.shard_of(host)].append((index, host))
+        return jobs
+
+    def shard_of(self, host: str) -> int:
+        """Shard of a host: its whole /24 goes to the least loaded shard when first seen"""
+        group = host.rsplit('.', 1)[0] if is_ipv4_literal(host) else host
+        shard = self._groups.get(group)
+        if shard is None:
+            shard = self._groups[group] = self.loads.index(min(self.loads))
+        self.loads[shard] += 1
+        return shard
+
+
+def _shard_worker(conn, stop, options: Dict):
+    """Worker process: run every job it is sent through its own engine"""
+    try:
+        engine, engine_error = create_engine(options), None
+    except OSError as e:
+        engine, engine_error = None, str(e)
+
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break  # The coordinating process went away
+            if job is None:
+                break
+            batch = _RecordBatch(conn)
+            if engine is None:
+                for index, _ in job:
+                    batch.add(index, None, [], engine_error)
+            else:
+                # Bound how long a finished result waits in the buffer
+                running = threading.Event()
+                flusher = threading.Thread(target=_flush_loop, args=(batch, running), daemon=True)
+                flusher.start()
+                try:
+                    engine.run(job, batch.add, stop.is_set)
+                finally:
+                    running.set()
+                    flusher.join()
+            batch.flush()
+            conn.send_bytes(_DONE)
+    finally:
+        if engine is not None:
+            engine.close()
+        conn.close()
+
+
+def _flush_loop(batch: _RecordBatch, done: threading.Event):
+    while not done.wait(FLUSH_INTERVAL):
+        batch.flush()
+
+
+class ShardedSweeper:
+    """Round engine that shards targets across worker processes, each with its own probe engine"""
+
+    def __init__(self, processes: Optional[int] = None, probe: str = "ICMP", port: Optional[int] = None,
+                 ports: Optional[Dict[str, int]] = None, timeout: float = 1.0, count: int = 1,
+                 max_in_flight: int = 5000, limiter: Optional[ProbeRateLimiter] = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None, first_reply: bool = False):
+        """processes defaults to the CPU count; the other options are those of engine_options"""
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.options = engine_options(self.processes, probe, port, ports, timeout, count, max_in_flight,
+                                      limiter, timeouts, first_reply)
+        self._context = multiprocessing.get_context()
+        self._stop = self._context.Event()
+        self._workers: List[multiprocessing.Process] = []
+        self._conns = []
+        self.shards = SubnetShards(self.processes)
+
+    def _start(self):
+        """Start the worker processes on first use; they live until close()"""
+        if self._workers:
+            return
+        for _ in range(self.processes):
+            parent_conn, child_conn = self._context.Pipe()
+            worker = self._context.Process(target=_shard_worker, args=(child_conn, self._stop, self.options),
+                                           daemon=True)
+            worker.start()
+            child_conn.close()
+            self._workers.append(worker)
+            self._conns.append(parent_conn)
+
+    def run(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+            should_stop: Optional[Callable[[], bool]] = None):
+        """Probe every (key, host) target across the workers, calling on_result as records arrive"""
+        self._start()
+        targets = list(targets)
+        jobs = self.shards.split(targets)
+
+        self._stop.clear()
+        busy = []
+        for conn, job in zip(self._conns, jobs):
+            if job:
+                conn.send(job)
+                busy.append(conn)
+
+        while busy:
+            if should_stop is not None and should_stop():
+                self._stop.set()  # Workers stop starting probes and report done
+            for conn in wait(busy, 0.2):
+                try:
+                    data = conn.recv_bytes()
+                except EOFError:
+                    busy.remove(conn)  # Worker died; its unfinished targets get no result
+                    continue
+                kind = data[:1]
+                if kind == _RECORDS:
+                    for index, rtts in decode_records(data, 1):
+                        key, host = targets[index]
+                        on_result(key, host, rtts, None)
+                elif kind == _ERROR:
+                    index, error = data[1:].decode('utf-8', 'replace').split('\t', 1)
+                    key, host = targets[int(index)]
+                    on_result(key, host, [], error)
+                elif kind == _DONE:
+                    busy.remove(conn)
+
+    def close(self):
+        """Shut the worker processes down"""
+        self._stop.set()
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        deadline = time.monotonic() + 5
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                worker.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._workers = []
+        self._conns = []
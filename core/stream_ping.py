@@ -0,0 +1,269 @@
+"""
+Streaming ping engine for Network Engineer Multitool
+
+Keeps one long-lived system ``ping`` process per host for the whole session
+and parses its output incrementally, so infinite mode spawns N processes
+per session instead of N per round. Used where ICMP sockets are not
+permitted.
+"""
+
+import os
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .async_sweep import ResultCallback
+from .ping_parser import parse_reply_line
+from .rate_limit import ProbeRateLimiter, shared_limiter
+from .resolver import shared_resolver
+
+IS_WINDOWS = os.name == 'nt'
+
+# BSD-derived pings (macOS, FreeBSD) take -W in milliseconds, Linux pings in whole seconds
+W_IN_MS = sys.platform == 'darwin' or sys.platform.startswith('freebsd')
+
+# Longest output line kept; longer partial lines are dropped so memory stays flat
+MAX_LINE = 512
+
+# Shortest interval a non-root user may pass to Linux/macOS ping -i, in seconds
+MIN_INTERVAL = 0.2
+
+
+def bounded_lines(output, max_line: int = MAX_LINE) -> Iterator[bytes]:
+    """Lines of a binary pipe cut to max_line bytes; the rest of an overlong line is skipped, not split off"""
+    continuation = False
+    for line in iter(lambda: output.readline(max_line), b''):
+        if not continuation:
+            yield line
+        continuation = not line.endswith(b'\n')
+
+
+def iter_ping_output(command: List[str], encoding: str = 'cp866' if IS_WINDOWS else 'utf-8',
+                     max_line: int = MAX_LINE) -> Iterator[str]:
+    """Run a ping command and yield each output line as soon as it is printed
+
+    Closing the generator early (e.g. on the first reply) terminates the process.
+    """
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    )
+    try:
+        for line in bounded_lines(process.stdout, max_line):
+            yield line.decode(encoding, 'replace').rstrip('\r\n')
+    finally:
+        if process.poll() is None:
+            process.terminate()
+        process.wait()
+        process.stdout.close()
+
+
+def ping_command(host: str, count: int, timeout_ms: int) -> List[str]:
+    """Build a ping command that sends count echoes, waiting timeout_ms for each reply
+
+    Linux ping only takes whole seconds (busybox and older iputils reject
+    fractions), so the wait is rounded up there: sub-second adaptive
+    timeouts only take effect with ICMP sockets or on Windows and macOS.
+    """
+    if IS_WINDOWS:
+        return ['ping', '-n', str(count), '-w', str(timeout_ms), host]
+    if W_IN_MS:
+        return ['ping', '-n', '-c', str(count), '-W', str(max(1, timeout_ms)), host]
+    return ['ping', '-n', '-c', str(count), '-W', str(max(1, -(-timeout_ms // 1000))), host]
+
+
+def ping_interval(interval: float) -> float:
+    """Seconds between the echoes of a continuous ping asked for interval
+
+    Windows ping -t has no interval option and always sends once a second.
+    Elsewhere the interval is raised to MIN_INTERVAL, as ping refuses
+    anything shorter without root and would exit at once.
+    """
+    return 1.0 if IS_WINDOWS else max(MIN_INTERVAL, interval)
+
+
+def continuous_ping_command(host: str, interval: float, timeout_ms: int) -> List[str]:
+    """Build a ping command that runs until terminated, at ping_interval(interval)"""
+    if IS_WINDOWS:
+        return ['ping', '-t', '-w', str(timeout_ms), host]
+    return ['ping', '-n', '-i', str(ping_interval(interval)), host]
+
+
+class _Stream:
+    """One host's ping process and its partial output line"""
+
+    __slots__ = ('key', 'host', 'process', 'buffer', 'overlong', 'last_event', 'restart_at')
+
+    def __init__(self, key, host: str):
+        self.key = key
+        self.host = host
+        self.process = None
+        self.buffer = b''
+        self.overlong = False  # Inside a line longer than max_line, skipped up to its newline
+        self.last_event = 0.0
+        self.restart_at = 0.0
+
+
+class StreamingPinger:
+    """Publish every reply of long-lived ping processes as a streaming event"""
+
+    def __init__(self, interval: float = 1.0, timeout: float = 1.0,
+                 restart_delay: float = 30.0, max_line: int = MAX_LINE,
+                 limiter: Optional[ProbeRateLimiter] = None):
+        """interval is the ping period and timeout the reply wait, both in seconds
+
+        The period is the one ping can actually keep (see ping_interval). A
+        host with no output for that period + timeout is reported lost. Exited
+        processes are restarted after restart_delay seconds. The rate limiter
+        paces process starts; after that each process sends once per interval.
+        """
+        self.interval = ping_interval(interval)
+        self.timeout = timeout
+        self.restart_delay = restart_delay
+        self.max_line = max_line
+        self.limiter = limiter if limiter is not None else shared_limiter
+        self.encoding = 'cp866' if IS_WINDOWS else 'utf-8'
+        self.streams: List[_Stream] = []
+        # Pipes are not selectable on Windows, so reader threads feed a queue there
+        self._selector = None if IS_WINDOWS else selectors.DefaultSelector()
+        self._lines: "queue.Queue[Tuple[_Stream, Optional[bytes]]]" = queue.Queue()
+
+    def build_command(self, host: str) -> List[str]:
+        return continuous_ping_command(shared_resolver.address(host), self.interval, int(self.timeout * 1000))
+
+    def _spawn(self, stream: _Stream):
+        """Start the ping process for a stream"""
+        self.limiter.acquire(shared_resolver.address(stream.host))  # Cached: the /24 of the address, not the name
+        stream.process = subprocess.Popen(
+            self.build_command(stream.host),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        )
+        stream.buffer = b''
+        stream.overlong = False
+        stream.last_event = time.monotonic()
+        if self._selector is not None:
+            os.set_blocking(stream.process.stdout.fileno(), False)
+            self._selector.register(stream.process.stdout, selectors.EVENT_READ, stream)
+        else:
+            threading.Thread(target=self._read_lines, args=(stream, stream.process), daemon=True).start()
+
+    def _read_lines(self, stream: _Stream, process: subprocess.Popen):
+        """Windows reader thread: forward bounded lines until EOF"""
+        for line in bounded_lines(process.stdout, self.max_line):
+            self._lines.put((stream, line))
+        self._lines.put((stream, None))
+
+    def _feed(self, stream: _Stream, chunk: bytes, on_result: ResultCallback):
+        """Split a chunk of output into lines and handle each complete one"""
+        data = stream.buffer + chunk
+        if stream.overlong:
+            end = data.find(b'\n')
+            if end < 0:
+                return
+            data = data[end + 1:]  # The tail of an overlong line is not a line of its own
+            stream.overlong = False
+        *lines, rest = data.split(b'\n')
+        if len(rest) > self.max_line:
+            rest, stream.overlong = b'', True
+        stream.buffer = rest
+        for line in lines:
+            self._handle_line(stream, line[:self.max_line], on_result)
+
+    def _handle_line(self, stream: _Stream, line: bytes, on_result: ResultCallback):
+        """Turn one output line into a reply or loss event"""
+        is_event, rtt = parse_reply_line(line.decode(self.encoding, 'replace'))
+        if is_event:
+            stream.last_event = time.monotonic()
+            on_result(stream.key, stream.host, [rtt], None)
+
+    def _exited(self, stream: _Stream, on_result: ResultCallback):
+        """Report a ping process that ended and schedule its restart"""
+        if self._selector is not None:
+            self._selector.unregister(stream.process.stdout)
+        stream.process.stdout.close()
+        code = stream.process.wait()
+        stream.process = None
+        stream.restart_at = time.monotonic() + self.restart_delay
+        on_result(stream.key, stream.host, [], f"ping exited with code {code}")
+
+    def _poll(self, wait: float, on_result: ResultCallback):
+        """Read whatever output is ready, waiting at most wait seconds"""
+        if self._selector is not None:
+            for selector_key, _ in self._selector.select(wait):
+                stream = selector_key.data
+                try:
+                    chunk = os.read(selector_key.fd, 4096)
+                except BlockingIOError:
+                    continue
+                if chunk:
+                    self._feed(stream, chunk, on_result)
+                else:
+                    self._exited(stream, on_result)
+            return
+
+        try:
+            stream, line = self._lines.get(timeout=wait)
+            while True:
+                if stream.process is not None:
+                    if line is None:
+                        self._exited(stream, on_result)
+                    else:
+                        self._handle_line(stream, line.rstrip(b'\r\n'), on_result)
+                stream, line = self._lines.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _check_deadlines(self, on_result: ResultCallback):
+        """Report silent hosts as lost and restart exited processes"""
+        now = time.monotonic()
+        for stream in self.streams:
+            if stream.process is None:
+                if now >= stream.restart_at:
+                    try:
+                        self._spawn(stream)
+                    except OSError as e:
+                        stream.restart_at = now + self.restart_delay
+                        on_result(stream.key, stream.host, [], str(e))
+            elif now - stream.last_event > self.interval + self.timeout:
+                stream.last_event = now
+                on_result(stream.key, stream.host, [None], None)
+
+    def run(self, targets: Iterable[Tuple[object, str]], on_result: ResultCallback,
+            should_stop: Optional[Callable[[], bool]] = None):
+        """Stream events for every (key, host) target until should_stop returns True"""
+        self.streams = [_Stream(key, str(host).strip()) for key, host in targets]
+        try:
+            for stream in self.streams:
+                try:
+                    self._spawn(stream)
+                except OSError as e:
+                    stream.restart_at = time.monotonic() + self.restart_delay
+                    on_result(stream.key, stream.host, [], str(e))
+
+            while should_stop is None or not should_stop():
+                self._poll(0.2, on_result)
+                self._check_deadlines(on_result)
+        finally:
+            self.close()
+
+    def close(self):
+        """Terminate every ping process"""
+        for stream in self.streams:
+            if stream.process is None:
+                continue
+            if self._selector is not None:
+                self._selector.unregister(stream.process.stdout)
+            stream.process.terminate()
+            stream.process.wait()
+            stream.process.stdout.close()
+            stream.process = None
@@ -0,0 +1,132 @@
+"""
+Target lists for Network Engineer Multitool
+
+Reads the IP inventory spreadsheet shared by the GUI and the headless
+checker: an IP column plus optional description, parent, port and worker
+columns, found by their headings. CIDR and range cells are kept apart so
+they can be swept lazily instead of getting a row each.
+
+CSV and plain-text lists are read with the standard library; pandas (and
+openpyxl/xlrd behind it) is imported only for Excel files, as it takes
+longer to import than the rest of the application to start.
+"""
+
+import csv
+import math
+import re
+from typing import List, Optional, Sequence
+
+from modules.ip_calculator import IPCalculator
+
+# Heading keywords of each column, in the order columns are claimed
+PARENT_KEYWORDS = ('parent', 'upstream', 'depends', 'gateway', 'uplink')
+PORT_KEYWORDS = ('port', 'service')
+WORKER_KEYWORDS = ('worker', 'poller')
+IP_KEYWORDS = ('ip', 'address', 'host')
+DESCRIPTION_KEYWORDS = ('description', 'desc', 'name', 'device', 'hostname')
+
+
+def is_blank(value) -> bool:
+    """Empty cell: None, NaN or whitespace"""
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+def find_column(headings: Sequence, keywords: Sequence[str], taken: Sequence = ()) -> Optional[int]:
+    """Index of the first heading containing a keyword, skipping columns already taken"""
+    for index, heading in enumerate(headings):
+        if index in taken:
+            continue
+        if any(keyword in str(heading).lower() for keyword in keywords):
+            return index
+    return None
+
+
+class TargetList:
+    """Targets of an inventory: one entry per listed IP, plus the CIDR/range cells"""
+
+    def __init__(self):
+        self.ips: List[str] = []
+        self.descriptions: List[str] = []
+        self.parents: List[str] = []  # Empty when the sheet has no parent column
+        self.ports: List = []  # Raw port cells; empty when the sheet has no port column
+        self.workers: List[str] = []  # Empty when the sheet has no worker column
+        self.ranges: List[str] = []
+
+    @classmethod
+    def from_rows(cls, headings: Sequence, rows: Sequence[Sequence]) -> "TargetList":
+        """Pick the columns by heading (the IP column defaults to the first) and read every row with an IP"""
+        parent = find_column(headings, PARENT_KEYWORDS)
+        port = find_column(headings, PORT_KEYWORDS, (parent,))
+        worker = find_column(headings, WORKER_KEYWORDS, (parent, port))
+        ip = find_column(headings, IP_KEYWORDS, (parent, port, worker))
+        if ip is None:
+            ip = 0
+        description = find_column(headings, DESCRIPTION_KEYWORDS, (parent, port, worker))
+
+        def cell(row, column, default):
+            value = row[column] if column is not None and column < len(row) else None
+            return default if is_blank(value) else value
+
+        targets = cls()
+        for row in rows:
+            address = cell(row, ip, None)
+            if address is None:
+                continue
+            address = str(address).strip()
+            if IPCalculator.is_range(address):
+                targets.ranges.append(address)
+                continue
+            targets.ips.append(address)
+            targets.descriptions.append(str(cell(row, description, "-")))
+            if parent is not None:
+                targets.parents.append(str(cell(row, parent, "")))
+            if port is not None:
+                targets.ports.append(cell(row, port, None))
+            if worker is not None:
+                targets.workers.append(str(cell(row, worker, "")))
+        return targets
+
+    def __len__(self) -> int:
+        return len(self.ips)
+
+
+def read_csv_rows(filename: str) -> List[List[str]]:
+    """Rows of a CSV file, headings first; the delimiter (comma, semicolon or tab) is detected"""
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(65536)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel  # One column, or too few delimiters to tell
+        return [row for row in csv.reader(f, dialect) if any(cell.strip() for cell in row)]
+
+
+def read_text_rows(filename: str) -> List[List[str]]:
+    """Rows of a plain list: one target per line, optionally followed by a description; # starts a comment"""
+    rows = []
+    with open(filename, encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                rows.append((re.split(r'[\s,;]+', line, maxsplit=1) + ["-"])[:2])
+    return rows
+
+
+def read_targets(filename: str) -> TargetList:
+    """Read an Excel (.xlsx/.xls), CSV or plain-text (.txt) inventory"""
+    suffix = str(filename).lower().rsplit('.', 1)[-1]
+    if suffix == 'csv':
+        rows = read_csv_rows(filename)
+        return TargetList.from_rows(rows[0], rows[1:]) if rows else TargetList()
+    if suffix == 'txt':
+        return TargetList.from_rows(["IP", "Description"], read_text_rows(filename))
+
+    import pandas as pd  # Only Excel needs it; see the module docstring
+
+    df = pd.read_excel(filename)
+    return TargetList.from_rows(list(df.columns), df.values.tolist())
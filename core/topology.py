@@ -0,0 +1,115 @@
+"""
+Topology-aware probe suppression for Network Engineer Multitool
+
+Hosts can depend on a parent (a site router or gateway), either from a
+parent column in the input spreadsheet or inferred from /24 subnets. While
+a parent is down, its children are only probed every few rounds and are
+otherwise reported as unreachable upstream, so a dead site no longer costs
+a full timeout per host every round.
+"""
+
+import ipaddress
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+UPSTREAM_STATUS = "Unreachable (upstream)"
+
+
+class Topology:
+    """Parent/child dependencies between probe targets and the parents that are down"""
+
+    def __init__(self, parents: Dict[str, str], down_after: int = 2, probe_every: int = 5):
+        """parents maps a host to its parent host
+
+        A parent counts as down after down_after failed probes in a row. Children
+        of a down parent are still probed every probe_every-th time so a wrong
+        dependency or a partial outage is noticed.
+        """
+        self.parents = {host: parent for host, parent in parents.items() if parent and parent != host}
+        self.down_after = max(1, down_after)
+        self.probe_every = max(1, probe_every)
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._skips: Dict[str, int] = {}
+        self._bypass = set()  # Children that answered while their parent was down
+        self.saved = 0  # Probes suppressed since the session started
+
+    @classmethod
+    def from_column(cls, hosts: Sequence, parents: Sequence, **kwargs) -> "Topology":
+        """Build from a host list and a parallel parent column; blank cells have no parent"""
+        mapping = {}
+        for host, parent in zip(hosts, parents):
+            parent = str(parent).strip() if parent is not None else ""
+            if parent and parent.lower() not in ("nan", "-", "none"):
+                mapping[str(host).strip()] = parent
+        return cls(mapping, **kwargs)
+
+    @classmethod
+    def from_subnets(cls, hosts: Iterable, prefix: int = 24, **kwargs) -> "Topology":
+        """Infer groups from subnets: every host depends on its subnet's gateway
+
+        The gateway is the first usable address of the subnet (.1 in a /24), or
+        the last one (.254) if the first is not in the inventory. Subnets with
+        neither get no parent.
+        """
+        groups: Dict[ipaddress.IPv4Network, List[str]] = {}
+        for host in hosts:
+            host = str(host).strip()
+            try:
+                network = ipaddress.ip_network(f"{host}/{prefix}", strict=False)
+            except ValueError:
+                continue  # Hostnames have no subnet to infer from
+            groups.setdefault(network, []).append(host)
+
+        mapping = {}
+        for network, members in groups.items():
+            present = set(members)
+            candidates = (str(network.network_address + 1), str(network.broadcast_address - 1))
+            gateway = next((candidate for candidate in candidates if candidate in present), None)
+            if gateway is None:
+                continue
+            for host in members:
+                mapping[host] = gateway
+        return cls(mapping, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def record(self, host: str, online: bool):
+        """Track a probe result of a parent, or of a child probed at the reduced rate"""
+        with self._lock:
+            if online:
+                self._failures.pop(host, None)
+            else:
+                self._failures[host] = self._failures.get(host, 0) + 1
+                self._bypass.discard(host)
+        if online and self.down_parent(host) is not None:
+            self._bypass.add(host)  # The dependency does not hold for this host
+
+    def down_parent(self, host: str) -> Optional[str]:
+        """The nearest ancestor of host that is down, if any"""
+        seen = {host}
+        parent = self.parents.get(host)
+        while parent is not None and parent not in seen:
+            if self._failures.get(parent, 0) >= self.down_after:
+                return parent
+            seen.add(parent)
+            parent = self.parents.get(parent)
+        return None
+
+    def suppress(self, host: str) -> bool:
+        """Whether to skip probing host this time because an ancestor is down"""
+        if self.down_parent(host) is None:
+            self._skips.pop(host, None)
+            self._bypass.discard(host)
+            return False
+        if host in self._bypass:
+            return False
+        with self._lock:
+            skips = self._skips.get(host, 0) + 1
+            if skips >= self.probe_every:
+                self._skips[host] = 0
+                return False  # Probe at the reduced rate
+            self._skips[host] = skips
+            self.saved += 1
+            return True
@@ -0,0 +1,78 @@
+"""
+Coalesced display updates for Network Engineer Multitool
+
+Probe results arrive from worker threads far faster than a Tk window can
+redraw them. Instead of scheduling one main-loop callback per result,
+workers store results in the ResultStore and count them in an
+UpdateBuffer, and the main loop drains both at a fixed frame rate: the rows
+changed since the last frame come from ResultStore.take_changes(), so each
+row is redrawn at most once per frame, and the status bar is redrawn once
+per frame, however many hosts report.
+"""
+
+import threading
+from typing import Callable, List, Optional, Tuple, Union
+
+from .pool import RoundProgress
+
+# Frames per second the GUI drains the buffer at
+FRAME_RATE = 20
+
+Status = Union[str, Callable[[], str]]
+
+
+class UpdateBuffer:
+    """Thread-safe buffer of finished results, status text and main-thread calls, drained once per frame"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done: List[Tuple[RoundProgress, float]] = []
+        self._status: Optional[Status] = None
+        self._calls: List[Callable[[], None]] = []
+        self.frames = 0
+
+    def record(self, progress: RoundProgress, completed_at: float, status: Optional[Status] = None):
+        """Count a stored result in progress when the frame is drawn
+
+        status is the status text (or a callable making it) to show afterwards.
+        """
+        with self._lock:
+            self._done.append((progress, completed_at))
+            if status is not None:
+                self._status = status
+
+    def status(self, status: Status):
+        """Show a status text on the next frame, replacing any not yet shown"""
+        with self._lock:
+            self._status = status
+
+    def call(self, func: Callable[[], None]):
+        """Run func in the main thread after the next frame's rows and status"""
+        with self._lock:
+            self._calls.append(func)
+
+    def drain(self) -> Tuple[Optional[str], List[Callable[[], None]]]:
+        """Take one frame's work: (status text, calls)
+
+        Pending progress is recorded here, so display lag is measured up to
+        this frame.
+        """
+        with self._lock:
+            done, self._done = self._done, []
+            status, self._status = self._status, None
+            calls, self._calls = self._calls, []
+            self.frames += 1
+        for progress, completed_at in done:
+            progress.record(completed_at)
+        if callable(status):
+            status = status()
+        return status, calls
+
+    def clear(self):
+        """Drop every pending result and status"""
+        with self._lock:
+            self._done.clear()
+            self._status = None
+
+    def __len__(self) -> int:
+        return len(self._done)
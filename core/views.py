@@ -0,0 +1,160 @@
+"""
+Sorted result views for Network Engineer Multitool
+
+The results table shows the rows of the result store in some order, for
+example slowest hosts first, while results keep streaming in. Re-sorting
+every row on each result costs O(n log n); instead a RowView keeps a
+sorted index of (key, row) pairs and moves only the rows that changed,
+each in O(log n) plus a short copy inside one bucket of the index.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Entries per bucket of the sorted index; buckets split at twice this size
+BUCKET_SIZE = 512
+
+
+class SortedKeyList:
+    """Sorted list split into buckets, so inserts and removals only copy one bucket"""
+
+    def __init__(self, items: Iterable = ()):
+        self._buckets: List[List] = []
+        self._maxes: List = []  # Last item of each bucket
+        self._len = 0
+        self.reset(items)
+
+    def reset(self, items: Iterable = ()):
+        items = sorted(items)
+        self._buckets = [items[i:i + BUCKET_SIZE] for i in range(0, len(items), BUCKET_SIZE)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(items)
+
+    def add(self, item):
+        if not self._buckets:
+            self._buckets.append([item])
+            self._maxes.append(item)
+        else:
+            position = min(bisect_left(self._maxes, item), len(self._buckets) - 1)
+            bucket = self._buckets[position]
+            insort(bucket, item)
+            self._maxes[position] = bucket[-1]
+            if len(bucket) > 2 * BUCKET_SIZE:
+                self._buckets[position:position + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+                self._maxes[position:position + 1] = [bucket[BUCKET_SIZE - 1], bucket[-1]]
+        self._len += 1
+
+    def remove(self, item):
+        """Remove an item that is in the list; raises ValueError otherwise"""
+        position = bisect_left(self._maxes, item)
+        if position < len(self._buckets):
+            bucket = self._buckets[position]
+            index = bisect_left(bucket, item)
+            if index < len(bucket) and bucket[index] == item:
+                del bucket[index]
+                self._len -= 1
+                if bucket:
+                    self._maxes[position] = bucket[-1]
+                else:
+                    del self._buckets[position]
+                    del self._maxes[position]
+                return
+        raise ValueError(f"{item!r} not in list")
+
+    def slice(self, start: int, stop: int) -> List:
+        """Items start..stop-1 in sorted order"""
+        found = []
+        offset = 0
+        for bucket in self._buckets:
+            end = offset + len(bucket)
+            if end > start:
+                found.extend(bucket[max(0, start - offset):max(0, stop - offset)])
+                if end >= stop:
+                    break
+            offset = end
+        return found
+
+    def count_below(self, item) -> int:
+        """Number of items less than item"""
+        position = bisect_left(self._maxes, item)
+        below = sum(len(bucket) for bucket in self._buckets[:position])
+        if position < len(self._buckets):
+            below += bisect_left(self._buckets[position], item)
+        return below
+
+    def __iter__(self) -> Iterator:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class RowView:
+    """The rows a filter accepts, kept sorted by a key as their results change"""
+
+    def __init__(self, key: Optional[Callable[[int], Any]] = None, reverse: bool = False,
+                 accept: Optional[Callable[[int], bool]] = None):
+        """key maps a row to its sort value (row order when None); accept(row) filters rows"""
+        self.key = key
+        self.reverse = reverse
+        self.accept = accept
+        self._index = SortedKeyList()
+        self._keys: Dict[int, Any] = {}  # Row -> key it is filed under
+        self.moved = 0  # Rows moved by update() since the last rebuild()
+
+    def _key(self, row: int):
+        return (self.key(row) if self.key is not None else row), row
+
+    def rebuild(self, rows: Iterable[int]):
+        """File these rows from scratch, after the key or the filter changed"""
+        accept, keyed = self.accept, self._key
+        self._keys = {row: keyed(row) for row in rows if accept is None or accept(row)}
+        self._index.reset(self._keys.values())
+        self.moved = 0
+
+    def update(self, rows: Iterable[int]) -> int:
+        """Refile rows whose values changed or that were added; returns how many moved"""
+        moved = 0
+        for row in rows:
+            old = self._keys.get(row)
+            new = self._key(row) if self.accept is None or self.accept(row) else None
+            if new == old:
+                continue
+            if old is not None:
+                self._index.remove(old)
+                del self._keys[row]
+            if new is not None:
+                self._index.add(new)
+                self._keys[row] = new
+            moved += 1
+        self.moved += moved
+        return moved
+
+    def window(self, start: int, count: int) -> List[int]:
+        """Rows at display positions start..start+count-1"""
+        length = len(self._index)
+        if self.reverse:
+            stop = length - start
+            entries = self._index.slice(max(0, stop - count), max(0, stop))[::-1]
+        else:
+            entries = self._index.slice(start, start + count)
+        return [row for _, row in entries]
+
+    def position(self, row: int) -> Optional[int]:
+        """Display position of a row, or None when it is filtered out"""
+        entry = self._keys.get(row)
+        if entry is None:
+            return None
+        below = self._index.count_below(entry)
+        return len(self._index) - 1 - below if self.reverse else below
+
+    def __contains__(self, row: int) -> bool:
+        return row in self._keys
+
+    def __iter__(self) -> Iterator[int]:
+        rows = (row for _, row in self._index)
+        return iter(list(rows)[::-1]) if self.reverse else rows
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -6,6 +6,7 @@ A comprehensive tool for network engineering tasks
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Add the current directory to the Python path
@@ -26,4 +27,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Sharded sweep workers re-enter here in a frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -3,7 +3,9 @@ IP Calculator Module for Network Engineer Multitool
 """
 
 import ipaddress
-from typing import Dict, List
+import socket
+import struct
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 class IPCalculator:
     """IP address calculation tools"""
@@ -16,6 +18,7 @@ class IPCalculator:
         """Calculate subnet details"""
         try:
             network = ipaddress.ip_network(network_cidr, strict=False)
+            first, last = self.host_range(network)
             result = {
                 'network_address': str(network.network_address),
                 'netmask': str(network.netmask),
@@ -23,8 +26,8 @@ class IPCalculator:
                 'total_hosts': network.num_addresses,
                 'usable_hosts': network.num_addresses - 2 if network.prefixlen < 31 else network.num_addresses,
                 'cidr': network.prefixlen,
-                'host_range_start': str(network.network_address + 1) if network.prefixlen < 31 else str(network.network_address),
-                'host_range_end': str(network.broadcast_address - 1) if network.prefixlen < 31 else str(network.broadcast_address)
+                'host_range_start': str(ipaddress.ip_address(first)),
+                'host_range_end': str(ipaddress.ip_address(last))
             }
             
             self.db_manager.save_ip_calculation(
@@ -44,6 +47,69 @@ class IPCalculator:
         except ValueError as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def host_range(network: ipaddress.IPv4Network) -> Tuple[int, int]:
+        """First and last usable host of a network as integers (/31 and /32 use every address)"""
+        first, last = int(network.network_address), int(network.broadcast_address)
+        if network.prefixlen < 31:
+            return first + 1, last - 1
+        return first, last
+    
+    @staticmethod
+    def parse_range(spec: str) -> Tuple[int, int]:
+        """Parse a target range into its first and last host as integers
+        
+        Accepts a CIDR (10.0.0.0/16, usable hosts only), a full range
+        (10.0.0.5-10.0.1.20), a last-octet range (10.0.0.5-20) or a single
+        address. Raises ValueError for anything else.
+        """
+        spec = str(spec).strip()
+        if '/' in spec:
+            network = ipaddress.IPv4Network(spec, strict=False)
+            return IPCalculator.host_range(network)
+        if '-' in spec:
+            start_text, end_text = (part.strip() for part in spec.split('-', 1))
+            start = ipaddress.IPv4Address(start_text)
+            if '.' in end_text:
+                end = ipaddress.IPv4Address(end_text)
+            else:
+                end = ipaddress.IPv4Address(f"{start_text.rsplit('.', 1)[0]}.{end_text}")
+            if end < start:
+                raise ValueError(f"Range end {end} is before its start {start}")
+            return int(start), int(end)
+        address = int(ipaddress.IPv4Address(spec))
+        return address, address
+    
+    @staticmethod
+    def is_range(spec: str) -> bool:
+        """Whether a target is a valid CIDR or address range rather than a single host"""
+        spec = str(spec).strip()
+        if '/' not in spec and '-' not in spec:
+            return False
+        try:
+            IPCalculator.parse_range(spec)
+            return True
+        except ValueError:
+            return False  # e.g. a hostname with a dash
+    
+    @staticmethod
+    def count_hosts(specs: Iterable[str]) -> int:
+        """Number of addresses a list of ranges expands to"""
+        total = 0
+        for spec in specs:
+            first, last = IPCalculator.parse_range(spec)
+            total += last - first + 1
+        return total
+    
+    @staticmethod
+    def iter_hosts(specs: Iterable[str]) -> Iterator[str]:
+        """Yield every address of a list of ranges, one at a time, without building a list"""
+        pack = struct.Struct('!I').pack
+        for spec in specs:
+            first, last = IPCalculator.parse_range(spec)
+            for address in range(first, last + 1):
+                yield socket.inet_ntoa(pack(address))
+    
     def get_supernets(self, cidr_list: List[str]) -> Dict:
         """Calculate supernets for a list of CIDRs"""
         try:
@@ -2,33 +2,63 @@
 Ping Tool Module for Network Engineer Multitool
 """
 
+import itertools
+import math
+import os
 import subprocess
-import re
 import platform
-from typing import Dict, List, Optional
+import socket
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.icmp import get_prober
+from core.probes import create_prober
+from core.sharded import ShardedSweeper
+from core.distributed import DistributedSweeper
+from core.rate_limit import shared_limiter
+from core.resolver import shared_resolver
+from core.rtt import AdaptiveTimeouts
+from core.stream_ping import iter_ping_output
+from core.ping_parser import parse_ping_output, parse_reply_line
+from modules.ip_calculator import IPCalculator
+
+# Target count from which ping_multiple_hosts shards the sweep across processes
+SHARD_THRESHOLD = 20000
+
+# Targets handed to the sweep engine at a time, so lazy ranges never sit in memory whole
+SWEEP_CHUNK = 16384
+
 
 class PingTool:
     """Ping tool for network connectivity testing"""
     
-    def __init__(self, db_manager):
-        """Initialize ping tool with database manager"""
+    def __init__(self, db_manager, timeouts: Optional[AdaptiveTimeouts] = None):
+        """Initialize ping tool with database manager
+
+        With adaptive timeouts, every host waits its own timeout instead of the
+        timeout passed in.
+        """
         self.db_manager = db_manager
+        self.timeouts = timeouts
         self.is_windows = platform.system().lower() == 'windows'
     
-    def ping_host(self, target: str, count: int = 4, timeout: int = 5) -> Dict:
-        """Ping a host and return results"""
+    def ping_host(self, target: str, count: int = 4, timeout: int = 5,
+                  on_reply: Optional[Callable[[int, Optional[float]], None]] = None,
+                  first_reply: bool = False) -> Dict:
+        """Ping a host and return results
+
+        on_reply(index, rtt) is called as each echo completes (rtt in ms, None
+        when lost). first_reply stops at the first answer, for reachability checks.
+        """
         try:
-            # Build ping command based on OS
-            if self.is_windows:
-                cmd = ['ping', '-n', str(count), '-w', str(timeout * 1000), target]
+            # Prefer ICMP sockets, fall back to the system ping command
+            prober = get_prober()
+            if prober is not None:
+                ping_result = self._socket_ping(prober, target, count, timeout, on_reply, first_reply)
+                raw_output = None
+            elif on_reply is not None or first_reply:
+                ping_result, raw_output = self._streaming_subprocess_ping(target, count, timeout, on_reply, first_reply)
             else:
-                cmd = ['ping', '-c', str(count), '-W', str(timeout), target]
-            
-            # Execute ping command
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            # Parse results
-            ping_result = self._parse_ping_output(result.stdout, result.stderr, target, count)
+                ping_result, raw_output = self._subprocess_ping(target, count, timeout)
             
             # Save to database
             self.db_manager.save_ping_result(
@@ -39,7 +69,7 @@ class PingTool:
                 min_time=ping_result.get('min_time'),
                 max_time=ping_result.get('max_time'),
                 avg_time=ping_result.get('avg_time'),
-                raw_output=result.stdout
+                raw_output=raw_output
             )
             
             # Log to work history
@@ -71,6 +101,103 @@ class PingTool:
                 'packet_loss': 100.0
             }
     
+    def _ping_command(self, target: str, count: int, timeout: float) -> List[str]:
+        """Build the system ping command for this OS"""
+        if self.timeouts is not None:
+            timeout = self.timeouts.timeout(target)
+        # Hand ping the cached address so it does not ask DNS again on every run
+        address = shared_resolver.address(target)
+        if self.is_windows:
+            return ['ping', '-n', str(count), '-w', str(max(1, round(timeout * 1000))), address]
+        return ['ping', '-c', str(count), '-W', str(max(1, math.ceil(timeout))), address]
+    
+    def _subprocess_ping(self, target: str, count: int, timeout: int):
+        """Ping with the system ping command, returning the result and raw output"""
+        cmd = self._ping_command(target, count, timeout)
+        
+        # Execute ping command once the rate limiter allows it
+        shared_limiter.acquire(shared_resolver.address(target), count)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        
+        # Parse results
+        ping_result = self._parse_ping_output(result.stdout, result.stderr, target, count)
+        if self.timeouts is not None:
+            received = ping_result['packets_received']
+            times = ping_result['times'] or [ping_result.get('avg_time')] * received
+            self.timeouts.observe_all(target, times + [None] * (ping_result['packets_sent'] - len(times)))
+        return ping_result, result.stdout
+    
+    def _streaming_subprocess_ping(self, target: str, count: int, timeout: int,
+                                   on_reply: Optional[Callable[[int, Optional[float]], None]],
+                                   first_reply: bool):
+        """Ping with the system ping command, handling each reply line as it is printed"""
+        cmd = self._ping_command(target, count, timeout)
+        shared_limiter.acquire(shared_resolver.address(target), count)
+        
+        rtts = []
+        lines = []
+        # Closing the output early ends the ping process
+        output = iter_ping_output(cmd)
+        try:
+            for line in output:
+                lines.append(line)
+                is_event, rtt = parse_reply_line(line)
+                if not is_event:
+                    continue
+                if self.timeouts is not None:
+                    self.timeouts.observe(target, rtt)
+                rtts.append(rtt)
+                if on_reply is not None:
+                    on_reply(len(rtts) - 1, rtt)
+                if first_reply and rtt is not None:
+                    break
+        finally:
+            output.close()
+        
+        # Unix ping prints no line for a lost echo, so unseen echoes count as lost
+        sent = len(rtts) if first_reply and rtts and rtts[-1] is not None else count
+        result = self._build_result(target, sent, rtts)
+        raw_output = '\n'.join(lines)
+        if not rtts and 'error' in parse_ping_output(raw_output):
+            result['error'] = 'Host not found'
+        return result, raw_output
+    
+    def _socket_ping(self, prober, target: str, count: int, timeout: int,
+                     on_reply: Optional[Callable[[int, Optional[float]], None]] = None,
+                     first_reply: bool = False) -> Dict:
+        """Ping over the shared ICMP socket"""
+        try:
+            rtts = prober.ping(target, timeout, count, self.timeouts, on_reply, first_reply)
+        except socket.gaierror:
+            result = self._build_result(target, count, [])
+            result['error'] = 'Host not found'
+            return result
+        
+        return self._build_result(target, len(rtts), rtts)
+    
+    def _build_result(self, target: str, count: int, rtts: List[Optional[float]]) -> Dict:
+        """Build a result dict from per-echo round-trip times (None = lost)"""
+        result = {
+            'target': target,
+            'success': False,
+            'packets_sent': count,
+            'packets_received': 0,
+            'packet_loss': 100.0,
+            'times': []
+        }
+        
+        times = [rtt for rtt in rtts if rtt is not None]
+        result['packets_received'] = len(times)
+        result['packet_loss'] = (count - len(times)) / count * 100 if count > 0 else 100.0
+        if times:
+            result['min_time'] = min(times)
+            result['max_time'] = max(times)
+            result['avg_time'] = sum(times) / len(times)
+            result['times'] = times
+            result['success'] = True
+        
+        return result
+    
     def _parse_ping_output(self, stdout: str, stderr: str, target: str, count: int) -> Dict:
         """Parse ping command output"""
         result = {
@@ -90,69 +217,81 @@ class PingTool:
             result['error'] = 'No output received'
             return result
         
-        if self.is_windows:
-            return self._parse_windows_ping(stdout, result)
-        else:
-            return self._parse_unix_ping(stdout, result)
+        result.update(parse_ping_output(stdout, count))
+        return result
     
-    def _parse_windows_ping(self, output: str, result: Dict) -> Dict:
-        """Parse Windows ping output"""
-        lines = output.split('\n')
-        
-        # Count successful pings and extract times
-        times = []
-        for line in lines:
-            if 'time=' in line and 'TTL=' in line:
-                result['packets_received'] += 1
-                # Extract time
-                time_match = re.search(r'time[<=](\d+)ms', line)
-                if time_match:
-                    times.append(float(time_match.group(1)))
-        
-        # Look for statistics
-        for line in lines:
-            if 'Lost =' in line:
-                loss_match = re.search(r'Lost = (\d+)', line)
-                if loss_match:
-                    lost = int(loss_match.group(1))
-                    result['packet_loss'] = (lost / result['packets_sent']) * 100
+    def sweep_hosts(self, targets: Iterable[str], count: int = 1, timeout: float = 1,
+                    max_in_flight: int = 5000, first_reply: bool = False,
+                    probe: str = "ICMP", port: Optional[int] = None, processes: int = 1,
+                    workers: Optional[List[str]] = None, token: Optional[str] = None,
+                    responders_only: bool = False) -> Dict:
+        """Probe many hosts concurrently from one event loop and save results in one batch
+
+        probe is ICMP, or TCP/UDP to port for hosts that filter ICMP. With
+        processes above 1, the targets are sharded across worker processes.
+        With workers ("host:port" of probe workers), they are sharded across
+        those workers instead and probed from there.
         
-        if times:
-            result['min_time'] = min(times)
-            result['max_time'] = max(times)
-            result['avg_time'] = sum(times) / len(times)
-            result['times'] = times
-            result['success'] = True
+        targets may be a lazy generator such as IPCalculator.iter_hosts; it is
+        consumed a chunk at a time. With responders_only, only hosts that
+        answered are kept and saved.
+        """
+        results = {}
+        swept = 0
         
-        return result
-    
-    def _parse_unix_ping(self, output: str, result: Dict) -> Dict:
-        """Parse Unix/Linux ping output"""
-        lines = output.split('\n')
-        
-        # Find statistics line
-        for line in lines:
-            if 'packets transmitted' in line:
-                match = re.search(r'(\d+) packets transmitted, (\d+) (?:packets )?received.*?(\d+(?:\.\d+)?)% packet loss', line)
-                if match:
-                    result['packets_sent'] = int(match.group(1))
-                    result['packets_received'] = int(match.group(2))
-                    result['packet_loss'] = float(match.group(3))
-        
-        # Find timing statistics
-        for line in lines:
-            if 'min/avg/max' in line:
-                match = re.search(r'= ([\d.]+)/([\d.]+)/([\d.]+)', line)
-                if match:
-                    result['min_time'] = float(match.group(1))
-                    result['avg_time'] = float(match.group(2))
-                    result['max_time'] = float(match.group(3))
-                    result['success'] = True
+        def on_result(key, target, rtts, error):
+            nonlocal swept
+            swept += 1
+            result = self._build_result(target, len(rtts) if first_reply and rtts else count, rtts)
+            if error:
+                result['error'] = error
+            if result['success'] or not responders_only:
+                results[target] = result
         
-        return result
+        if not workers and isinstance(targets, list):
+            # One parallel DNS pass up front instead of a lookup per probe (workers resolve their own;
+            # lazy range expansions are addresses already)
+            shared_resolver.resolve_all(targets)
+        if workers:
+            sweeper = DistributedSweeper(workers, probe=probe, port=port, timeout=timeout, count=count,
+                                         max_in_flight=max_in_flight, timeouts=self.timeouts,
+                                         first_reply=first_reply, token=token)
+        elif processes > 1:
+            sweeper = ShardedSweeper(processes, probe=probe, port=port, timeout=timeout, count=count,
+                                     max_in_flight=max_in_flight, timeouts=self.timeouts, first_reply=first_reply)
+        else:
+            sweeper = create_prober(probe, port, timeout=timeout, count=count, max_in_flight=max_in_flight,
+                                    timeouts=self.timeouts, first_reply=first_reply)
+        targets = iter(targets)
+        try:
+            while True:
+                chunk = [(target, target) for target in itertools.islice(targets, SWEEP_CHUNK)]
+                if not chunk:
+                    break
+                sweeper.run(chunk, on_result)
+        finally:
+            sweeper.close()
+        
+        self.db_manager.save_ping_results(list(results.values()))
+        online = sum(1 for result in results.values() if result['success'])
+        self.db_manager.log_work_history(
+            module="ping_tool",
+            action="sweep_hosts",
+            details=f"Swept {swept} hosts ({probe}) - {online} online",
+            data={'targets': swept, 'online': online, 'count': count, 'timeout': timeout,
+                  'probe': probe, 'port': port}
+        )
+        
+        return results
     
     def ping_multiple_hosts(self, targets: List[str], count: int = 4) -> Dict:
         """Ping multiple hosts"""
+        if get_prober() is not None:
+            print(f"Sweeping {len(targets)} hosts...")
+            # Very large lists outgrow one process's CPU; shard them across cores
+            processes = (os.cpu_count() or 1) if len(targets) >= SHARD_THRESHOLD else 1
+            return self.sweep_hosts(targets, count, processes=processes)
+        
         results = {}
         for target in targets:
             print(f"Pinging {target}...")
@@ -204,6 +343,9 @@ class PingTool:
         print("2. Ping multiple hosts")
         print("3. Continuous ping")
         print("4. View ping history")
+        print("5. TCP/UDP port probe")
+        print("6. Distributed sweep")
+        print("7. Sweep CIDR/range")
         print("0. Back to main menu")
         print("="*40)
     
@@ -221,6 +363,12 @@ class PingTool:
                 self._continuous_ping()
             elif choice == '4':
                 self._view_ping_history()
+            elif choice == '5':
+                self._port_probe()
+            elif choice == '6':
+                self._distributed_sweep()
+            elif choice == '7':
+                self._range_sweep()
             elif choice == '0':
                 break
             else:
@@ -234,17 +382,31 @@ class PingTool:
             return
         
         try:
-            count = int(input("Enter number of pings (default 4): ").strip() or "4")
+            count = self._input_count("Enter number of pings (default 4): ")
             timeout = int(input("Enter timeout in seconds (default 5): ").strip() or "5")
         except ValueError:
             print("Invalid input, using defaults")
             count, timeout = 4, 5
         
         print(f"\nPinging {target}...")
-        result = self.ping_host(target, count, timeout)
+        
+        def on_reply(index, rtt):
+            if rtt is not None:
+                print(f"  Reply {index + 1}/{count} from {target}: time={rtt:.1f}ms")
+            else:
+                print(f"  Request {index + 1}/{count} to {target} timed out")
+        
+        result = self.ping_host(target, count, timeout, on_reply)
         
         self._display_ping_result(result)
     
+    def _input_count(self, prompt: str) -> int:
+        """Read a probe count, 4 by default; ValueError unless it is at least 1"""
+        count = int(input(prompt).strip() or "4")
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        return count
+    
     def _ping_multiple_hosts(self):
         """Interactive multiple hosts ping"""
         targets_input = input("Enter targets separated by commas: ").strip()
@@ -254,7 +416,7 @@ class PingTool:
         
         targets = [t.strip() for t in targets_input.split(',')]
         try:
-            count = int(input("Enter number of pings per target (default 4): ").strip() or "4")
+            count = self._input_count("Enter number of pings per target (default 4): ")
         except ValueError:
             count = 4
         
@@ -267,6 +429,83 @@ class PingTool:
             print(f"\n{target}:")
             self._display_ping_result(result, verbose=False)
     
+    def _port_probe(self):
+        """Interactive TCP/UDP probe of hosts that filter ICMP"""
+        targets_input = input("Enter targets separated by commas: ").strip()
+        if not targets_input:
+            print("No targets specified")
+            return
+        
+        targets = [t.strip() for t in targets_input.split(',')]
+        probe = input("Enter protocol, TCP or UDP (default TCP): ").strip().upper() or "TCP"
+        if probe not in ("TCP", "UDP"):
+            print("Invalid protocol")
+            return
+        try:
+            port = int(input("Enter port (default 80 for TCP, 33434 for UDP): ").strip() or "0") or None
+            count = self._input_count("Enter number of probes per target (default 4): ")
+        except ValueError:
+            port, count = None, 4
+        
+        results = self.sweep_hosts(targets, count, probe=probe, port=port)
+        
+        print("\n" + "="*50)
+        print(f"    {probe} Probe Results")
+        print("="*50)
+        for target, result in results.items():
+            print(f"\n{target}:")
+            self._display_ping_result(result, verbose=False)
+    
+    def _distributed_sweep(self):
+        """Interactive sweep through remote probe workers"""
+        workers_input = input("Enter workers (host:port) separated by commas: ").strip()
+        targets_input = input("Enter targets separated by commas: ").strip()
+        if not workers_input or not targets_input:
+            print("Workers and targets are required")
+            return
+        
+        workers = [w.strip() for w in workers_input.split(',') if w.strip()]
+        targets = [t.strip() for t in targets_input.split(',')]
+        token = input("Enter worker token (press Enter for none): ").strip() or None
+        try:
+            count = self._input_count("Enter number of pings per target (default 4): ")
+        except ValueError:
+            count = 4
+        
+        results = self.sweep_hosts(targets, count, workers=workers, token=token)
+        
+        print("\n" + "="*50)
+        print(f"    Distributed Sweep Results ({len(workers)} workers)")
+        print("="*50)
+        for target, result in results.items():
+            print(f"\n{target}:")
+            self._display_ping_result(result, verbose=False)
+    
+    def _range_sweep(self):
+        """Interactive sweep of CIDRs and address ranges"""
+        ranges_input = input("Enter CIDRs or ranges separated by commas (e.g. 10.0.0.0/24, 10.0.1.5-40): ").strip()
+        if not ranges_input:
+            print("No ranges specified")
+            return
+        
+        specs = [r.strip() for r in ranges_input.split(',') if r.strip()]
+        try:
+            total = IPCalculator.count_hosts(specs)
+        except ValueError as e:
+            print(f"Invalid range: {e}")
+            return
+        responders_only = (input("Show responders only? (Y/n): ").strip().lower() or "y") == "y"
+        
+        print(f"\nSweeping {total} addresses...")
+        results = self.sweep_hosts(IPCalculator.iter_hosts(specs), count=1, responders_only=responders_only)
+        
+        print("\n" + "="*50)
+        print(f"    Range Sweep Results ({sum(1 for r in results.values() if r['success'])}/{total} responded)")
+        print("="*50)
+        for target, result in results.items():
+            print(f"\n{target}:")
+            self._display_ping_result(result, verbose=False)
+    
     def _continuous_ping(self):
         """Interactive continuous ping"""
         target = input("Enter target (IP or hostname): ").strip()
@@ -1,34 +1,198 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+import csv
 import subprocess
 import threading
 import time
-from datetime import datetime
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor
-import queue
+import itertools
+import multiprocessing
+
+from core.icmp import get_prober, format_response_time
+from core.probes import DEFAULT_PORTS, PROBE_TYPES
+from core.distributed import DEFAULT_PORT as DEFAULT_WORKER_PORT
+from core.engines import ENGINES, create_round_engine
+from core.stream_ping import IS_WINDOWS, StreamingPinger, iter_ping_output, ping_command
+from core.ping_parser import parse_ping_output, parse_reply_line
+from core.pool import ProbePool, RoundProgress
+from core.scheduler import AdaptivePollScheduler, ProbeScheduler
+from core.rate_limit import configure_rate_limit, shared_limiter
+from core.resolver import is_ipv4_literal, shared_resolver
+from core.rtt import AdaptiveTimeouts
+from core.filters import FilterIndex, RowFilter, parse_network
+from core.results import COLUMNS, ONLINE, STATUS_CODES, STATUS_TEXT, ResultStore
+from core.targets import read_targets
+from core.topology import UPSTREAM_STATUS, Topology
+from core.updates import FRAME_RATE, UpdateBuffer
+from core.views import RowView
+from modules.ip_calculator import IPCalculator
+
+# Range addresses expanded and probed at a time, so a /16 never sits in memory at once
+RANGE_CHUNK = 4096
+
+
+class VirtualTable:
+    """Results table over a ResultStore: only the rows on screen exist as Treeview items
+
+    view holds the rows shown, filtered and sorted; scrolling moves a window
+    over it and rewrites the few items in it, so loading, scrolling and
+    redrawing cost O(visible rows). Rows whose results changed are refiled
+    in the view one by one, so a sort stays live while results stream in.
+    """
+    
+    def __init__(self, parent, store, headings):
+        self.store = store
+        self.view = RowView()  # Rows shown, in display order
+        self.rows = 0  # Store rows the view has been given
+        self.status_suffix = None  # IP -> extra status text, or None
+        self.offset = 0
+        self.items = []  # One placeholder item per visible line
+        self.rendered = {}  # Item -> (values, tag) last written, to skip unchanged rows
+        self.stale = False  # view must be rebuilt before the next render
+        self.candidates = None  # Rows that may pass the filter, or None for every row
+        
+        self.tree = ttk.Treeview(parent, columns=COLUMNS, show="headings", selectmode="none")
+        for column, (text, width, command) in headings.items():
+            self.tree.heading(column, text=text, command=command)
+            self.tree.column(column, width=width)
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.yview)
+        self.tree.bind("<Configure>", lambda event: self.resize(event.height))
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+    
+    def reset(self):
+        """Show the store's rows from the top, after it was loaded or cleared"""
+        self.rows = 0
+        self.offset = 0
+        self.invalidate()
+        self.refresh()
+    
+    def set_filter(self, accept, candidates=None):
+        """Show only the rows accept(row) is true for; None shows every row
+
+        candidates() may name the rows worth testing, so a narrow filter
+        rebuilds in time proportional to its matches rather than to the store.
+        """
+        self.view.accept = accept
+        self.candidates = candidates
+        self.invalidate()
+    
+    def sort(self, key, reverse=False):
+        """Order the rows by key(row) from now on, including rows that change later"""
+        self.view.key = key
+        self.view.reverse = reverse
+        self.invalidate()
+        self.refresh()
+    
+    def changed(self, rows):
+        """Refile rows whose results changed"""
+        if not self.stale:
+            self.view.update(rows)
+    
+    def invalidate(self):
+        """Rebuild the view on the next refresh, after the filter or the sort changed"""
+        self.stale = True
+    
+    def resize(self, height):
+        """Keep one placeholder item per line that fits in height pixels"""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        lines = max(1, height // row_height - 1)  # Less the heading
+        while len(self.items) < lines:
+            self.items.append(self.tree.insert("", tk.END, values=()))
+        while len(self.items) > lines:
+            item = self.items.pop()
+            self.rendered.pop(item, None)
+            self.tree.delete(item)
+        self.refresh()
+    
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.view))
+        elif args[0] == "scroll":
+            step = len(self.items) if args[2] == "pages" else 1
+            self.offset += int(args[1]) * step
+        self.refresh()
+    
+    def scroll(self, lines):
+        self.offset += lines
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the visible window from the store"""
+        rows = len(self.store)
+        if rows > self.rows and not self.stale:
+            self.view.update(range(self.rows, rows))  # Appended range responders
+        self.rows = rows
+        if self.stale:
+            self.view.rebuild(self.candidates() if self.candidates is not None else range(rows))
+            self.stale = False
+        total = len(self.view)
+        self.offset = max(0, min(self.offset, total - len(self.items)))
+        window = self.view.window(self.offset, len(self.items))
+        for position, item in enumerate(self.items):
+            if position < len(window):
+                index = window[position]
+                view = (self.store.row(index, self.status_suffix), self.store.tag(index))
+            else:
+                view = ((), "")
+            if self.rendered.get(item) != view:
+                self.rendered[item] = view
+                self.tree.item(item, values=view[0], tags=(view[1],) if view[1] else ())
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(self.items)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
 class PingApp:
     def __init__(self, root):
         self.root = root
         self.root.title("IP Ping Checker")
-        self.root.geometry("800x600")
+        self.root.geometry("1100x600")
         self.root.resizable(True, True)
         
         # Variables
         self.excel_file = None
         self.ip_addresses = []
         self.descriptions = []  # Store descriptions for each IP
-        self.ping_results = []
+        self.parents = []  # Parent (upstream) IP of each IP, from an optional spreadsheet column
+        self.ports = []  # Probe port of each IP, from an optional spreadsheet column
+        self.worker_cells = []  # Probe worker (host:port) of each IP, from an optional spreadsheet column
+        self.file_ranges = []  # CIDR/range cells of the spreadsheet, expanded lazily when swept
+        self.ranges = []  # Ranges of the current session: file_ranges plus the Ranges field
+        self.range_responders = 0
+        self.responders_only = False
+        self.store = ResultStore()  # Results of every row; the table shows a window of it
+        self.filters = FilterIndex(self.store)  # Status, word and address indexes for the filter bar
         self.is_pinging = False
         self.infinite_ping = False
         self.sort_reverse = {}  # Track sort direction for each column
         self.max_workers = 50  # Maximum number of parallel ping threads
-        self.ping_queue = queue.Queue()  # Queue for ping results
+        self.engine = "Auto"  # Probe engine chosen when the ping session starts
+        self.timeouts = None  # Adaptive per-IP timeouts for the current session, if enabled
+        self.topology = None  # Upstream dependencies for the current session, if enabled
+        self.first_reply = False  # Stop pinging an IP at its first reply
+        self.probe_type = "ICMP"  # ICMP echo, or a TCP/UDP port probe
+        self.port = None  # Default probe port; port_map holds per-IP ports from the spreadsheet
+        self.port_map = {}
+        # Options of the current session, read in the main thread when it starts
+        self.timeout_ms = 100
+        self.count = 4
+        self.interval = 1
+        self.threads = self.max_workers
+        self.max_in_flight = 5000
+        self.processes = None
+        self.max_interval = 60.0
+        self.workers = []
+        self.token = None  # Shared token of the Distributed engine's workers
+        self.adaptive_poll = False
+        self.updates = UpdateBuffer()  # Results from worker threads, drawn once per frame
+        shared_resolver.on_change = self.address_changed
         
         self.setup_ui()
+        self.root.after(1000 // FRAME_RATE, self.draw_frame)
         
     def setup_ui(self):
         # Main frame
@@ -76,6 +240,93 @@ class PingApp:
         self.threads_var = tk.StringVar(value="50")
         ttk.Entry(options_frame, textvariable=self.threads_var, width=10).grid(row=1, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
         
+        # Spread infinite-mode probes evenly across the interval instead of bursting
+        self.spread_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Spread Probes", variable=self.spread_var).grid(row=1, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        # Probe engine: ICMP sockets avoid one process spawn per ping
+        ttk.Label(options_frame, text="Engine:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        self.engine_var = tk.StringVar(value="Auto")
+        ttk.Combobox(options_frame, textvariable=self.engine_var, values=ENGINES, state="readonly", width=12).grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Probes kept in flight at once by the asyncio sweep engine
+        ttk.Label(options_frame, text="Max In-Flight:").grid(row=2, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        self.inflight_var = tk.StringVar(value="5000")
+        ttk.Entry(options_frame, textvariable=self.inflight_var, width=10).grid(row=2, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Probe rate caps (0 = unlimited) protect routers with ICMP rate limits
+        ttk.Label(options_frame, text="Max Probes/s:").grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        self.pps_var = tk.StringVar(value="0")
+        ttk.Entry(options_frame, textvariable=self.pps_var, width=10).grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Per /24 Probes/s:").grid(row=3, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        self.subnet_pps_var = tk.StringVar(value="0")
+        ttk.Entry(options_frame, textvariable=self.subnet_pps_var, width=10).grid(row=3, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Adaptive timeouts: each IP waits its own smoothed RTT plus variance, within these bounds
+        self.adaptive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Adaptive Timeout", variable=self.adaptive_var).grid(row=2, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Min Timeout (ms):").grid(row=4, column=0, sticky=tk.W, pady=(5, 0))
+        self.min_timeout_var = tk.StringVar(value="20")
+        ttk.Entry(options_frame, textvariable=self.min_timeout_var, width=10).grid(row=4, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Max Timeout (ms):").grid(row=4, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        self.max_timeout_var = tk.StringVar(value="2000")
+        ttk.Entry(options_frame, textvariable=self.max_timeout_var, width=10).grid(row=4, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Adaptive polling: stable IPs back off toward Max Interval, unstable ones stay at Interval
+        self.adaptive_poll_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Adaptive Polling", variable=self.adaptive_poll_var).grid(row=3, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        # Skip IPs behind a down parent (spreadsheet parent column, or .1/.254 of their /24)
+        self.upstream_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Upstream Suppression", variable=self.upstream_var).grid(row=4, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        # Reachability only: stop at the first reply instead of sending every echo
+        self.first_reply_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="First Reply Wins", variable=self.first_reply_var).grid(row=5, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Max Interval (s):").grid(row=5, column=0, sticky=tk.W, pady=(5, 0))
+        self.max_interval_var = tk.StringVar(value="60")
+        ttk.Entry(options_frame, textvariable=self.max_interval_var, width=10).grid(row=5, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Probe type: ICMP echo, or TCP connect / UDP for hosts that filter ICMP
+        ttk.Label(options_frame, text="Probe:").grid(row=6, column=0, sticky=tk.W, pady=(5, 0))
+        self.probe_var = tk.StringVar(value="ICMP")
+        ttk.Combobox(options_frame, textvariable=self.probe_var, values=PROBE_TYPES,
+                     state="readonly", width=8).grid(row=6, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Port:").grid(row=6, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        self.port_var = tk.StringVar(value=str(DEFAULT_PORTS["TCP"]))
+        ttk.Entry(options_frame, textvariable=self.port_var, width=10).grid(row=6, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Worker processes of the Sharded engine, each with its own probe engine
+        ttk.Label(options_frame, text="Processes:").grid(row=7, column=0, sticky=tk.W, pady=(5, 0))
+        self.processes_var = tk.StringVar(value=str(os.cpu_count() or 1))
+        ttk.Entry(options_frame, textvariable=self.processes_var, width=10).grid(row=7, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Probe workers of the Distributed engine, as host:port separated by commas
+        ttk.Label(options_frame, text="Workers:").grid(row=7, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        self.workers_var = tk.StringVar(value=f"127.0.0.1:{DEFAULT_WORKER_PORT}")
+        ttk.Entry(options_frame, textvariable=self.workers_var, width=30).grid(row=7, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Shared token the workers were started with (ping_worker.py --token)
+        token_frame = ttk.Frame(options_frame)
+        token_frame.grid(row=7, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        ttk.Label(token_frame, text="Token:").pack(side=tk.LEFT)
+        self.token_var = tk.StringVar()
+        ttk.Entry(token_frame, textvariable=self.token_var, width=12, show="*").pack(side=tk.LEFT, padx=(5, 0))
+        
+        # CIDRs and ranges to sweep without listing every address, e.g. "10.0.0.0/16, 192.168.1.10-50"
+        ttk.Label(options_frame, text="Ranges:").grid(row=8, column=0, sticky=tk.W, pady=(5, 0))
+        self.ranges_var = tk.StringVar()
+        ttk.Entry(options_frame, textvariable=self.ranges_var).grid(row=8, column=1, columnspan=3, sticky=(tk.W, tk.E), padx=(5, 0), pady=(5, 0))
+        
+        # Hide IPs that do not answer; range addresses only ever get a row once they respond
+        self.responders_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Responders Only", variable=self.responders_only_var).grid(row=8, column=4, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=2, column=0, columnspan=3, pady=10)
@@ -93,34 +344,58 @@ class PingApp:
         results_frame = ttk.LabelFrame(main_frame, text="Results", padding="5")
         results_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         results_frame.columnconfigure(0, weight=1)
-        results_frame.rowconfigure(0, weight=1)
+        results_frame.rowconfigure(1, weight=1)
+        
+        # Filter bar; filters apply as they are typed and stay live while probing
+        filter_frame = ttk.Frame(results_frame)
+        filter_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        ttk.Label(filter_frame, text="Show:").pack(side=tk.LEFT)
+        self.filter_status_var = tk.StringVar(value="All")
+        ttk.Combobox(filter_frame, textvariable=self.filter_status_var, values=("All",) + STATUS_TEXT,
+                     state="readonly", width=14).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="Text:").pack(side=tk.LEFT)
+        self.filter_text_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_text_var, width=20).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="Network:").pack(side=tk.LEFT)
+        self.filter_network_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_network_var, width=18).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Button(filter_frame, text="Clear Filter", command=self.clear_filter).pack(side=tk.LEFT)
+        self.filter_count_var = tk.StringVar()
+        ttk.Label(filter_frame, textvariable=self.filter_count_var).pack(side=tk.LEFT, padx=(10, 0))
+        
+        for var in (self.filter_status_var, self.filter_text_var, self.filter_network_var):
+            var.trace_add("write", lambda *args: self.apply_filter())
         
         # Treeview with scrollbars
         tree_frame = ttk.Frame(results_frame)
-        tree_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        tree_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         tree_frame.columnconfigure(0, weight=1)
         tree_frame.rowconfigure(0, weight=1)
         
-        self.tree = ttk.Treeview(tree_frame, columns=("IP", "Description", "Status", "Response Time", "Last Checked"), show="headings")
+        # Columns with sorting capability; only the rows on screen are materialized
+        self.table = VirtualTable(tree_frame, self.store, {
+            "IP": ("IP Address", 150, lambda: self.sort_tree("IP")),
+            "Description": ("Description", 200, lambda: self.sort_tree("Description")),
+            "Status": ("Status", 100, lambda: self.sort_tree("Status")),
+            "Response Time": ("Response Time (ms)", 150, lambda: self.sort_tree("Response Time")),
+            "Last Checked": ("Last Checked", 200, lambda: self.sort_tree("Last Checked")),
+            "Trend": ("Trend", 160, lambda: self.sort_tree("Trend")),
+            "Loss %": ("Loss %", 70, lambda: self.sort_tree("Loss %")),
+            "Jitter": ("Jitter (ms)", 90, lambda: self.sort_tree("Jitter")),
+        })
+        self.table.status_suffix = self.dns_change
+        self.tree = self.table.tree
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.table.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
-        # Configure columns with sorting capability
-        self.tree.heading("IP", text="IP Address", command=lambda: self.sort_tree("IP", False))
-        self.tree.heading("Description", text="Description", command=lambda: self.sort_tree("Description", False))
-        self.tree.heading("Status", text="Status", command=lambda: self.sort_tree("Status", False))
-        self.tree.heading("Response Time", text="Response Time (ms)", command=lambda: self.sort_tree("Response Time", True))
-        self.tree.heading("Last Checked", text="Last Checked", command=lambda: self.sort_tree("Last Checked", True))
-        
-        self.tree.column("IP", width=150)
-        self.tree.column("Description", width=200)
-        self.tree.column("Status", width=100)
-        self.tree.column("Response Time", width=150)
-        self.tree.column("Last Checked", width=200)
-        
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        # Row colors
+        self.tree.tag_configure('online', background='lightgreen')
+        self.tree.tag_configure('offline', background='lightcoral')
+        self.tree.tag_configure('upstream', background='lightgray')
         
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
@@ -130,34 +405,11 @@ class PingApp:
         self.status_var = tk.StringVar(value="Ready")
         ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W).grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
         
-    def sort_tree(self, col, numeric):
-        """Sort tree contents by column"""
+    def sort_tree(self, col):
+        """Sort the results by column, on the stored values; the order stays live as results arrive"""
         # Get current sort direction for this column
         reverse = self.sort_reverse.get(col, False)
-        
-        items = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-
-        if numeric:
-            # Handle numeric sorting with special cases
-            def convert_to_float(text):
-                if text in ["-", "Timeout", "Not tested", ""] or text.startswith("Error:"):
-                    return -1 if reverse else float('inf')  # Put these at the end/beginning
-                elif text == "< 1":
-                    return 0.5
-                else:
-                    try:
-                        return float(text)
-                    except ValueError:
-                        return -1 if reverse else float('inf')
-            
-            items = [(convert_to_float(text), k) for text, k in items]
-        
-        # Sort items
-        items.sort(reverse=reverse)
-
-        # Rearrange items in sorted positions
-        for index, (val, k) in enumerate(items):
-            self.tree.move(k, '', index)
+        self.table.sort(self.store.sort_key(col, reverse), reverse)
 
         # Toggle sort direction for next time
         self.sort_reverse[col] = not reverse
@@ -174,11 +426,18 @@ class PingApp:
             self.tree.heading(col, text=f"Response Time (ms){direction}")
         elif col == "Last Checked":
             self.tree.heading(col, text=f"Last Checked{direction}")
+        elif col == "Trend":
+            self.tree.heading(col, text=f"Trend{direction}")
+        elif col == "Loss %":
+            self.tree.heading(col, text=f"Loss %{direction}")
+        elif col == "Jitter":
+            self.tree.heading(col, text=f"Jitter (ms){direction}")
 
     def browse_file(self):
         filename = filedialog.askopenfilename(
             title="Select Excel File",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Target lists", "*.xlsx *.xls *.csv *.txt"), ("Excel files", "*.xlsx *.xls"),
+                       ("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")]
         )
         if filename:
             self.file_var.set(filename)
@@ -186,48 +445,30 @@ class PingApp:
             
     def load_excel_file(self, filename):
         try:
-            # Read Excel file
-            df = pd.read_excel(filename)
-            
-            # Try to find IP column (common names)
-            ip_column = None
-            for col in df.columns:
-                if any(keyword in col.lower() for keyword in ['ip', 'address', 'host']):
-                    ip_column = col
-                    break
-            
-            if ip_column is None:
-                # If no IP column found, use first column
-                ip_column = df.columns[0]
+            # Read the IP column and the optional description, parent, port and worker columns
+            targets = read_targets(filename)
+            self.ip_addresses = targets.ips
+            self.descriptions = targets.descriptions
+            self.parents = targets.parents
+            self.ports = targets.ports
+            self.worker_cells = targets.workers
             
-            # Try to find description column
-            description_column = None
-            for col in df.columns:
-                if any(keyword in col.lower() for keyword in ['description', 'desc', 'name', 'device', 'hostname']):
-                    description_column = col
-                    break
-                
-            # Extract IP addresses and descriptions
-            self.ip_addresses = df[ip_column].dropna().tolist()
-            
-            if description_column is not None:
-                self.descriptions = df[description_column].fillna("-").tolist()
-                # Ensure descriptions list matches IP addresses length
-                while len(self.descriptions) < len(self.ip_addresses):
-                    self.descriptions.append("-")
-            else:
-                # If no description column, fill with dashes
-                self.descriptions = ["-"] * len(self.ip_addresses)
+            # CIDR/range cells are swept lazily instead of getting a row each
+            self.file_ranges = targets.ranges
             
             # Clear previous results
             self.clear_results()
             
-            # Add IPs to treeview with descriptions
-            for i, ip in enumerate(self.ip_addresses):
-                description = self.descriptions[i] if i < len(self.descriptions) else "-"
-                self.tree.insert("", tk.END, values=(str(ip), str(description), "Not tested", "-", "-"))
+            # Add IPs to the results with descriptions
+            self.store.load(self.ip_addresses, self.descriptions)
+            self.filters.sync()
+            self.apply_filter()
+            self.table.reset()
                 
-            self.status_var.set(f"Loaded {len(self.ip_addresses)} IP addresses from {os.path.basename(filename)}")
+            loaded = f"Loaded {len(self.ip_addresses)} IP addresses"
+            if self.file_ranges:
+                loaded += f" and {len(self.file_ranges)} ranges ({IPCalculator.count_hosts(self.file_ranges)} addresses)"
+            self.status_var.set(f"{loaded} from {os.path.basename(filename)}")
             
             # Set infinite ping as default when loading file
             self.toggle_infinite()
@@ -235,137 +476,404 @@ class PingApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load Excel file:\n{str(e)}")
             
-    def ping_ip(self, ip_address, timeout, count):
-        """Ping a single IP address"""
+    def ping_ip(self, ip_address, timeout, count, on_reply=None):
+        """Ping a single IP address
+
+        on_reply(index, rtt) is called as each echo completes (rtt in ms, None when lost).
+        """
+        prober = get_prober() if self.engine != "System Ping" else None
+        if prober is not None:
+            return self.socket_ping_ip(prober, ip_address, timeout, count, on_reply)
+        if self.timeouts is not None:
+            timeout = max(1, round(self.timeouts.timeout(str(ip_address)) * 1000))
+        if on_reply is not None or self.first_reply:
+            return self.streaming_subprocess_ping_ip(ip_address, timeout, count, on_reply)
+        return self.subprocess_ping_ip(ip_address, timeout, count)
+    
+    def socket_ping_ip(self, prober, ip_address, timeout, count, on_reply=None):
+        """Ping a single IP address over the shared ICMP socket"""
         try:
-            # Use Windows ping command with proper encoding
-            cmd = f"ping -n {count} -w {timeout} {ip_address}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30, encoding='cp866')
+            rtts = prober.ping(ip_address, timeout / 1000, count, self.timeouts, on_reply, self.first_reply)
+            times = [rtt for rtt in rtts if rtt is not None]
+            if times:
+                return True, format_response_time(times)
+            return False, "Timeout"
+        except OSError as e:
+            return False, f"Error: {str(e)}"
+    
+    def subprocess_ping_ip(self, ip_address, timeout, count):
+        """Ping a single IP address with the system ping command"""
+        try:
+            # The platform's ping flags, decoded with the console encoding it prints in
+            address = shared_resolver.address(ip_address)
+            cmd = ping_command(address, count, timeout)
+            shared_limiter.acquire(address, count)
+            result = subprocess.run(cmd, capture_output=True, timeout=30,
+                                    encoding='cp866' if IS_WINDOWS else 'utf-8', errors='replace',
+                                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
             
-            if result.returncode == 0:
-                # Parse response time from output (supports English and Russian)
-                output_lines = result.stdout.split('\n')
-                times = []
-                for line in output_lines:
-                    # Check for English format (time=XXXms)
-                    if 'time=' in line.lower():
-                        try:
-                            time_part = line.split('time=')[1].split('ms')[0]
-                            if '<' in time_part:
-                                times.append(1)  # Less than 1ms
-                            else:
-                                times.append(int(time_part))
-                        except:
-                            pass
-                    # Check for Russian format (время=XXXмс)
-                    elif 'время=' in line.lower():
-                        try:
-                            time_part = line.split('время=')[1].split('мс')[0]
-                            if '<' in time_part:
-                                times.append(1)  # Less than 1ms
-                            else:
-                                times.append(int(time_part))
-                        except:
-                            pass
-                
-                if times:
-                    avg_time = sum(times) / len(times)
-                    return True, f"{avg_time:.1f}"
-                else:
-                    return True, "< 1"
-            else:
-                return False, "Timeout"
+            # One shared parser for every locale and ping flavour
+            parsed = parse_ping_output(result.stdout, count)
+            times = parsed['times']
+            if self.timeouts is not None:
+                lost = parsed['packets_sent'] - parsed['packets_received']
+                self.timeouts.observe_all(str(ip_address), times + [None] * lost)
+            if times:
+                return True, format_response_time(times)
+            return False, "Timeout"
                 
         except subprocess.TimeoutExpired:
             return False, "Timeout"
         except Exception as e:
             return False, f"Error: {str(e)}"
             
+    def streaming_subprocess_ping_ip(self, ip_address, timeout, count, on_reply=None):
+        """Ping with the system ping command, handling each reply line as it is printed"""
+        try:
+            address = shared_resolver.address(ip_address)
+            shared_limiter.acquire(address, count)
+            times = []
+            replies = 0
+            # Closing the output early ends the ping process, freeing the worker at once
+            output = iter_ping_output(ping_command(address, count, timeout))
+            try:
+                for line in output:
+                    is_event, rtt = parse_reply_line(line)
+                    if not is_event:
+                        continue
+                    if self.timeouts is not None:
+                        self.timeouts.observe(str(ip_address), rtt)
+                    if rtt is not None:
+                        times.append(rtt)
+                    if on_reply is not None:
+                        on_reply(replies, rtt)
+                    replies += 1
+                    if self.first_reply and rtt is not None:
+                        break
+            finally:
+                output.close()
+            
+            if times:
+                return True, format_response_time(times)
+            return False, "Timeout"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+    
     def ping_single_ip(self, ip, item_id, timeout, count):
         """Ping a single IP and return result"""
-        success, response_time = self.ping_ip(ip, timeout, count)
+        on_reply = None
+        if count > 1 and item_id is not None:  # Range addresses have no row to preview on
+            times = []
+            
+            def on_reply(index, rtt):
+                # Show each reply on the row before the IP finishes
+                if rtt is not None:
+                    times.append(rtt)
+                response_time = format_response_time(times) if times else "Timeout"
+                status = "Online" if times else "Offline"
+                timestamp = time.time()
+                self.store.update(item_id, status, f"{response_time} ({index + 1}/{count})", timestamp, sample=False)
+        
+        success, response_time = self.ping_ip(ip, timeout, count, on_reply)
         status = "Online" if success else "Offline"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.time()
         return (item_id, ip, status, response_time, timestamp, success)
     
+    def engine_ping_round(self, engine, ping_tasks, on_result, should_stop):
+        """Ping a round of IPs with a round engine instead of the thread pool"""
+        def on_probe(item_id, ip, rtts, error):
+            times = [rtt for rtt in rtts if rtt is not None]
+            if error:
+                success, response_time = False, f"Error: {error}"
+            elif times:
+                success, response_time = True, format_response_time(times)
+            else:
+                success, response_time = False, "Timeout"
+            status = "Online" if success else "Offline"
+            timestamp = time.time()
+            on_result((item_id, ip, status, response_time, timestamp, success), time.perf_counter())
+        
+        engine.run(((item, ip) for ip, item in ping_tasks), on_probe, should_stop)
+    
+    def draw_frame(self):
+        """Apply the buffered results, status and calls; runs FRAME_RATE times a second"""
+        try:
+            status, calls = self.updates.drain()
+            changed = self.store.take_changes()
+            self.filters.sync(changed)
+            self.table.changed(changed)
+            if changed or self.table.stale or len(self.store) > self.table.rows:
+                self.table.refresh()
+                self.show_filter_count()
+            if status is not None:
+                self.status_var.set(status)
+            for call in calls:
+                call()
+        finally:
+            self.root.after(1000 // FRAME_RATE, self.draw_frame)
+    
+    def apply_filter(self):
+        """Show the rows matching the filter bar, and only responders if the session asks for that"""
+        status = self.filter_status_var.get()
+        statuses = {STATUS_CODES[status]} if status in STATUS_CODES else None
+        if self.responders_only:
+            statuses = {ONLINE} & statuses if statuses is not None else {ONLINE}
+        network = None
+        spec = self.filter_network_var.get().strip()
+        if spec:
+            try:
+                network = parse_network(spec)
+            except ValueError:
+                self.filter_count_var.set("Invalid network")
+                return  # Keep the last filter while the network is being typed
+        row_filter = RowFilter(self.filters, statuses, self.filter_text_var.get(), network)
+        if row_filter.active:
+            self.table.set_filter(row_filter, row_filter.candidates)
+        else:
+            self.table.set_filter(None)
+        self.table.refresh()
+        self.show_filter_count()
+    
+    def clear_filter(self):
+        self.filter_status_var.set("All")
+        self.filter_text_var.set("")
+        self.filter_network_var.set("")
+    
+    def show_filter_count(self):
+        if self.table.view.accept is not None:
+            self.filter_count_var.set(f"{len(self.table.view)} of {len(self.store)} shown")
+        else:
+            self.filter_count_var.set("")
+    
+    def dns_change(self, ip):
+        """Status suffix of a hostname whose address changed"""
+        change = shared_resolver.changed(ip)
+        return f"(DNS {change[0]} → {change[1]})" if change is not None else None
+    
+    def resolve_hostnames(self):
+        """Resolve every hostname target once, in parallel, before the first round"""
+        hosts = {str(ip).strip() for ip in self.ip_addresses} - {""}
+        names = [host for host in hosts if not is_ipv4_literal(host)]
+        if not names:
+            return
+        self.updates.status(f"Resolving {len(names)} hostnames...")
+        addresses = shared_resolver.resolve_all(names)
+        failed = sum(1 for address in addresses.values() if address is None)
+        if failed:
+            self.updates.status(f"{failed} of {len(names)} hostnames did not resolve")
+        # Renew entries ahead of expiry so probes never wait for DNS
+        shared_resolver.start()
+    
+    def address_changed(self, host, old, new):
+        """Flag a hostname whose address changed; called from resolver threads"""
+        self.updates.status(f"{host} moved from {old} to {new}")
+    
+    def ping_targets(self):
+        """(ip, row) of every row to probe, including rows hidden by Responders Only"""
+        return self.store.targets()
+    
+    def range_ping_round(self, round_engine, pool, timeout, count, should_stop):
+        """Sweep the CIDR/range targets lazily, a chunk at a time; responders get a row
+        
+        Memory follows the chunk in flight plus the responders, not the address space.
+        Addresses that already have a row are probed with the listed IPs instead.
+        """
+        if not self.ranges:
+            return
+        progress = RoundProgress("Range sweep", IPCalculator.count_hosts(self.ranges) - (len(self.store) - len(self.ip_addresses)))
+        status = lambda: f"{progress.summary()} | {self.range_responders} responders | {shared_limiter.pacing()}"
+        publish = lambda result, completed_at: self.schedule_range_update(result, progress, completed_at, status)
+        chunk_size = max(RANGE_CHUNK, self.max_in_flight)
+        hosts = (ip for ip in IPCalculator.iter_hosts(self.ranges) if self.store.find(ip) is None)
+        while not should_stop():
+            chunk = [(ip, None) for ip in itertools.islice(hosts, chunk_size)]
+            if not chunk:
+                break
+            if round_engine is not None:
+                self.engine_ping_round(round_engine, chunk, publish, should_stop)
+            else:
+                tasks = ((ip, item, timeout, count) for ip, item in chunk)
+                for result, completed_at in pool.run_round(self.ping_single_ip, tasks, should_stop):
+                    publish(result, completed_at)
+    
+    def schedule_range_update(self, result, progress, completed_at, status):
+        """Store a range result; a first-time responder gets its row, silent addresses none"""
+        item_id, ip, status_text, response_time, timestamp, success = result
+        if success:
+            self.range_responders += 1
+            self.store.update(self.store.add(ip), status_text, response_time, timestamp)
+        self.updates.record(progress, completed_at, status)
+    
+    def schedule_row_update(self, result, progress, completed_at):
+        """Store a result on its row; the row and progress are drawn on the next frame"""
+        item_id, ip, status, response_time, timestamp, success = result
+        # Parent state decides which IPs are suppressed next
+        if self.topology is not None and status != UPSTREAM_STATUS:
+            self.topology.record(str(ip), success)
+        self.store.update(item_id, status, response_time, timestamp)
+        self.updates.record(progress, completed_at, lambda: f"{progress.summary()} | {shared_limiter.pacing()}")
+    
+    def upstream_result(self, ip, item_id):
+        """Result row for an IP not probed because its parent is down"""
+        timestamp = time.time()
+        return (item_id, ip, UPSTREAM_STATUS, "-", timestamp, False)
+    
+    def suppress_upstream(self, ping_tasks, publish):
+        """Report IPs behind a down parent without probing them and return the IPs left to probe"""
+        if self.topology is None:
+            return ping_tasks
+        remaining = []
+        for ip, item in ping_tasks:
+            if self.topology.suppress(str(ip)):
+                publish(self.upstream_result(ip, item), time.perf_counter())
+            else:
+                remaining.append((ip, item))
+        return remaining
+    
+    def create_round_engine(self, timeout, count):
+        """Create the selected round engine, or None to use the thread pool"""
+        assignments = {str(ip).strip(): str(worker).strip()
+                       for ip, worker in zip(self.ip_addresses, self.worker_cells) if str(worker).strip()}
+        return create_round_engine(self.engine, self.probe_type, timeout / 1000, count, port=self.port,
+                                   ports=self.port_map, max_in_flight=self.max_in_flight,
+                                   processes=self.processes, workers=self.workers, assignments=assignments,
+                                   timeouts=self.timeouts, first_reply=self.first_reply, token=self.token)
+    
     def ping_worker(self):
         """Worker thread for pinging IPs in parallel"""
-        timeout = int(self.timeout_var.get())
-        count = int(self.count_var.get())
-        max_workers = min(int(self.threads_var.get()), len(self.ip_addresses))
-        
-        # Prepare list of IPs and their tree items
-        ping_tasks = []
-        for item in self.tree.get_children():
-            if not self.is_pinging:
-                break
-            ip = self.tree.item(item)['values'][0]
-            ping_tasks.append((ip, item))
-        
-        self.root.after(0, lambda: self.status_var.set(f"Pinging {len(ping_tasks)} IPs in parallel..."))
-        
-        # Use ThreadPoolExecutor for parallel pinging
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all ping tasks
-            future_to_item = {}
-            for ip, item in ping_tasks:
-                if not self.is_pinging:
-                    break
-                future = executor.submit(self.ping_single_ip, ip, item, timeout, count)
-                future_to_item[future] = item
-            
-            # Process completed pings
-            completed = 0
-            for future in future_to_item:
-                if not self.is_pinging:
-                    break
-                try:
-                    result = future.result()
-                    item_id, ip, status, response_time, timestamp, success = result
-                    completed += 1
-                    
-                    # Update treeview in main thread
-                    def update_tree(item_id=item_id, ip=ip, status=status, response_time=response_time, timestamp=timestamp, success=success, completed=completed, total=len(ping_tasks)):
-                        # Get current description from treeview
-                        current_values = self.tree.item(item_id)['values']
-                        description = current_values[1] if len(current_values) > 1 else "-"
-                        self.tree.item(item_id, values=(ip, description, status, response_time, timestamp))
-                        # Color coding
-                        if success:
-                            self.tree.item(item_id, tags=('online',))
-                        else:
-                            self.tree.item(item_id, tags=('offline',))
-                        # Update progress
-                        self.status_var.set(f"Completed {completed}/{total} pings")
-                            
-                    self.root.after(0, update_tree)
-                    
-                except Exception as e:
-                    print(f"Error pinging: {e}")
+        timeout = self.timeout_ms
+        count = self.count
+        max_workers = min(self.threads, len(self.ip_addresses) + (RANGE_CHUNK if self.ranges else 0))
+        round_engine = self.create_round_engine(timeout, count)
+        
+        # Prepare list of IPs and their rows
+        ping_tasks = self.ping_targets()
+        
+        self.updates.status(f"Pinging {len(ping_tasks)} IPs in parallel...")
+        
+        progress = RoundProgress("Ping", len(ping_tasks))
+        publish = lambda result, completed_at: self.schedule_row_update(result, progress, completed_at)
+        should_stop = lambda: not self.is_pinging
+        
+        if round_engine is not None:
+            try:
+                self.engine_ping_round(round_engine, ping_tasks, publish, should_stop)
+                self.range_ping_round(round_engine, None, timeout, count, should_stop)
+            finally:
+                round_engine.close()
+        else:
+            # Results come back in completion order, so a slow IP does not hold back the rest
+            pool = ProbePool(max_workers)
+            try:
+                tasks = ((ip, item, timeout, count) for ip, item in ping_tasks)
+                for result, completed_at in pool.run_round(self.ping_single_ip, tasks, should_stop):
+                    publish(result, completed_at)
+                self.range_ping_round(None, pool, timeout, count, should_stop)
+            finally:
+                pool.shutdown()
             
         # Ping completed
         if self.is_pinging:
-            self.root.after(0, self.ping_completed)
+            self.updates.call(self.ping_completed)
         
     def start_ping(self):
-        if not self.ip_addresses:
-            messagebox.showwarning("Warning", "Please load an Excel file first!")
+        typed_ranges = [spec.strip() for spec in self.ranges_var.get().split(',') if spec.strip()]
+        for spec in typed_ranges:
+            try:
+                IPCalculator.parse_range(spec)
+            except ValueError as e:
+                messagebox.showwarning("Warning", f"Invalid range {spec}: {e}")
+                return
+        if not self.ip_addresses and not self.file_ranges and not typed_ranges:
+            messagebox.showwarning("Warning", "Please load a target file or enter ranges first!")
             return
             
+        if self.engine_var.get() == "Distributed" and not self.workers_var.get().strip() and not any(
+                str(worker).strip() for worker in self.worker_cells):
+            messagebox.showwarning("Warning", "Enter at least one probe worker (host:port) for the Distributed engine!")
+            return
+        
+        # Worker threads read these snapshots, never the Tk variables
+        try:
+            self.timeout_ms = int(self.timeout_var.get())
+            self.count = int(self.count_var.get())
+            self.interval = int(self.interval_var.get())
+            self.threads = int(self.threads_var.get())
+            self.max_in_flight = int(self.inflight_var.get())
+            self.processes = int(self.processes_var.get() or 0) or None
+            self.max_interval = float(self.max_interval_var.get())
+            pps = float(self.pps_var.get() or 0)
+            subnet_pps = float(self.subnet_pps_var.get() or 0)
+            default_port = int(self.port_var.get() or 0)
+            min_timeout_ms = int(self.min_timeout_var.get())
+            max_timeout_ms = int(self.max_timeout_var.get())
+        except ValueError as e:
+            messagebox.showwarning("Warning", f"Invalid option: {e}")
+            return
+        self.workers = [worker.strip() for worker in self.workers_var.get().split(',') if worker.strip()]
+        self.token = self.token_var.get().strip() or None
+        self.adaptive_poll = self.adaptive_poll_var.get()
+            
         self.is_pinging = True
+        self.engine = self.engine_var.get()
+        self.ranges = self.file_ranges + typed_ranges
+        self.range_responders = 0
+        self.responders_only = self.responders_only_var.get()
+        self.apply_filter()
+        configure_rate_limit(pps, subnet_pps)
+        self.first_reply = self.first_reply_var.get()
+        self.probe_type = self.probe_var.get()
+        self.port = default_port or DEFAULT_PORTS.get(self.probe_type)
+        self.port_map = {}
+        for ip, port in zip(self.ip_addresses, self.ports):
+            try:
+                self.port_map[str(ip).strip()] = int(float(port))
+            except (TypeError, ValueError):
+                continue  # Blank cell: use the Port option
+        self.topology = None
+        if self.upstream_var.get():
+            hosts = [str(ip).strip() for ip in self.ip_addresses]
+            if any(str(parent).strip() for parent in self.parents):
+                self.topology = Topology.from_column(hosts, self.parents)
+            else:
+                self.topology = Topology.from_subnets(hosts)
+        self.timeouts = None
+        if self.adaptive_var.get():
+            self.timeouts = AdaptiveTimeouts(self.timeout_ms / 1000, floor=min_timeout_ms / 1000,
+                                             ceiling=max_timeout_ms / 1000)
+        if self.probe_type == "ICMP" and self.engine in ("ICMP Socket", "Async Sweep", "Multiplex", "Sharded") and get_prober() is None:
+            messagebox.showwarning("Warning", "ICMP sockets are not permitted for this user, falling back to system ping.")
         self.start_button.config(state="disabled")
         self.stop_button.config(state="normal")
         
-        # Configure treeview tags for coloring
-        self.tree.tag_configure('online', background='lightgreen')
-        self.tree.tag_configure('offline', background='lightcoral')
-        
-        # Start ping in separate thread
+        # Start ping in separate thread, once every hostname has an address
         if self.infinite_var.get():
             self.infinite_ping = True
-            threading.Thread(target=self.infinite_ping_worker, daemon=True).start()
+            # Without ICMP sockets, Auto keeps one ping process per IP for the session
+            streaming = self.engine == "Streaming" or (self.engine == "Auto" and get_prober() is None)
+            if self.probe_type != "ICMP" or self.engine == "Distributed" or self.ranges:
+                worker = self.infinite_ping_worker
+            elif streaming:
+                worker = self.streaming_ping_worker
+            elif (self.spread_var.get() or self.adaptive_poll_var.get()) and self.engine not in ("Async Sweep", "Multiplex", "Sharded"):
+                worker = self.scheduled_ping_worker
+            else:
+                worker = self.infinite_ping_worker
+            # Spreading and adaptive polling need the per-host scheduler of scheduled_ping_worker
+            ignored = [name for name, var in (("Spread Probes", self.spread_var), ("Adaptive Polling", self.adaptive_poll_var))
+                       if var.get()]
+            if ignored and worker != self.scheduled_ping_worker:
+                messagebox.showwarning("Warning", f"{' and '.join(ignored)} cannot be used with this engine, probe "
+                                                  "type or with ranges; every IP is pinged each round instead.")
         else:
-            threading.Thread(target=self.ping_worker, daemon=True).start()
+            worker = self.ping_worker
+        threading.Thread(target=self.run_worker, args=(worker,), daemon=True).start()
+    
+    def run_worker(self, worker):
+        """Worker thread entry: resolve hostnames, then run the selected worker"""
+        if self.engine != "Distributed":  # Remote workers resolve names from their own site
+            self.resolve_hostnames()
+        worker()
         
     def stop_ping(self):
         self.is_pinging = False
@@ -377,11 +885,14 @@ class PingApp:
         self.start_button.config(state="normal")
         self.stop_button.config(state="disabled")
         self.status_var.set("Ping completed")
+        shared_resolver.stop()
         
     def clear_results(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.ping_results = []
+        self.updates.clear()
+        self.store.clear()
+        self.filters.reset()
+        self.apply_filter()
+        self.table.reset()
         self.status_var.set("Results cleared")
         
     def toggle_infinite(self):
@@ -395,80 +906,137 @@ class PingApp:
     
     def infinite_ping_worker(self):
         """Worker thread for infinite pinging with parallel execution"""
-        timeout = int(self.timeout_var.get())
+        timeout = self.timeout_ms
         count = 1  # Always use 1 ping for infinite mode
-        interval = int(self.interval_var.get())
-        max_workers = min(int(self.threads_var.get()), len(self.ip_addresses))
+        interval = self.interval
+        max_workers = min(self.threads, len(self.ip_addresses) + (RANGE_CHUNK if self.ranges else 0))
+        round_engine = self.create_round_engine(timeout, count)
+        pool = ProbePool(max_workers) if round_engine is None else None
+        should_stop = lambda: not self.is_pinging or not self.infinite_ping
         
         ping_round = 1
         
         while self.is_pinging and self.infinite_ping:
-            self.root.after(0, lambda r=ping_round: self.status_var.set(f"Infinite ping - Round {r} (parallel)"))
+            self.updates.status(f"Infinite ping - Round {ping_round} (parallel)")
             
-            # Prepare list of IPs and their tree items
-            ping_tasks = []
-            for item in self.tree.get_children():
-                if not self.is_pinging or not self.infinite_ping:
-                    break
-                ip = self.tree.item(item)['values'][0]
-                ping_tasks.append((ip, item))
+            # Prepare list of IPs and their rows
+            ping_tasks = self.ping_targets()
             
-            if not ping_tasks:
+            if not ping_tasks and not self.ranges:
                 break
-                
-            # Use ThreadPoolExecutor for parallel pinging
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all ping tasks
-                future_to_item = {}
-                for ip, item in ping_tasks:
-                    if not self.is_pinging or not self.infinite_ping:
-                        break
-                    future = executor.submit(self.ping_single_ip, ip, item, timeout, count)
-                    future_to_item[future] = item
-                
-                # Process completed pings
-                completed = 0
-                for future in future_to_item:
-                    if not self.is_pinging or not self.infinite_ping:
-                        break
-                    try:
-                        result = future.result()
-                        item_id, ip, status, response_time, timestamp, success = result
-                        completed += 1
-                        
-                        # Update treeview in main thread
-                        def update_tree(item_id=item_id, ip=ip, status=status, response_time=response_time, timestamp=timestamp, success=success, completed=completed, total=len(ping_tasks), round_num=ping_round):
-                            # Get current description from treeview
-                            current_values = self.tree.item(item_id)['values']
-                            description = current_values[1] if len(current_values) > 1 else "-"
-                            self.tree.item(item_id, values=(ip, description, status, response_time, timestamp))
-                            # Color coding
-                            if success:
-                                self.tree.item(item_id, tags=('online',))
-                            else:
-                                self.tree.item(item_id, tags=('offline',))
-                            # Update progress
-                            self.status_var.set(f"Round {round_num}: {completed}/{total} completed")
-                                
-                        self.root.after(0, update_tree)
-                        
-                    except Exception as e:
-                        print(f"Error pinging: {e}")
+            
+            progress = RoundProgress(f"Round {ping_round}", len(ping_tasks))
+            publish = lambda result, completed_at, progress=progress: self.schedule_row_update(result, progress, completed_at)
+            
+            # IPs behind a down parent are reported without spending a timeout on them
+            probe_tasks = self.suppress_upstream(ping_tasks, publish)
+            if self.topology is not None:
+                progress.label = f"Round {ping_round} ({len(ping_tasks) - len(probe_tasks)} probes saved upstream)"
+            
+            if round_engine is not None:
+                self.engine_ping_round(round_engine, probe_tasks, publish, should_stop)
+            else:
+                # The session's pool is reused every round; results arrive in completion order
+                tasks = ((ip, item, timeout, count) for ip, item in probe_tasks)
+                for result, completed_at in pool.run_round(self.ping_single_ip, tasks, should_stop):
+                    publish(result, completed_at)
+            
+            # New responders in the ranges join the listed IPs from the next round on
+            self.range_ping_round(round_engine, pool, timeout, count, should_stop)
             
             # Wait for the specified interval before next round
             if self.is_pinging and self.infinite_ping:
                 for remaining in range(interval, 0, -1):
                     if not self.is_pinging or not self.infinite_ping:
                         break
-                    self.root.after(0, lambda r=remaining: self.status_var.set(f"Next round in {r} seconds..."))
+                    self.updates.status(f"Next round in {remaining} seconds...")
                     time.sleep(1)
                 ping_round += 1
         
+        if round_engine is not None:
+            round_engine.close()
+        if pool is not None:
+            pool.shutdown()
+        
+        # Ping completed or stopped
+        self.updates.call(self.ping_completed)
+    
+    def scheduled_ping_worker(self):
+        """Worker thread for infinite pinging with each IP at its own phase in the interval"""
+        timeout = self.timeout_ms
+        interval = self.interval
+        max_workers = min(self.threads, len(self.ip_addresses))
+        should_stop = lambda: not self.is_pinging or not self.infinite_ping
+        
+        # Prepare list of IPs and their rows
+        ping_tasks = self.ping_targets()
+        
+        adaptive = self.adaptive_poll
+        if adaptive:
+            scheduler = AdaptivePollScheduler(interval, self.max_interval)
+        else:
+            scheduler = ProbeScheduler(interval)
+        scheduler.spread(ping_tasks)
+        pool = ProbePool(max_workers)
+        in_flight = set()  # An IP is not probed again until its previous probe finished
+        progress = RoundProgress(f"Scheduled {len(ping_tasks)} IPs at {scheduler.rate:.0f} probes/s")
+        rate_updated = time.monotonic()
+        
+        try:
+            while not should_stop():
+                for ip, item in scheduler.pop_due():
+                    if self.topology is not None and self.topology.suppress(str(ip)):
+                        self.schedule_row_update(self.upstream_result(ip, item), progress, time.perf_counter())
+                        continue
+                    if item not in in_flight:
+                        in_flight.add(item)
+                        pool.submit(self.ping_single_ip, ip, item, timeout, 1)
+                
+                # Display results until the next slot of the timing wheel is due
+                for result, completed_at in pool.collect(scheduler.time_until_next()):
+                    item_id, ip, status, response_time, timestamp, success = result
+                    in_flight.discard(item_id)
+                    if adaptive:
+                        rtt = 0.5 if response_time == "< 1" else float(response_time) if success else None
+                        scheduler.record((ip, item_id), success, rtt)
+                    self.schedule_row_update(result, progress, completed_at)
+                
+                if (adaptive or self.topology is not None) and time.monotonic() - rate_updated >= 1:
+                    rate_updated = time.monotonic()
+                    label = f"Scheduled {len(ping_tasks)} IPs at {scheduler.rate:.0f} probes/s"
+                    if adaptive:
+                        label = (f"Adaptive polling {len(ping_tasks)} IPs at {scheduler.rate:.1f} probes/s "
+                                 f"(fixed interval {scheduler.fixed_rate:.1f})")
+                    if self.topology is not None:
+                        label += f" [{self.topology.saved} probes saved upstream]"
+                    progress.label = label
+        finally:
+            pool.shutdown()
+        
+        # Ping completed or stopped
+        self.updates.call(self.ping_completed)
+    
+    def streaming_ping_worker(self):
+        """Worker thread for infinite pinging with one long-lived ping process per IP"""
+        timeout = self.timeout_ms
+        interval = self.interval
+        should_stop = lambda: not self.is_pinging or not self.infinite_ping
+        
+        # Prepare list of IPs and their rows
+        ping_tasks = self.ping_targets()
+        
+        progress = RoundProgress(f"Streaming {len(ping_tasks)} IPs")
+        publish = lambda result, completed_at: self.schedule_row_update(result, progress, completed_at)
+        
+        self.updates.status(f"Starting {len(ping_tasks)} ping processes...")
+        pinger = StreamingPinger(interval=interval, timeout=timeout / 1000)
+        self.engine_ping_round(pinger, ping_tasks, publish, should_stop)
+        
         # Ping completed or stopped
-        self.root.after(0, self.ping_completed)
+        self.updates.call(self.ping_completed)
     
     def export_results(self):
-        if not self.tree.get_children():
+        if not len(self.table.view):
             messagebox.showwarning("Warning", "No results to export!")
             return
             
@@ -480,24 +1048,28 @@ class PingApp:
         
         if filename:
             try:
-                # Collect data from treeview
+                # Collect the rows shown, in display order
                 data = []
-                for item in self.tree.get_children():
-                    values = self.tree.item(item)['values']
+                for index in self.table.view:
+                    values = self.store.row(index, self.dns_change)
                     data.append({
                         'IP Address': values[0],
                         'Description': values[1],
                         'Status': values[2],
                         'Response Time (ms)': values[3],
-                        'Last Checked': values[4]
+                        'Last Checked': values[4],
+                        'Loss %': values[6],
+                        'Jitter (ms)': values[7]
                     })
                 
-                df = pd.DataFrame(data)
-                
                 if filename.endswith('.csv'):
-                    df.to_csv(filename, index=False)
+                    with open(filename, 'w', newline='', encoding='utf-8') as f:
+                        writer = csv.DictWriter(f, fieldnames=list(data[0]))
+                        writer.writeheader()
+                        writer.writerows(data)
                 else:
-                    df.to_excel(filename, index=False)
+                    import pandas as pd  # Only Excel export needs it, so the window opens without it
+                    pd.DataFrame(data).to_excel(filename, index=False)
                     
                 messagebox.showinfo("Success", f"Results exported to {filename}")
                 
@@ -510,4 +1082,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Sharded engine workers re-enter here in the frozen Windows executable
+    multiprocessing.freeze_support()
     main()
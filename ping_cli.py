@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Headless IP Ping Checker
+
+Pings the targets of an Excel/CSV inventory (and any ranges) with the same
+engines as the IP Ping Checker window and writes one JSON line per result,
+to stdout or a file. With --infinite it keeps going round after round until
+interrupted (Ctrl+C, SIGTERM) and then shuts down cleanly. No tkinter is
+imported, so it runs on servers with no display.
+
+Usage: python ping_cli.py targets.xlsx [--infinite] [--output results.jsonl] [options]
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.engines import ENGINES
+from core.headless import HeadlessChecker
+from core.probes import PROBE_TYPES
+from core.rate_limit import configure_rate_limit
+from core.rtt import AdaptiveTimeouts
+from core.targets import TargetList, read_targets
+from modules.ip_calculator import IPCalculator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ping an IP inventory without a GUI, writing JSON lines")
+    parser.add_argument('file', nargs='?', help="Excel or CSV inventory (IP column plus optional description, "
+                                                "parent, port and worker columns)")
+    parser.add_argument('--ranges', default="", help="comma-separated CIDRs/ranges to sweep as well")
+    parser.add_argument('--output', '-o', help="append results to this file instead of stdout")
+    parser.add_argument('--infinite', action='store_true', help="ping round after round until stopped")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between rounds (default 1)")
+    parser.add_argument('--timeout', type=int, default=100, help="reply timeout in ms (default 100)")
+    parser.add_argument('--count', type=int, default=4, help="echoes per IP; 1 in infinite mode (default 4)")
+    parser.add_argument('--threads', type=int, default=50, help="thread-pool size (default 50)")
+    parser.add_argument('--max-in-flight', type=int, default=5000, help="probes in flight at once (default 5000)")
+    parser.add_argument('--engine', choices=ENGINES, default="Auto", help="probe engine (default Auto)")
+    parser.add_argument('--probe', choices=PROBE_TYPES, default="ICMP", help="probe type (default ICMP)")
+    parser.add_argument('--port', type=int, help="port for TCP/UDP probes")
+    parser.add_argument('--processes', type=int, help="processes for the Sharded engine (default: one per core)")
+    parser.add_argument('--workers', default="", help="comma-separated host:port probe workers for Distributed")
+    parser.add_argument('--token', default=os.environ.get('PING_WORKER_TOKEN'),
+                        help="shared token of the probe workers (default: $PING_WORKER_TOKEN)")
+    parser.add_argument('--first-reply', action='store_true', help="stop pinging an IP at its first reply")
+    parser.add_argument('--upstream', action='store_true',
+                        help="suppress IPs behind a down subnet gateway when the inventory has no parent column "
+                             "(a parent column always suppresses)")
+    parser.add_argument('--adaptive', action='store_true', help="adapt each IP's timeout to its measured RTT")
+    parser.add_argument('--pps', type=float, default=0, help="global probe rate limit (0 = unlimited)")
+    parser.add_argument('--subnet-pps', type=float, default=0, help="per-/24 probe rate limit (0 = unlimited)")
+    args = parser.parse_args()
+
+    ranges = [spec.strip() for spec in args.ranges.split(',') if spec.strip()]
+    for spec in ranges:
+        try:
+            IPCalculator.parse_range(spec)
+        except ValueError as e:
+            parser.error(f"invalid range {spec}: {e}")
+    if args.file:
+        try:
+            targets = read_targets(args.file)
+        except Exception as e:
+            print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif ranges:
+        targets = TargetList()
+    else:
+        parser.error("give an inventory file, --ranges, or both")
+
+    configure_rate_limit(args.pps, args.subnet_pps)
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    checker = HeadlessChecker(
+        targets, output, engine=args.engine, probe=args.probe, port=args.port, timeout_ms=args.timeout,
+        count=args.count, interval=args.interval, threads=args.threads, max_in_flight=args.max_in_flight,
+        processes=args.processes, workers=[w.strip() for w in args.workers.split(',') if w.strip()],
+        first_reply=args.first_reply, ranges=ranges, token=args.token or None, upstream=args.upstream, log=sys.stderr,
+        timeouts=AdaptiveTimeouts(args.timeout / 1000) if args.adaptive else None)
+
+    # Finish the probes in hand and close the engines instead of dying mid-write
+    signal.signal(signal.SIGINT, lambda signum, frame: checker.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: checker.stop())
+
+    print(f"Pinging {len(targets)} IPs" + (f" and {len(checker.ranges)} ranges" if checker.ranges else "")
+          + (" until stopped" if args.infinite else ""), file=sys.stderr)
+    try:
+        rounds = checker.run(infinite=args.infinite)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Stopped after {rounds} rounds." if args.infinite else "Done.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Sharded engine workers re-enter here in a frozen executable
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Headless probe worker for IP Ping Checker
+
+Run one next to each site that the central box cannot reach well. A
+coordinator (the Distributed engine of IP Ping Checker, or the Ping Tool's
+distributed sweep) connects, assigns targets and receives results. No GUI
+or spreadsheet libraries are needed.
+
+Usage: python ping_worker.py [--listen HOST:PORT] [--token TOKEN]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.distributed import DEFAULT_PORT, ProbeWorker, parse_address
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless probe worker for distributed ping sweeps")
+    parser.add_argument('--listen', default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help=f"address to accept coordinators on (default 127.0.0.1:{DEFAULT_PORT})")
+    parser.add_argument('--token', help="shared token coordinators must present (required off loopback)")
+    args = parser.parse_args()
+
+    host, port = parse_address(args.listen)
+    worker = ProbeWorker(host, port, args.token)
+    try:
+        host, port = worker.bind()
+    except (OSError, ValueError) as e:
+        print(f"Cannot listen on {args.listen}: {e}")
+        sys.exit(1)
+    print(f"Probe worker listening on {host}:{port}")
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        print("\nWorker stopped.")
+    finally:
+        worker.close()
+
+
+if __name__ == "__main__":
+    main()
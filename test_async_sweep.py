@@ -0,0 +1,63 @@
+from core.async_sweep import AsyncSweeper
+from core.rate_limit import ProbeRateLimiter
+
+
+def _sweep(hosts, timeout=0.3, count=1, should_stop=None, **kwargs):
+    """Sweep hosts with keys equal to the hosts; returns [(key, rtts, error)] in reporting order"""
+    results = []
+    sweeper = AsyncSweeper(timeout=timeout, count=count, limiter=ProbeRateLimiter(), **kwargs)
+    try:
+        sweeper.run(((host, host) for host in hosts), lambda key, host, rtts, error: results.append((key, rtts, error)),
+                    should_stop)
+    finally:
+        sweeper.close()
+    return results
+
+
+def test_replies_are_matched_and_silent_hosts_lost(fake_icmp):
+    fake_icmp.silent.add('10.0.0.3')
+    results = dict((key, rtts) for key, rtts, _ in _sweep(['10.0.0.1', '10.0.0.2', '10.0.0.3'], count=2))
+    assert all(rtt is not None for rtt in results['10.0.0.1'] + results['10.0.0.2'])
+    assert results['10.0.0.3'] == [None, None]
+
+
+def test_replies_from_another_address_or_identifier_are_ignored(fake_icmp):
+    """A reply only counts when its sequence number, identifier and source all match the request"""
+    fake_icmp.reply_from['10.0.0.2'] = '10.0.0.9'
+    fake_icmp.delays['10.0.0.3'] = 0.05
+    sweeper = AsyncSweeper(timeout=0.3, limiter=ProbeRateLimiter())
+    sock = fake_icmp.sockets[0]
+    sock.filter_ident = None  # Let the foreign reply past the kernel filter: read_replies must drop it
+    original = sock.sendto
+
+    def send_with_stray_reply(packet, address):
+        if address[0] == '10.0.0.3':  # Same sequence number, another program's identifier
+            seq = int.from_bytes(packet[6:8], 'big')
+            sock.deliver('10.0.0.3', (sweeper.icmp.ident + 1) & 0xFFFF, seq)
+        return original(packet, address)
+
+    sock.sendto = send_with_stray_reply
+    results = {}
+    try:
+        sweeper.run(((host, host) for host in ['10.0.0.1', '10.0.0.2', '10.0.0.3']),
+                    lambda key, host, rtts, error: results.__setitem__(key, rtts))
+    finally:
+        sweeper.close()
+    assert results['10.0.0.1'][0] is not None
+    assert results['10.0.0.2'] == [None]
+    assert results['10.0.0.3'][0] >= 40  # The delayed real reply, not the stray one
+
+
+def test_results_are_reported_as_hosts_finish(fake_icmp):
+    fake_icmp.delays['10.0.0.1'] = 0.15
+    fake_icmp.silent.add('10.0.0.2')
+    order = [key for key, _, _ in _sweep(['10.0.0.1', '10.0.0.2', '10.0.0.3'], timeout=0.3)]
+    assert order == ['10.0.0.3', '10.0.0.1', '10.0.0.2']
+
+
+def test_stop_ends_the_sweep_early(fake_icmp):
+    """No new probes go out once should_stop is true; probes in flight still report"""
+    hosts = [f'10.0.{i // 250}.{i % 250 + 1}' for i in range(1000)]
+    calls = []
+    results = _sweep(hosts, max_in_flight=10, should_stop=lambda: calls.append(1) or len(calls) > 20)
+    assert len(fake_icmp.sockets[0].sent) == len(results) == 20
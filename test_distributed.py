@@ -0,0 +1,139 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from core.distributed import DistributedSweeper, ProbeWorker, parse_address
+from core.engines import create_round_engine
+
+
+def start_worker(token=None):
+    worker = ProbeWorker('127.0.0.1', 0, token)
+    worker.bind()
+    threading.Thread(target=worker.serve_forever, daemon=True).start()
+    return worker
+
+
+def test_parse_address():
+    assert parse_address("10.0.0.5:9000") == ("10.0.0.5", 9000)
+    assert parse_address("probe-site2") == ("probe-site2", 8765)
+
+
+def test_targets_sharded_across_workers_and_merged():
+    """Several workers on localhost; pinned targets go to their worker and every target reports once"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(64)
+    workers = [start_worker('secret') for _ in range(3)]
+    addresses = [f"127.0.0.1:{worker.port}" for worker in workers]
+    targets = [(index, f"127.0.{index // 40}.{index % 40 + 1}") for index in range(240)]
+    sweeper = DistributedSweeper(addresses[:2], probe="TCP", port=listener.getsockname()[1], timeout=1, count=2,
+                                 token='secret', assignments={"127.0.0.1": addresses[2]})
+    try:
+        for _ in range(2):
+            results = {}
+            sweeper.run(targets, lambda key, host, rtts, error: results.__setitem__(key, (host, rtts, error)))
+            assert len(results) == len(targets)
+            assert all(host == targets[key][1] and len(rtts) == 2 and error is None
+                       for key, (host, rtts, error) in results.items())
+        jobs = sweeper._split(targets)
+        assert jobs[addresses[2]] == [(0, "127.0.0.1")]
+        assert jobs[addresses[0]] and jobs[addresses[1]]
+    finally:
+        sweeper.close()
+        for worker in workers:
+            worker.close()
+        listener.close()
+
+
+def test_unreachable_or_unauthorized_worker_reports_errors():
+    worker = start_worker('secret')
+    targets = [(0, "127.0.0.1"), (1, "127.0.0.2")]
+    try:
+        for address, token in ((f"127.0.0.1:{worker.port}", 'wrong'), ("127.0.0.1:1", None)):
+            errors = {}
+            sweeper = DistributedSweeper([address], probe="TCP", token=token)
+            sweeper.run(targets, lambda key, host, rtts, error: errors.__setitem__(key, error))
+            sweeper.close()
+            assert set(errors) == {0, 1} and all("unavailable" in error for error in errors.values())
+    finally:
+        worker.close()
+
+
+def test_silent_worker_times_out(monkeypatch):
+    """A worker that takes the job but never answers fails its targets instead of hanging the round"""
+    monkeypatch.setattr('core.distributed.SILENCE_GRACE', 0.2)
+    server = socket.create_server(('127.0.0.1', 0))
+    connections = []
+
+    def hang():
+        conn, _ = server.accept()
+        connections.append(conn)
+        conn.makefile('rb').readline()
+        conn.sendall(b'{"type":"hello","name":"stuck"}\n')
+
+    threading.Thread(target=hang, daemon=True).start()
+    errors = {}
+    sweeper = DistributedSweeper([f"127.0.0.1:{server.getsockname()[1]}"], probe="TCP", timeout=0.1, count=2)
+    try:
+        started = time.monotonic()
+        sweeper.run([(0, "127.0.0.1"), (1, "127.0.0.2")], lambda key, host, rtts, error: errors.__setitem__(key, error))
+        assert time.monotonic() - started < 2
+    finally:
+        sweeper.close()
+        for conn in connections:
+            conn.close()
+        server.close()
+    assert set(errors) == {0, 1} and all("timed out" in error for error in errors.values())
+
+
+def test_worker_needs_a_token_off_loopback():
+    with pytest.raises(ValueError):
+        ProbeWorker('0.0.0.0', 0).bind()
+    worker = ProbeWorker('0.0.0.0', 0, 'secret')
+    worker.bind()
+    worker.close()
+
+
+def test_malformed_messages_get_errors_and_keep_the_connection():
+    worker = start_worker()
+    try:
+        with socket.create_connection(('127.0.0.1', worker.port), timeout=2) as sock:
+            lines = sock.makefile('rb')
+            sock.sendall(b'{"type":"hello"}\n')
+            assert json.loads(lines.readline())['type'] == 'hello'
+            for message in (b'[1, 2]', b'{"type":"job"}', b'{"type":"job","id":3,"options":{},"targets":[[0]]}',
+                            b'{"type":"bogus"}'):
+                sock.sendall(message + b'\n')
+                assert json.loads(lines.readline())['type'] == 'error'
+            sock.sendall(b'{"type":"job","id":4,"options":{},"targets":[[0,"127.0.0.1"]]}\n')
+            results = json.loads(lines.readline())
+            assert results['type'] == 'results' and results['results'][0][2].startswith("Bad job options")
+            assert json.loads(lines.readline()) == {'type': 'done', 'id': 4}
+    finally:
+        worker.close()
+
+
+def test_front_ends_pass_the_token_to_remote_workers():
+    """A worker listening off loopback needs a token; create_round_engine must hand it over"""
+    listener = socket.create_server(('127.0.0.1', 0))
+    worker = ProbeWorker('0.0.0.0', 0, 'secret')
+    worker.bind()
+    threading.Thread(target=worker.serve_forever, daemon=True).start()
+    targets = [(0, "127.0.0.1")]
+    try:
+        for token, reached in (('secret', True), (None, False)):
+            results = {}
+            engine = create_round_engine("Distributed", "TCP", 1, 1, port=listener.getsockname()[1],
+                                         workers=[f"127.0.0.1:{worker.port}"], token=token)
+            try:
+                engine.run(targets, lambda key, host, rtts, error: results.__setitem__(key, (rtts, error)))
+            finally:
+                engine.close()
+            rtts, error = results[0]
+            assert (error is None and rtts[0] is not None) if reached else "Unauthorized" in error
+    finally:
+        worker.close()
+        listener.close()
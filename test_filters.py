@@ -0,0 +1,83 @@
+import pytest
+
+from core.filters import FilterIndex, RowFilter, parse_network
+from core.results import OFFLINE, ONLINE, ResultStore
+from core.views import RowView
+
+
+def make_store():
+    store = ResultStore()
+    store.load(["10.0.0.1", "10.0.1.7", "192.168.1.1", "core-sw-01"],
+               ["Core switch A", "Edge router", "Branch printer", "Core switch B"])
+    return store
+
+
+def matches(row_filter):
+    store = row_filter.index.store
+    candidates = sorted(set(row_filter.candidates()))
+    found = [row for row in candidates if row_filter(row)]
+    assert found == [row for row in range(len(store)) if row_filter(row)]  # Candidates miss nothing
+    return found
+
+
+def test_filters_by_status_text_and_network():
+    store = make_store()
+    index = FilterIndex(store)
+    index.sync()
+
+    assert matches(RowFilter(index, text="core SW")) == [0, 3]
+    assert matches(RowFilter(index, text="rout")) == [1]
+    assert matches(RowFilter(index, text="core printer")) == []
+    assert matches(RowFilter(index, network=parse_network("10.0.0.0/16"))) == [0, 1]
+    assert matches(RowFilter(index, network=parse_network("10.0.1.0-10.0.1.255"))) == [1]
+    assert matches(RowFilter(index, statuses={ONLINE})) == []
+    assert not RowFilter(index).active
+
+    store.update(0, "Online", "1.2", 1.0)
+    store.update(1, "Offline", "Timeout", 1.0)
+    index.sync(store.take_changes())
+    assert index.by_status[ONLINE] == {0} and index.by_status[OFFLINE] == {1}
+    assert matches(RowFilter(index, statuses={ONLINE, OFFLINE}, network=parse_network("10.0.0.0/8"))) == [0, 1]
+
+
+def test_filtered_view_stays_live():
+    store = make_store()
+    index = FilterIndex(store)
+    index.sync()
+    offline = RowFilter(index, statuses={OFFLINE}, text="switch")
+    view = RowView(accept=offline)
+    view.rebuild(offline.candidates())
+    assert list(view) == []
+
+    store.update(3, "Offline", "Timeout", 1.0)
+    row = store.append("10.0.0.9", "Spare switch")  # Joins after the filter was set
+    store.update(row, "Offline", "Timeout", 1.0)
+    changed = store.take_changes()
+    index.sync(changed)
+    view.update(changed)
+    assert list(view) == [3, row]
+    view.rebuild(offline.candidates())
+    assert list(view) == [3, row]
+
+
+def test_text_matches_follow_typing_and_new_words():
+    """Cached query words narrow as letters are typed and still see words added later"""
+    store = make_store()
+    index = FilterIndex(store)
+    index.sync()
+    typed = [index.matching_words("core s"[:end]) for end in range(1, 7)]
+    assert typed[0] == {0, 2, 3} and typed[-1] == {0, 3}  # "c" is in "branch" too
+    assert index.matching_words("rint") == {2}
+
+    store.append("10.0.0.9", "Core switchboard")
+    store.append("10.0.0.10", "Reprint queue")
+    index.sync()
+    assert index.matching_words("core switch") == {0, 3, 4}
+    assert index.matching_words("rint") == {2, 5}
+
+
+def test_parse_network():
+    assert parse_network("10.0.0.0/30") == (0x0A000000, 0x0A000003)
+    assert parse_network("10.0.0.5") == (0x0A000005, 0x0A000005)
+    with pytest.raises(ValueError):
+        parse_network("10.0.0.")
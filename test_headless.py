@@ -0,0 +1,74 @@
+import io
+import json
+import math
+
+from core.headless import HeadlessChecker
+from core.targets import TargetList
+
+
+class FakeEngine:
+    """Round engine answering from a table of RTT lists"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.rounds = 0
+
+    def run(self, targets, on_result, should_stop=None):
+        self.rounds += 1
+        for key, host in targets:
+            on_result(key, host, self.replies.get(host, [None]), None)
+
+    def close(self):
+        pass
+
+
+def test_target_list_picks_columns_by_heading():
+    targets = TargetList.from_rows(
+        ["Gateway", "Service port", "Host", "Device name"],
+        [["10.0.0.1", 443, "10.0.0.10", "Web"],
+         [math.nan, math.nan, "db-01", math.nan],
+         ["", "", math.nan, "No address"],
+         ["", "", "10.0.1.0/30", "Range"]])
+    assert targets.ips == ["10.0.0.10", "db-01"] and targets.descriptions == ["Web", "-"]
+    assert targets.parents == ["10.0.0.1", ""] and targets.ports == [443, None]
+    assert targets.workers == [] and targets.ranges == ["10.0.1.0/30"] and len(targets) == 2
+    assert TargetList.from_rows(["x"], [["10.0.0.1"]]).ips == ["10.0.0.1"]  # First column by default
+
+
+def test_rounds_write_json_lines_and_range_responders():
+    targets = TargetList.from_rows(["IP", "Description"], [["10.0.0.1", "Core"], ["10.0.0.2", "Edge"]])
+    output = io.StringIO()
+    checker = HeadlessChecker(targets, output, ranges=["10.0.9.1-3"])
+    engine = FakeEngine({"10.0.0.1": [2.0, 4.0], "10.0.9.2": [1.0]})
+    for _ in range(2):
+        checker.round += 1
+        checker.ping_round(engine, None, checker.store.targets(), 2)
+        checker.sweep_ranges(engine, None, 2)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    first = [record for record in records if record['round'] == 1]
+    assert [(r['ip'], r['status']) for r in first] == [("10.0.0.1", "Online"), ("10.0.0.2", "Offline"),
+                                                        ("10.0.9.2", "Online")]  # Silent range addresses skipped
+    assert first[0]['rtt_ms'] == 3.0 and first[0]['description'] == "Core" and first[1]['response'] == "Timeout"
+    second = [record for record in records if record['round'] == 2]
+    assert [r['ip'] for r in second] == ["10.0.0.1", "10.0.0.2", "10.0.9.2"]  # The responder joined the list
+    assert second[1]['loss_pct'] == 100.0 and second[0]['jitter_ms'] == 0.0
+
+
+def test_hosts_behind_a_down_parent_are_not_probed():
+    targets = TargetList.from_rows(["IP", "Parent"], [["10.0.0.1", ""], ["10.0.0.2", "10.0.0.1"]])
+    output = io.StringIO()
+    checker = HeadlessChecker(targets, output)
+    probed = []
+    engine = FakeEngine({})
+    run = engine.run
+    engine.run = lambda targets, on_result, should_stop=None: run(
+        [probed.append(host) or (key, host) for key, host in targets], on_result, should_stop)
+    for _ in range(3):
+        checker.round += 1
+        checker.ping_round(engine, None, checker.store.targets(), 1)
+
+    assert probed == ["10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.2", "10.0.0.1"]  # Down after two failures
+    last = [json.loads(line) for line in output.getvalue().splitlines() if '"10.0.0.2"' in line][-1]
+    assert last['status'] == "Unreachable (upstream)" and last['upstream'] == "10.0.0.1"
+    assert last['round'] == 3 and checker.topology.saved == 1
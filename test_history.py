@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+from core.history import RttHistory
+from core.results import ResultStore
+
+
+def test_ring_keeps_last_samples():
+    history = RttHistory(samples=4)
+    history.reset(2)
+    assert history.recent(0) == [] and history.loss(0) is None and history.sparkline(0) == ""
+    for rtt in [1.0, 2.0, None, 4.0, 5.0, 6.0]:
+        history.record(0, rtt)
+    recent = history.recent(0)
+    assert math.isnan(recent[0]) and recent[1:] == [4.0, 5.0, 6.0]
+    assert history.loss(0) == 25.0 and history.jitter(0) == 1.0 and history.mean(0) == 5.0
+    assert history.sparkline(0) == "×▁▅█"
+    assert history.recent(1) == []
+
+    for step in range(1000):  # The ring never grows
+        history.record(1, float(step))
+    assert history.recent(1) == [996.0, 997.0, 998.0, 999.0]
+    assert len(history.values) == 2 * 4 and history.values.itemsize == 4
+    with pytest.raises(ValueError):
+        RttHistory(samples=0)
+
+
+def test_store_records_finished_results_only():
+    store = ResultStore(history_samples=5)
+    store.load(['10.0.0.1', '10.0.0.2'])
+    store.update(0, "Online", "10.0 (1/4)", 1.0, sample=False)  # Preview
+    store.update(0, "Online", "10.0", 1.0)
+    store.update(0, "Offline", "Timeout", 2.0)
+    store.update(0, "Online", "< 1", 3.0)
+    assert store.row(0)[5:] == ('█×▁', '33', '10.0')
+    assert store.row(1)[5:] == ('', '-', '-')
+    row = store.append('10.0.0.3')
+    store.update(row, "Offline", "Timeout", 1.0)
+    assert store.row(row)[5:] == ('×', '100', '-')
+    rows = sorted(range(3), key=store.sort_key("Loss %", reverse=True), reverse=True)
+    assert rows == [2, 0, 1]
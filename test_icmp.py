@@ -0,0 +1,47 @@
+from core.icmp import build_echo_request, checksum, parse_echo_reply, IcmpProber, IcmpSocket, ICMP_ECHO_REPLY
+from core.rate_limit import ProbeRateLimiter
+
+
+def test_echo_request_checksum():
+    """A packet with its checksum filled in must sum to zero"""
+    packet = build_echo_request(0x1234, 7, b'abc')
+    assert checksum(packet) == 0
+
+
+def test_parse_echo_reply():
+    """Replies parse with or without an IPv4 header; requests are ignored"""
+    request = build_echo_request(0x1234, 7, b'payload')
+    assert parse_echo_reply(request) is None
+
+    reply = bytes([ICMP_ECHO_REPLY]) + request[1:]
+    assert parse_echo_reply(reply) == (0x1234, 7)
+
+    ip_header = bytes([0x45]) + bytes(19)
+    assert parse_echo_reply(ip_header + reply) == (0x1234, 7)
+
+
+def test_prober_matches_replies_and_times_out_silent_hosts(fake_icmp):
+    fake_icmp.silent.add('10.0.0.2')
+    fake_icmp.reply_from['10.0.0.3'] = '10.0.0.4'  # Right sequence number, wrong source
+    prober = IcmpProber(limiter=ProbeRateLimiter())
+    try:
+        assert all(rtt is not None for rtt in prober.ping('10.0.0.1', 0.5, count=3))
+        assert prober.ping('10.0.0.2', 0.1, count=2) == [None, None]
+        assert prober.ping('10.0.0.3', 0.1) == [None]
+    finally:
+        prober.close()
+    seqs = [seq for _, _, seq in fake_icmp.sockets[0].sent]
+    assert len(set(seqs)) == len(seqs)
+
+
+def test_raw_socket_drops_other_identifiers(fake_icmp):
+    """Replies to another program's pings never reach a raw socket's reader"""
+    icmp = IcmpSocket()
+    sock = fake_icmp.sockets[0]
+    try:
+        sock.filter_ident = None  # As on a kernel without socket filters
+        sock.deliver('10.0.0.1', (icmp.ident + 1) & 0xFFFF, 1)
+        sock.deliver('10.0.0.1', icmp.ident, 2)
+        assert [(seq, address) for seq, address, _ in icmp.read_replies()] == [(2, '10.0.0.1')]
+    finally:
+        icmp.close()
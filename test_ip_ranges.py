@@ -0,0 +1,36 @@
+import itertools
+
+import pytest
+
+from modules.ip_calculator import IPCalculator
+
+
+def hosts(*specs):
+    return list(IPCalculator.iter_hosts(specs))
+
+
+def test_parse_range_forms():
+    assert hosts('10.0.0.0/30') == ['10.0.0.1', '10.0.0.2']
+    assert hosts('10.0.0.7/32') == ['10.0.0.7']
+    assert hosts('10.0.0.5-8') == ['10.0.0.5', '10.0.0.6', '10.0.0.7', '10.0.0.8']
+    assert hosts('10.0.0.254-10.0.1.1') == ['10.0.0.254', '10.0.0.255', '10.0.1.0', '10.0.1.1']
+    assert hosts('10.0.0.9') == ['10.0.0.9']
+    with pytest.raises(ValueError):
+        IPCalculator.parse_range('10.0.0.9-10.0.0.1')
+    with pytest.raises(ValueError):
+        IPCalculator.parse_range('10.0.0.0/33')
+
+
+def test_is_range_leaves_hosts_alone():
+    assert IPCalculator.is_range('192.168.0.0/24')
+    assert IPCalculator.is_range(' 10.0.0.1 - 50 ')
+    assert not IPCalculator.is_range('10.0.0.1')
+    assert not IPCalculator.is_range('web-01')
+    assert not IPCalculator.is_range('core-sw.example.com')
+
+
+def test_count_and_lazy_expansion():
+    assert IPCalculator.count_hosts(['10.0.0.0/8', '10.0.0.5-20']) == 2 ** 24 - 2 + 16
+    # A /8 is generated on demand, not listed
+    first = list(itertools.islice(IPCalculator.iter_hosts(['10.0.0.0/8']), 3))
+    assert first == ['10.0.0.1', '10.0.0.2', '10.0.0.3']
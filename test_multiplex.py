@@ -0,0 +1,63 @@
+from core.multiplex import RoundSender
+from core.rate_limit import ProbeRateLimiter
+
+
+def test_raw_socket_receives_replies_in_every_window(fake_icmp):
+    """Each window uses a new identifier; the raw socket's kernel filter must follow it"""
+    sender = RoundSender(timeout=1, limiter=ProbeRateLimiter())
+    try:
+        first = sender.send_window(['127.0.0.1', '127.0.0.2'])
+        second = sender.send_window(['127.0.0.1', '127.0.0.2'])
+    finally:
+        sender.close()
+    assert all(rtt is not None for rtt in first + second)
+    idents = {ident for _, ident, _ in fake_icmp.sockets[0].sent}
+    assert len(idents) == 2 and fake_icmp.sockets[0].filter_ident in idents
+
+
+def _run(sender, hosts, should_stop=None):
+    results = {}
+    try:
+        sender.run(((host, host) for host in hosts), lambda key, host, rtts, error: results.__setitem__(key, rtts),
+                   should_stop)
+    finally:
+        sender.close()
+    return results
+
+
+def test_silent_and_misaddressed_hosts_are_lost(fake_icmp):
+    fake_icmp.silent.add('10.0.0.2')
+    fake_icmp.reply_from['10.0.0.3'] = '10.0.0.1'  # Its sequence number, another host's address
+    results = _run(RoundSender(timeout=0.2, count=2, limiter=ProbeRateLimiter()), ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+    assert all(rtt is not None for rtt in results['10.0.0.1'])
+    assert results['10.0.0.2'] == [None, None]
+    assert results['10.0.0.3'] == [None, None]
+
+
+def test_late_replies_do_not_match_the_next_window(fake_icmp):
+    """A reply arriving after its window closed belongs to no host of the next window"""
+    fake_icmp.delays['10.0.0.1'] = 0.15  # Lands inside the second window
+    sender = RoundSender(timeout=0.1, limiter=ProbeRateLimiter())
+    try:
+        assert sender.send_window(['10.0.0.1']) == [None]
+        fake_icmp.delays.clear()
+        fake_icmp.silent.add('10.0.0.1')
+        assert sender.send_window(['10.0.0.1', None]) == [None, None]
+    finally:
+        sender.close()
+
+
+def test_first_reply_leaves_answered_hosts_out_of_later_rounds(fake_icmp):
+    fake_icmp.silent.add('10.0.0.2')
+    results = _run(RoundSender(timeout=0.1, count=3, limiter=ProbeRateLimiter(), first_reply=True),
+                   ['10.0.0.1', '10.0.0.2'])
+    assert len(results['10.0.0.1']) == 1 and results['10.0.0.1'][0] is not None
+    assert results['10.0.0.2'] == [None, None, None]
+    assert sum(1 for address, _, _ in fake_icmp.sockets[0].sent if address == '10.0.0.1') == 1
+
+
+def test_stop_skips_remaining_rounds(fake_icmp):
+    rounds = []
+    results = _run(RoundSender(timeout=0.1, count=5, limiter=ProbeRateLimiter()), ['10.0.0.1'],
+                   lambda: rounds.append(1) or len(rounds) > 2)
+    assert len(results['10.0.0.1']) == 2
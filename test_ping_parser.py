@@ -0,0 +1,64 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from core.ping_parser import parse_ping_output, parse_reply_line
+
+CORPUS = Path(__file__).parent / 'test_corpus' / 'ping'
+
+# file: (sent, received, times, ttl, (min, avg, max) or None, error)
+EXPECTED = {
+    'windows_en_ok.txt': (4, 4, [14.0, 13.0, 15.0, 14.0], 117, (13.0, 14.0, 15.0), None),
+    'windows_en_partial.txt': (4, 2, [0.0, 2.0], 128, (0.0, 1.0, 2.0), None),
+    'windows_en_unreachable.txt': (2, 0, [], None, None, None),
+    'windows_en_unknown_host.txt': (0, 0, [], None, None, 'Host not found'),
+    'windows_ru_ok.txt': (3, 3, [14.0, 16.0, 0.0], 117, (0.0, 10.0, 16.0), None),
+    'windows_ru_timeout.txt': (2, 0, [], None, None, None),
+    'iputils_ok.txt': (4, 4, [14.2, 13.1, 15.3, 14.4], 117, (13.1, 14.25, 15.3), None),
+    'iputils_loss.txt': (3, 2, [0.412, 0.388], 64, (0.388, 0.4, 0.412), None),
+    'iputils_unreachable.txt': (2, 0, [], None, None, None),
+    'iputils_unknown_host.txt': (0, 0, [], None, None, 'Host not found'),
+    'busybox_ok.txt': (3, 3, [14.215, 13.87, 15.002], 117, (13.87, 14.362, 15.002), None),
+    'bsd_loss.txt': (4, 3, [9.812, 10.204, 9.551], 57, (9.551, 9.856, 10.204), None),
+}
+
+
+def test_corpus_is_fully_covered():
+    assert sorted(path.name for path in CORPUS.glob('*.txt')) == sorted(EXPECTED)
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_parse_recorded_output(name):
+    sent, received, times, ttl, summary, error = EXPECTED[name]
+    result = parse_ping_output((CORPUS / name).read_text(encoding='utf-8'))
+    assert (result['packets_sent'], result['packets_received']) == (sent, received)
+    assert result['times'] == times
+    assert result['success'] == bool(received)
+    if ttl is not None:
+        assert set(result['ttls']) == {ttl}
+    if summary is not None:
+        assert (result['min_time'], result['avg_time'], result['max_time']) == summary
+    assert result.get('error') == error
+
+
+def test_reply_lines_match_full_parse():
+    """Line-by-line streaming sees the same replies as the whole-output parse"""
+    for path in CORPUS.glob('*.txt'):
+        text = path.read_text(encoding='utf-8')
+        rtts = [rtt for is_event, rtt in map(parse_reply_line, text.splitlines()) if is_event and rtt is not None]
+        assert rtts == parse_ping_output(text)['times'], path.name
+
+
+def test_mangled_output_never_raises():
+    """Truncated, spliced and noisy output degrades to a result dict, never an exception"""
+    rng = random.Random(0)
+    texts = [path.read_text(encoding='utf-8') for path in CORPUS.glob('*.txt')]
+    for _ in range(2000):
+        text = rng.choice(texts)
+        start, end = sorted(rng.randrange(len(text) + 1) for _ in range(2))
+        mangled = text[start:end] + rng.choice(texts)[:rng.randrange(80)] + ''.join(
+            rng.choice('=<0123456789.,/ msTTLttl\n') for _ in range(rng.randrange(40)))
+        result = parse_ping_output(mangled, count=rng.randrange(1, 5))
+        assert 0 <= result['packet_loss'] <= 100
+        assert len(result['times']) == len(result['ttls'])
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from core.pool import ProbePool
+
+
+def test_results_arrive_in_completion_order():
+    pool = ProbePool(4)
+    try:
+        tasks = [('slow', 0.3), ('fast', 0.0), ('medium', 0.1)]
+        order = [name for name, _ in pool.run_round(lambda name, delay: time.sleep(delay) or name, tasks)]
+    finally:
+        pool.shutdown()
+    assert order == ['fast', 'medium', 'slow']
+
+
+def test_stop_cancels_probes_not_started():
+    pool = ProbePool(1)
+    started = []
+    release = threading.Event()
+
+    stop = threading.Event()
+
+    def probe(i):
+        started.append(i)
+        stop.set()  # Stop pressed while the first probe runs
+        release.wait(1)
+        return i
+
+    try:
+        assert list(pool.run_round(probe, ((i,) for i in range(10)), stop.is_set)) == []
+        release.set()
+    finally:
+        pool.shutdown(wait=True)
+    assert started == [0]  # The running probe finished; the queued ones never ran
+
+
+def test_pools_do_not_see_each_others_results():
+    """A stopped session's late probe must not be counted by the next session's pool"""
+    release = threading.Event()
+    stop = threading.Event()
+    old = ProbePool(2)
+
+    def late():
+        stop.set()
+        release.wait(1)
+        return 'old'
+
+    assert list(old.run_round(late, [()], stop.is_set)) == []
+
+    new = ProbePool(2)
+    try:
+        release.set()  # The old probe finishes while the new session runs
+        time.sleep(0.05)
+        assert [result for result, _ in new.run_round(lambda i: i, [(1,), (2,)])] in ([1, 2], [2, 1])
+        assert new.collect(0) == []
+    finally:
+        old.shutdown()
+        new.shutdown()
+
+
+def test_submit_and_collect():
+    pool = ProbePool(2)
+    try:
+        pool.submit(lambda: 'a')
+        cancelled = pool.submit(time.sleep, 0.5)
+        cancelled.cancel()
+        deadline = time.perf_counter() + 1
+        found = []
+        while 'a' not in found and time.perf_counter() < deadline:
+            found += [result for result, _ in pool.collect(0.1)]
+    finally:
+        pool.shutdown()
+    assert found == ['a']
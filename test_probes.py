@@ -0,0 +1,64 @@
+import socket
+
+import pytest
+
+from core.async_sweep import AsyncProber
+from core.probes import PortProber, TcpConnectProber, UdpProber, create_prober
+from core.rate_limit import ProbeRateLimiter
+
+
+def _run(prober, hosts):
+    results = {}
+    try:
+        prober.run(((host, host) for host in hosts), lambda key, host, rtts, error: results.__setitem__(key, rtts))
+    finally:
+        prober.close()
+    return results
+
+
+def test_tcp_open_and_refused_ports_both_count_as_replies():
+    """An accepted connect and a refused one both prove the host is up"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(16)
+    open_port = listener.getsockname()[1]
+    closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    closed.bind(('127.0.0.1', 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        prober = TcpConnectProber(open_port, {'localhost': closed_port}, timeout=1, count=2,
+                                  limiter=ProbeRateLimiter())
+        results = _run(prober, ['127.0.0.1', 'localhost'])
+    finally:
+        listener.close()
+    assert all(rtt is not None for rtt in results['127.0.0.1'])
+    assert all(rtt is not None for rtt in results['localhost'])
+
+
+def test_udp_silence_is_a_loss():
+    """A port that takes the datagram without answering cannot prove the host is up"""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(('127.0.0.1', 0))
+    try:
+        prober = UdpProber(sink.getsockname()[1], timeout=0.1, count=1, limiter=ProbeRateLimiter())
+        results = _run(prober, ['127.0.0.1'])
+    finally:
+        sink.close()
+    assert results['127.0.0.1'] == [None]
+
+
+def test_create_prober_picks_backend_and_default_port():
+    prober = create_prober("tcp", timeout=1)
+    assert isinstance(prober, TcpConnectProber) and prober.port_for('10.0.0.1') == 80
+    prober = create_prober("UDP", ports={'10.0.0.1': 161}, timeout=1)
+    assert prober.port_for('10.0.0.1') == 161 and prober.port_for('10.0.0.2') == 33434
+    with pytest.raises(ValueError):
+        create_prober("SCTP")
+
+
+def test_backends_must_implement_a_probe():
+    with pytest.raises(TypeError):
+        AsyncProber()
+    with pytest.raises(TypeError):
+        PortProber(80)
@@ -0,0 +1,39 @@
+import threading
+
+from core.rate_limit import ProbeRateLimiter, TokenBucket
+
+
+def test_token_bucket_paces_after_burst():
+    """Reservations beyond the burst are spaced one token interval apart"""
+    bucket = TokenBucket(rate=100, burst=5)
+    waits = [bucket.reserve() for _ in range(15)]
+    assert all(wait == 0 for wait in waits[:5])
+    assert abs(waits[-1] - 0.10) < 0.01
+
+
+def test_subnet_cap_is_per_slash_24():
+    """Each /24 gets its own bucket; other subnets are not held back"""
+    limiter = ProbeRateLimiter(subnet_pps=10)
+    for _ in range(5):
+        limiter.reserve('10.0.0.1')
+    assert limiter.reserve('10.0.0.2') > 0.3
+    assert limiter.reserve('10.0.1.1') == 0
+    assert limiter.granted == 7
+
+
+def test_hostnames_share_one_bucket_and_concurrent_grants_are_counted():
+    """A name says nothing about its subnet, so names are not split into fake /24s"""
+    limiter = ProbeRateLimiter(subnet_pps=10)
+    for _ in range(5):
+        limiter.reserve('db-01.example.com')
+    assert limiter.reserve('web-01.example.net') > 0.3
+    assert limiter.reserve('10.0.0.1') == 0
+
+    limiter = ProbeRateLimiter()
+    threads = [threading.Thread(target=lambda: [limiter.reserve('10.0.0.1') for _ in range(10000)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.granted == 40000
@@ -0,0 +1,67 @@
+import socket
+import time
+
+import pytest
+
+from core.resolver import ResolverCache
+
+
+class FakeDns:
+    """Counts lookups and answers from a mutable table"""
+
+    def __init__(self, table):
+        self.table = table
+        self.calls = 0
+
+    def __call__(self, host):
+        self.calls += 1
+        if host not in self.table:
+            raise socket.gaierror(f"unknown host {host}")
+        return self.table[host]
+
+
+def test_resolves_once_and_passes_literals_through():
+    dns = FakeDns({'router': '10.0.0.1'})
+    cache = ResolverCache(ttl=60, lookup=dns)
+    assert cache.resolve('10.9.9.9') == '10.9.9.9'
+    for _ in range(100):
+        assert cache.resolve('router') == '10.0.0.1'
+    assert dns.calls == 1
+
+
+def test_resolve_all_in_parallel_and_negative_cache():
+    dns = FakeDns({f'host{i}': f'10.0.0.{i}' for i in range(50)})
+    cache = ResolverCache(ttl=60, negative_ttl=60, lookup=dns)
+    addresses = cache.resolve_all([f'host{i}' for i in range(50)] + ['gone', '10.1.1.1', 'host3'])
+    assert addresses['host7'] == '10.0.0.7' and addresses['gone'] is None and '10.1.1.1' not in addresses
+    assert dns.calls == 51
+    with pytest.raises(OSError):
+        cache.resolve('gone')
+    assert cache.address('gone') == 'gone'
+    assert dns.calls == 51
+
+
+def test_expired_entry_served_while_refreshed_and_change_reported():
+    """An expired address is returned at once; the background lookup reports the new one"""
+    dns = FakeDns({'web': '10.0.0.5'})
+    cache = ResolverCache(ttl=0.01, lookup=dns)
+    changes = []
+    cache.on_change = lambda host, old, new: changes.append((host, old, new))
+    cache.resolve('web')
+    dns.table['web'] = '10.0.0.6'
+    time.sleep(0.02)
+    assert cache.resolve('web') == '10.0.0.5'
+    deadline = time.monotonic() + 2
+    while not changes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert changes == [('web', '10.0.0.5', '10.0.0.6')]
+    assert cache.changed('web') == ('10.0.0.5', '10.0.0.6')
+
+
+def test_failed_refresh_keeps_last_good_address():
+    dns = FakeDns({'db': '10.0.0.7'})
+    cache = ResolverCache(ttl=0, negative_ttl=60, lookup=dns)
+    cache.resolve_all(['db'])
+    del dns.table['db']
+    cache.resolve_all(['db'])
+    assert cache.resolve('db') == '10.0.0.7'
@@ -0,0 +1,74 @@
+import math
+import threading
+import time
+
+from core.results import NOT_TESTED, OFFLINE, ONLINE, UPSTREAM, ResultStore
+from core.topology import UPSTREAM_STATUS
+
+
+def test_load_and_update_round_trip_display_text():
+    store = ResultStore()
+    store.load(['10.0.0.1', ' 10.0.0.2 ', 'web-01'], ['Router'])
+    assert len(store) == 3 and store.ips[1] == '10.0.0.2' and store.descriptions[1:] == ['-', '-']
+    assert store.row(0) == ('10.0.0.1', 'Router', 'Not tested', '-', '-', '', '-', '-') and store.status[0] == NOT_TESTED
+
+    now = time.time()
+    store.update(0, "Online", "12.3", now)
+    store.update(1, "Online", "< 1", now)
+    store.update(2, "Offline", "Error: Host not found", now)
+    assert store.row(0)[2:4] == ('Online', '12.3') and store.tag(0) == 'online'
+    assert store.row(1)[3] == '< 1'
+    assert store.row(2)[2:4] == ('Offline', 'Error: Host not found') and math.isnan(store.rtt[2])
+    assert store.row(2)[4] == time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+
+    store.update(2, UPSTREAM_STATUS, "-", now)
+    assert store.status[2] == UPSTREAM and store.tag(2) == 'upstream' and store.row(2)[3] == '-'
+    store.update(2, "Online", "4.0", now)
+    assert 2 not in store.notes  # A plain time replaces the old text
+    assert store.row(0, lambda ip: "(DNS a → b)")[2] == 'Online (DNS a → b)'
+
+
+def test_append_and_typed_sort_keys():
+    store = ResultStore()
+    store.load(['10.0.0.3', '10.0.0.1'])
+    index = store.append('10.0.0.2')
+    assert index == 2 and store.status[index] == NOT_TESTED
+    store.update(0, "Online", "20.0", 2.0)
+    store.update(2, "Online", "3.5", 1.0)
+    store.update(1, "Offline", "Timeout", 3.0)
+    rows = list(range(3))
+    assert sorted(rows, key=store.sort_key("Response Time")) == [2, 0, 1]
+    assert sorted(rows, key=store.sort_key("Response Time", True), reverse=True) == [0, 2, 1]
+    assert sorted(rows, key=store.sort_key("Last Checked")) == [2, 0, 1]
+    assert store.status[1] == OFFLINE and store.status[0] == ONLINE
+
+
+def test_store_stays_compact():
+    store = ResultStore()
+    store.load(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(100000))
+    assert len(store) == 100000 and store.rtt.itemsize == 4 and store.status.itemsize == 1
+
+
+def test_ip_index_and_changes_from_probe_threads():
+    store = ResultStore()
+    store.load([f"10.0.{i >> 8}.{i & 255}" for i in range(2000)] + ['10.0.0.5'])
+    assert store.find('10.0.0.5') == 5 and store.find('192.0.2.1') is None  # First row of a duplicate
+    assert store.add('10.0.0.7') == 7 and len(store) == 2001
+
+    def prober(offset):
+        for row in range(offset, 2000, 4):
+            store.update(row, "Online", "1.0", 1.0)
+        store.add('192.0.2.1')
+
+    threads = [threading.Thread(target=prober, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 2002 and store.find('192.0.2.1') == 2001  # Appended once
+    assert store.take_changes() == set(range(2000)) and store.take_changes() == set()
+    assert store.targets()[-1] == ('192.0.2.1', 2001)
+
+    store.clear()
+    store.update(3, "Online", "1.0", 1.0)  # A probe finishing after Clear Results is dropped
+    assert len(store) == 0 and store.take_changes() == set()
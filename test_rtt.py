@@ -0,0 +1,30 @@
+from core.rtt import AdaptiveTimeouts
+
+
+def test_timeout_follows_rtt_within_bounds():
+    """A steady host converges near its RTT; the floor and ceiling always hold"""
+    timeouts = AdaptiveTimeouts(0.1, floor=0.02, ceiling=2.0)
+    assert timeouts.timeout('wan') == 0.1
+    for _ in range(50):
+        timeouts.observe('wan', 150.0)
+    assert 0.15 <= timeouts.timeout('wan') < 0.2
+    for _ in range(50):
+        timeouts.observe('lan', 0.5)
+    assert timeouts.timeout('lan') == 0.02
+
+
+def test_losses_back_off_then_down_host_fails_fast():
+    """Losses double the timeout, and a host that keeps losing drops back to the initial timeout"""
+    timeouts = AdaptiveTimeouts(0.1, floor=0.02, ceiling=2.0, dead_after=3)
+    timeouts.observe('slow', None)
+    assert timeouts.timeout('slow') == 0.2
+    timeouts.observe('slow', 180.0)
+    assert timeouts.timeout('slow') > 0.18
+    for _ in range(3):
+        timeouts.observe('slow', None)
+    assert timeouts.timeout('slow') == 0.1
+
+
+def test_ceiling_never_shortens_the_configured_timeout():
+    timeouts = AdaptiveTimeouts(5.0, floor=0.02, ceiling=3.0)
+    assert timeouts.ceiling == 5.0 and timeouts.timeout('10.0.0.1') == 5.0
@@ -0,0 +1,58 @@
+from core.scheduler import AdaptivePollScheduler, ProbeScheduler, TimingWheel
+
+
+def test_timing_wheel_pops_in_deadline_order():
+    """Entries further away than one turn of the wheel wait for their own turn"""
+    wheel = TimingWheel(tick=0.1, slots=4, start=0.0)
+    wheel.schedule(0.25, 'a')
+    wheel.schedule(0.65, 'b')  # Same slot as 'a', one turn later
+    assert [item for _, item in wheel.pop_due(0.3)] == ['a']
+    assert wheel.pop_due(0.5) == []
+    assert [item for _, item in wheel.pop_due(0.7)] == ['b']
+    assert len(wheel) == 0
+
+
+def test_spread_keeps_rate_flat_without_drift():
+    """Hosts fire evenly across the interval, exactly once per interval"""
+    scheduler = ProbeScheduler(1.0, tick=0.01, start=0.0)
+    scheduler.spread(range(100))
+    fires = {}
+    per_tick = []
+    for step in range(501):
+        now = step * 0.01
+        due = scheduler.pop_due(now)
+        per_tick.append(len(due))
+        for key in due:
+            fires.setdefault(key, []).append(now)
+
+    assert max(per_tick) == 1
+    for times in fires.values():
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert all(abs(gap - 1.0) < 1e-6 for gap in gaps)
+
+
+def test_adaptive_polling_backs_off_and_snaps_back():
+    """Steady hosts stretch toward max_interval; a loss pulls the next probe back in"""
+    scheduler = AdaptivePollScheduler(1.0, 8.0, backoff=2.0, start=0.0)
+    scheduler.add('a')
+    for _ in range(5):
+        scheduler.record('a', True, 5.0, now=0.0)
+    assert scheduler.states['a'].interval == 8.0
+    assert scheduler.rate == 1 / 8.0
+
+    scheduler.pop_due(0.0)
+    assert scheduler.deadlines['a'] == 8.0
+    scheduler.record('a', False, None, now=0.5)
+    assert scheduler.deadlines['a'] == 1.5
+    assert scheduler.pop_due(1.5) == ['a']
+
+
+def test_hosts_that_stay_down_back_off():
+    """Only going down resets the interval; every further loss of a dead host is steady"""
+    scheduler = AdaptivePollScheduler(1.0, 8.0, backoff=2.0, start=0.0)
+    scheduler.add('dead')
+    for _ in range(5):
+        scheduler.record('dead', False, None, now=0.0)
+    assert scheduler.states['dead'].interval == 8.0
+    scheduler.record('dead', True, 5.0, now=0.0)  # Back up
+    assert scheduler.states['dead'].interval == 1.0
@@ -0,0 +1,37 @@
+import socket
+
+from core.rate_limit import ProbeRateLimiter
+from core.sharded import ShardedSweeper, SubnetShards, decode_records, encode_record
+
+
+def test_records_round_trip_with_losses():
+    data = encode_record(7, [1.5, None, 20.25]) + encode_record(70000, []) + encode_record(3, [None])
+    assert list(decode_records(data)) == [(7, [1.5, None, 20.25]), (70000, []), (3, [None])]
+
+
+def test_subnets_stay_on_one_shard_and_balance():
+    shards = SubnetShards(3)
+    jobs = shards.split([(None, f"10.{n}.0.{h}") for n in range(60) for h in range(1, 11)])
+    assert all(len({host.rsplit('.', 1)[0] for _, host in job}) * 10 == len(job) for job in jobs)
+    assert max(shards.loads) - min(shards.loads) <= 10
+    assert shards.split([(None, "10.7.0.99")])[shards.shard_of("10.7.0.1")] == [(0, "10.7.0.99")]
+
+
+def test_sweep_across_processes_reports_every_target():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(64)
+    targets = [(index, f"127.0.{index // 50}.{index % 50 + 1}") for index in range(200)]
+    results = {}
+    sweeper = ShardedSweeper(2, probe="TCP", port=listener.getsockname()[1], ports={'127.0.0.1': 1},
+                             timeout=1, count=2, limiter=ProbeRateLimiter())
+    try:
+        for _ in range(2):
+            results.clear()
+            sweeper.run(targets, lambda key, host, rtts, error: results.__setitem__(key, (host, rtts, error)))
+            assert len(results) == len(targets)
+            assert all(host == targets[key][1] and len(rtts) == 2 and error is None
+                       for key, (host, rtts, error) in results.items())
+    finally:
+        sweeper.close()
+        listener.close()
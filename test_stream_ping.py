@@ -0,0 +1,90 @@
+import io
+import sys
+import time
+
+from core.rate_limit import ProbeRateLimiter
+from core.stream_ping import StreamingPinger, _Stream, bounded_lines, continuous_ping_command, ping_command
+
+# Stand-ins for a continuous ping, chosen by host name
+SCRIPTS = {
+    'up': "import time\nwhile True:\n    print('64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.4 ms', flush=True)"
+          "\n    time.sleep(0.05)",
+    'down': "import time\ntime.sleep(60)",
+    'exits': "import sys\nprint('64 bytes from 10.0.0.3: icmp_seq=1 ttl=64 time=1.5 ms', flush=True)\nsys.exit(2)",
+}
+
+
+class ScriptedPinger(StreamingPinger):
+    """Streams the output of a Python script per host instead of the system ping"""
+
+    def __init__(self, **kwargs):
+        super().__init__(limiter=ProbeRateLimiter(), **kwargs)
+        self.processes = []
+
+    def build_command(self, host):
+        return [sys.executable, '-c', SCRIPTS[host]]
+
+    def _spawn(self, stream):
+        super()._spawn(stream)
+        self.processes.append(stream.process)
+
+
+def _stream(pinger, hosts, seconds):
+    events = []
+    deadline = time.monotonic() + seconds
+    pinger.run(((host, host) for host in hosts), lambda key, host, rtts, error: events.append((key, rtts, error)),
+               lambda: time.monotonic() > deadline)
+    return events
+
+
+def test_replies_losses_and_exits_are_streamed():
+    pinger = ScriptedPinger(interval=0.1, timeout=0.1, restart_delay=60)
+    events = _stream(pinger, ['up', 'down', 'exits'], 1.0)
+    replies = [rtts for key, rtts, _ in events if key == 'up']
+    assert len(replies) >= 5 and all(rtts == [0.4] for rtts in replies)
+    down = [rtts for key, rtts, _ in events if key == 'down']
+    assert down and all(rtts == [None] for rtts in down)  # Silent past interval + timeout
+    assert [(rtts, error) for key, rtts, error in events if key == 'exits'] == [
+        ([1.5], None), ([], "ping exited with code 2")]
+
+
+def test_stop_terminates_every_process():
+    pinger = ScriptedPinger(interval=0.1, timeout=0.1)
+    _stream(pinger, ['up', 'down'], 0.3)
+    assert len(pinger.processes) == 2
+    assert all(process.poll() is not None for process in pinger.processes)
+    assert all(stream.process is None for stream in pinger.streams)
+
+
+def test_ping_command_matches_the_platform(monkeypatch):
+    monkeypatch.setattr('core.stream_ping.IS_WINDOWS', True)
+    assert ping_command('10.0.0.1', 4, 1500) == ['ping', '-n', '4', '-w', '1500', '10.0.0.1']
+    monkeypatch.setattr('core.stream_ping.IS_WINDOWS', False)
+    monkeypatch.setattr('core.stream_ping.W_IN_MS', False)
+    assert ping_command('10.0.0.1', 4, 1500) == ['ping', '-n', '-c', '4', '-W', '2', '10.0.0.1']
+    monkeypatch.setattr('core.stream_ping.W_IN_MS', True)  # macOS
+    assert ping_command('10.0.0.1', 4, 1500) == ['ping', '-n', '-c', '4', '-W', '1500', '10.0.0.1']
+
+
+def test_interval_is_one_ping_can_keep(monkeypatch):
+    monkeypatch.setattr('core.stream_ping.IS_WINDOWS', False)
+    assert continuous_ping_command('10.0.0.1', 0.05, 1000) == ['ping', '-n', '-i', '0.2', '10.0.0.1']
+    assert StreamingPinger(interval=0.05).interval == 0.2
+    monkeypatch.setattr('core.stream_ping.IS_WINDOWS', True)
+    assert StreamingPinger(interval=0.05).interval == 1.0  # ping -t sends once a second
+
+
+def test_overlong_lines_are_dropped_whole():
+    """The tail of a line cut at max_line must not be parsed as a line of its own"""
+    reply = b'64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.4 ms'
+    tail = b' 64 bytes from 10.0.0.9: icmp_seq=9 ttl=64 time=9.9 ms'
+    pinger = StreamingPinger(max_line=80, limiter=ProbeRateLimiter())
+    stream = _Stream('k', '10.0.0.1')
+    events = []
+    on_result = lambda key, host, rtts, error: events.append(rtts)
+    for chunk in (b'x' * 60, b'y' * 60, tail + b'\n' + reply[:20], reply[20:] + b'\n'):
+        pinger._feed(stream, chunk, on_result)
+    assert events == [[0.4]]
+
+    output = io.BytesIO(b'x' * 100 + tail + b'\n' + reply + b'\n')
+    assert list(bounded_lines(output, 80)) == [b'x' * 80, reply + b'\n']
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.targets import read_targets
+
+
+def test_reads_csv_and_text_lists_without_pandas(tmp_path):
+    sheet = tmp_path / "targets.csv"
+    sheet.write_text("\ufeffIP Address;Description;Port\n10.0.0.1;Core switch;\n10.0.0.2;Web;443\n"
+                     ";No address;\n10.0.1.0/30;Lab;\n", encoding="utf-8")
+    targets = read_targets(str(sheet))
+    assert targets.ips == ["10.0.0.1", "10.0.0.2"] and targets.descriptions == ["Core switch", "Web"]
+    assert targets.ports == [None, "443"] and targets.ranges == ["10.0.1.0/30"]
+
+    listing = tmp_path / "targets.txt"
+    listing.write_text("# Site A\n10.0.0.1 Core switch\n10.0.0.2,Web\n\nweb-01\n10.0.1.0/30  # lab\n")
+    targets = read_targets(str(listing))
+    assert targets.ips == ["10.0.0.1", "10.0.0.2", "web-01"]
+    assert targets.descriptions == ["Core switch", "Web", "-"] and targets.ranges == ["10.0.1.0/30"]
+
+
+def test_ping_app_starts_without_pandas():
+    pytest.importorskip("tkinter")
+    check = "import sys, ping_app; sys.exit(sorted({'pandas', 'openpyxl', 'xlrd'} & set(sys.modules)) or 0)"
+    result = subprocess.run([sys.executable, "-c", check], cwd=Path(__file__).parent,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
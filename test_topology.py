@@ -0,0 +1,26 @@
+from core.topology import Topology
+
+
+def test_children_suppressed_while_parent_down():
+    """Children of a down parent are skipped except every probe_every-th time"""
+    topology = Topology.from_column(['10.0.0.1', '10.0.0.5'], ['', '10.0.0.1'], down_after=2, probe_every=3)
+    assert not topology.suppress('10.0.0.5')
+    topology.record('10.0.0.1', False)
+    topology.record('10.0.0.1', False)
+    assert [topology.suppress('10.0.0.5') for _ in range(6)] == [True, True, False, True, True, False]
+    assert topology.saved == 4
+    assert not topology.suppress('10.0.0.1')
+
+    topology.record('10.0.0.1', True)
+    assert not topology.suppress('10.0.0.5')
+
+
+def test_subnet_inference_and_bypass():
+    """Hosts depend on .1 of their /24; a child answering despite a down parent is probed again"""
+    topology = Topology.from_subnets(['192.168.1.1', '192.168.1.20', '192.168.2.20'])
+    assert topology.parents == {'192.168.1.20': '192.168.1.1'}
+    for _ in range(2):
+        topology.record('192.168.1.1', False)
+    assert topology.suppress('192.168.1.20')
+    topology.record('192.168.1.20', True)
+    assert not topology.suppress('192.168.1.20')
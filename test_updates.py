@@ -0,0 +1,50 @@
+import threading
+import time
+
+from core.pool import RoundProgress
+from core.results import ResultStore
+from core.updates import UpdateBuffer
+
+
+def test_counts_every_result_and_shows_the_latest_status():
+    buffer = UpdateBuffer()
+    progress = RoundProgress("Round", 3)
+    now = time.perf_counter()
+    buffer.record(progress, now, status="first")
+    buffer.record(progress, now)
+    buffer.record(progress, now, status=lambda: progress.summary())
+    assert len(buffer) == 3
+    status, calls = buffer.drain()
+    assert progress.completed == 3 and status.startswith("Round: 3/3") and calls == []
+    assert buffer.drain() == (None, []) and len(buffer) == 0
+
+
+def test_calls_are_handed_out_once_and_clear_keeps_them():
+    buffer = UpdateBuffer()
+    buffer.status("Pinging")
+    buffer.call(lambda: None)
+    buffer.clear()
+    status, calls = buffer.drain()
+    assert status is None and len(calls) == 1
+    assert buffer.drain() == (None, []) and buffer.frames == 2
+
+
+def test_rows_changed_between_frames_are_drawn_once():
+    store = ResultStore()
+    store.load([f"10.0.0.{i}" for i in range(1, 6)])
+    buffer = UpdateBuffer()
+    progress = RoundProgress("Round", 40000)
+
+    def writer(offset):
+        for i in range(10000):
+            store.update((offset + i) % 3, "Online", "1.0", time.time())
+            buffer.record(progress, time.perf_counter())
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffer.drain()
+    assert store.take_changes() == {0, 1, 2} and progress.completed == 40000
+    assert store.take_changes() == set()
@@ -0,0 +1,47 @@
+import random
+
+from core.views import RowView, SortedKeyList
+
+
+def test_sorted_key_list_matches_sorted():
+    rng = random.Random(7)
+    items = SortedKeyList((rng.random(), i) for i in range(3000))
+    reference = sorted(items)
+    for step in range(5000):
+        if reference and rng.random() < 0.5:
+            item = reference.pop(rng.randrange(len(reference)))
+            items.remove(item)
+        else:
+            item = (rng.random(), 10000 + step)
+            items.add(item)
+            reference.append(item)
+            reference.sort()
+    assert list(items) == reference and len(items) == len(reference)
+    assert items.slice(1000, 1010) == reference[1000:1010]
+    assert items.count_below(reference[1234]) == 1234
+
+
+def test_live_sort_refiles_only_changed_rows():
+    rtt = [float(row % 50) for row in range(1000)]
+    view = RowView(key=rtt.__getitem__, reverse=True)  # Slowest first
+    view.rebuild(range(1000))
+    assert [rtt[row] for row in view.window(0, 3)] == [49.0, 49.0, 49.0]
+
+    rtt[10] = 500.0
+    rtt[11] = 0.0
+    assert view.update([10, 11, 12]) == 2  # Row 12 did not change
+    assert view.window(0, 2) == [10, 999] and view.position(10) == 0
+    assert view.position(11) == len(view) - 2  # Ties break on row, after row 0
+    assert list(view) == sorted(range(1000), key=lambda row: (rtt[row], row), reverse=True)
+
+
+def test_filter_and_appended_rows():
+    online = [row % 3 == 0 for row in range(30)]
+    view = RowView(accept=online.__getitem__)
+    view.rebuild(range(30))
+    assert len(view) == 10 and 3 in view and 4 not in view
+    online[3] = False
+    online[4] = True
+    online.append(True)  # Row 30 appended
+    view.update([3, 4, 30])
+    assert list(view)[:3] == [0, 4, 6] and list(view)[-1] == 30 and view.position(3) is None